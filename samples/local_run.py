@@ -2,8 +2,10 @@ import asyncio
 import uuid
 from pathlib import Path
 
+from backtest.engine import BacktestEngine
 from common.chart import Chart
 from common.params import WorkerParams
+from common.render import RenderPool
 from common.woker import Strategy
 from exchanges.local.config import CSVConfig
 from exchanges.local.exchange import CSVExchange
@@ -55,12 +57,9 @@ async def main(task: Strategy) -> None:
         online_check=False,
         **params.strategy.params,
     )
-    async for candle in exchange.get_candles(params.symbol):
-        candle.time = candle.time.astimezone()
-        await strategy.handle(candle)
-    if strategy.position:
-        pos = await strategy.close_position(candle)
-        strategy.save_chart(pos)
+    engine = BacktestEngine(strategy, exchange.load_candles(params.symbol), save_charts=True)
+    await engine.run()
+    await RenderPool.stop_shared()
     print(await strategy.exchange.get_balance(""))  # noqa: T201
 
 
@@ -0,0 +1,41 @@
+import asyncio
+
+from common.bus import Subscription
+from common.puller import Puller
+from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.exchange import BingXExchange
+from exchanges.bingx.stream import BingXStreamExchange
+
+SYMBOL = "ETH"
+DURATION = 5 * 60
+
+
+async def drain(subscription: Subscription) -> None:
+    while True:
+        await subscription.get()
+
+
+async def main() -> None:
+    """Receive the same 1m candles by polling and streaming and compare close latencies"""
+    config = BingXConfig()
+    exchanges = {"rest": BingXExchange(config), "stream": BingXStreamExchange(config)}
+    puller = Puller()
+    tasks = [
+        asyncio.create_task(drain(puller.subscribe(exchange, SYMBOL, 5)))
+        for exchange in exchanges.values()
+    ]
+    await puller.start()
+    await asyncio.sleep(DURATION)
+    # polls use the sessions of the exchanges, they are stopped before the sessions are closed;
+    # a streaming poll waits for the next kline, so it is cancelled after the stop timeout
+    await puller.stop()
+    for exchange in exchanges.values():
+        await exchange.stop()
+    for task in tasks:
+        task.cancel()
+    for mode, exchange in exchanges.items():
+        print(f"{mode}: {exchange.latency[SYMBOL].info}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+import shutil
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from common.chart import Chart
+from common.params import ChartParams
+from exchanges.bingx.config import BingXConfig
+from exchanges.local.config import CSVConfig
+from exchanges.local.exchange import CSVExchange
+from strategies.example import ExampleStrategy
+
+DATA = Path(__file__).parents[1] / "data" / "test.csv"
+
+INDICATORS = [
+    {"class": "TripleEma", "params": {"fast_period": 10, "medium_period": 30, "slow_period": 60}},
+    {"class": "RSI", "params": {"zone": 40}},
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    """Copy of the sample candles, caches are written next to it"""
+    path = tmp_path / "candles.csv"
+    shutil.copy(DATA, path)
+    return path
+
+
+@pytest.fixture
+def exchange(csv_path: Path) -> CSVExchange:
+    return CSVExchange(CSVConfig(PATH=str(csv_path)))
+
+
+@pytest.fixture
+def make_strategy(csv_path: Path) -> Callable[..., ExampleStrategy]:
+    """Strategy over a fresh exchange of the sample candles"""
+
+    def make(size: int = 100) -> ExampleStrategy:
+        return ExampleStrategy(
+            strategy_id=uuid.uuid4(),
+            symbol="ETH",
+            chart=Chart.new(ChartParams(size=size, indicators=INDICATORS)),
+            exchange=CSVExchange(CSVConfig(PATH=str(csv_path))),
+            online_check=False,
+            take_profit=0.3,
+            orders_map=[(0, 0.1), (0.5, 0.2), (1, 0.3), (1.5, 0.4)],
+        )
+
+    return make
+
+
+@pytest.fixture
+def bingx_config() -> BingXConfig:
+    return BingXConfig(API_KEY="key", SECRET_KEY="secret", HOST="http://127.0.0.1:1")
@@ -0,0 +1,56 @@
+import uuid
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import app  # noqa: E402
+
+STRATEGY_ID = uuid.uuid4()
+
+
+class Persistence:
+    async def strategies(self, mode: str) -> list:
+        assert mode == "live"
+        return [app.Strategy(id=STRATEGY_ID, name="knife", params={"symbol": "ETH"})]
+
+
+class Container:
+    def __init__(self, _settings: object) -> None:
+        self.persistence = Persistence()
+        self.candle_store = object()
+        self.snapshots = object()
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+class Manager:
+    created: list["Manager"] = []
+
+    def __init__(self, **services: object) -> None:
+        self.services = services
+        self.tasks = None
+        self.stopped = False
+        self.created.append(self)
+
+    async def start(self, tasks: list) -> None:
+        self.tasks = tasks
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+async def test_lifespan_wires_the_services(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app, "Container", Container)
+    monkeypatch.setattr(app, "WorkerManager", Manager)
+    monkeypatch.setattr(app, "get_settings", lambda: None)
+
+    async with app.lifespan(app.app):
+        (manager,) = Manager.created
+        assert set(manager.services) == {"persistence", "store", "snapshots"}
+        assert isinstance(manager.services["persistence"], Persistence)
+        assert [(task.id, task.name) for task in manager.tasks] == [(STRATEGY_ID, "knife")]
+
+    assert manager.stopped
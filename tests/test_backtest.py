@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Callable
+
+import plotly.graph_objects as go
+import pytest
+from backtest.engine import BacktestEngine
+from common.render import RenderPool
+from common.schemas import Position
+from strategies.example import ExampleStrategy
+
+
+async def stream(strategy: ExampleStrategy) -> list[Position]:
+    positions = []
+    handle = strategy._handle
+
+    async def record(*args: object) -> Position | None:
+        position = await handle(*args)
+        if position is not None:
+            positions.append(position)
+        return position
+
+    strategy._handle = record
+    async for candle in strategy.exchange.get_candles(strategy.symbol):
+        await strategy.handle(candle)
+    if strategy.position is not None:
+        positions.append(await strategy.close_position(candle))
+    return positions
+
+
+@pytest.fixture
+def figures(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[go.Figure]:
+    rendered = []
+
+    async def render(_pool: RenderPool, fig: go.Figure) -> bytes:
+        rendered.append(fig)
+        return b""
+
+    monkeypatch.setattr(RenderPool, "render", render)
+    monkeypatch.chdir(tmp_path)
+    return rendered
+
+
+@pytest.mark.usefixtures("figures")
+async def test_engine_matches_streaming(make_strategy: Callable[..., ExampleStrategy]) -> None:
+    streamed = make_strategy()
+    positions = await stream(streamed)
+
+    strategy = make_strategy()
+    engine = BacktestEngine(strategy, strategy.exchange.load_candles(strategy.symbol))
+
+    assert positions
+    assert await engine.run() == positions
+    assert await strategy.exchange.get_balance("") == await streamed.exchange.get_balance("")
+
+
+async def test_deal_charts_show_the_deal_window(
+    make_strategy: Callable[..., ExampleStrategy], figures: list[go.Figure]
+) -> None:
+    strategy = make_strategy()
+    engine = BacktestEngine(
+        strategy, strategy.exchange.load_candles(strategy.symbol), save_charts=True
+    )
+    positions = await engine.run()
+
+    assert len(figures) == len(positions) > 1
+    for fig, position in zip(figures, positions, strict=True):
+        last_bar = max(fig.data[0].x).astype("datetime64[ms]").astype(int)
+        assert last_bar == position.orders[-1].ts
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from exchanges.bingx.client import Priority, RequestScheduler
+
+
+async def test_symbols_are_interleaved_and_orders_go_first() -> None:
+    scheduler = RequestScheduler(capacity=5, period=0.25)
+    admitted = []
+
+    async def request(key: str, priority: Priority = Priority.MARKET) -> None:
+        await scheduler.acquire(1, priority, key)
+        admitted.append(key)
+
+    tasks = [asyncio.create_task(request("BTC")) for _ in range(20)]
+    tasks += [asyncio.create_task(request("ETH")) for _ in range(3)]
+    await asyncio.sleep(0.1)
+    tasks.append(asyncio.create_task(request("order", Priority.ORDER)))
+    await asyncio.gather(*tasks)
+
+    # a busy symbol does not hold back the other one
+    assert admitted[:6] == ["BTC", "ETH"] * 3
+    # the order waits for a token only, not for the queued market data
+    assert admitted.index("order") < 12
+    assert len(admitted) == 24
+
+
+async def test_pause_holds_requests_back() -> None:
+    scheduler = RequestScheduler(capacity=5, period=0.25)
+    scheduler.pause(0.2)
+    started = time.monotonic()
+    await scheduler.acquire()
+
+    assert time.monotonic() - started >= 0.2
@@ -0,0 +1,71 @@
+import asyncio
+
+from common.enums import OrderSide
+from exchanges.bingx.ledger import BalanceLedger
+from exchanges.bingx.schemas import BingXBalance, BingXBalances
+
+
+class Account:
+    """Exchange side balances, fills take a 0.1% fee from the received asset"""
+
+    FEE = 0.001
+
+    def __init__(self, **free: float) -> None:
+        self.free = free
+        self.fetches = 0
+
+    async def fetch(self) -> BingXBalances:
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return BingXBalances(
+            balances=[
+                BingXBalance(asset=asset, free=free, locked=0) for asset, free in self.free.items()
+            ]
+        )
+
+    def fill(self, side: OrderSide, amount: float, cost: float) -> None:
+        if side == OrderSide.BUY:
+            self.free["ETH"] += amount * (1 - self.FEE)
+            self.free["USDT"] -= cost
+        else:
+            self.free["ETH"] -= amount
+            self.free["USDT"] += cost * (1 - self.FEE)
+
+
+async def test_concurrent_reads_share_one_fetch() -> None:
+    account = Account(USDT=100)
+    ledger = BalanceLedger(account.fetch, ttl=60)
+
+    assert await asyncio.gather(*[ledger.get("USDT") for _ in range(10)]) == [100] * 10
+    assert account.fetches == 1
+
+
+async def test_fee_of_a_fill_is_picked_up_before_the_next_order() -> None:
+    account = Account(USDT=100, ETH=0)
+    ledger = BalanceLedger(account.fetch, ttl=60)
+    await ledger.get("USDT")
+
+    account.fill(OrderSide.BUY, 0.01, 30)
+    ledger.apply_fill("ETH", OrderSide.BUY, 0.01, 30)
+    assert await ledger.get("ETH") == account.free["ETH"] < 0.01
+    assert await ledger.get("USDT") == 70
+    assert account.fetches == 2
+
+    amount = await ledger.get("ETH")
+    account.fill(OrderSide.SELL, amount, 40)
+    ledger.apply_fill("ETH", OrderSide.SELL, amount, 40)
+    assert await ledger.get("ETH") == 0
+    assert account.fetches == 2
+    assert await ledger.get("USDT") == account.free["USDT"] < 110
+    assert account.fetches == 3
+
+
+async def test_negative_balance_resyncs() -> None:
+    account = Account(USDT=100, ETH=0)
+    ledger = BalanceLedger(account.fetch, ttl=60)
+    await ledger.get("USDT")
+
+    ledger.apply_fill("ETH", OrderSide.SELL, 1, 10)
+
+    assert ledger.is_stale
+    assert await ledger.get("ETH") == 0
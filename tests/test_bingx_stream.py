@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import json
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from common import puller as puller_module
+from common.puller import Puller
+from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.stream import BingXStreamExchange
+
+MINUTE = 60_000
+
+
+def pack(message: dict | str) -> bytes:
+    data = message if isinstance(message, str) else json.dumps(message)
+    return gzip.compress(data.encode())
+
+
+class KlineServer:
+    """BingX market stream stand-in, the first connection is dropped after three klines"""
+
+    def __init__(self) -> None:
+        self.subscriptions: list[str] = []
+        self.pongs: list[str] = []
+        self.start = int(time.time() * 1000) // MINUTE * MINUTE
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sub = json.loads((await ws.receive()).data)
+        self.subscriptions.append(sub["dataType"])
+        await ws.send_bytes(pack({"id": sub["id"], "code": 0, "msg": "SUCCESS"}))
+        await ws.send_bytes(pack("Ping"))
+        self.pongs.append((await ws.receive()).data)
+
+        offset = 3 * (len(self.subscriptions) - 1)
+        for i in range(offset, offset + 3):
+            kline = {"t": self.start + i * MINUTE, "o": 1, "h": 2, "l": 0.5, "c": i, "q": 7}
+            await ws.send_bytes(pack({"dataType": sub["dataType"], "data": {"K": kline}}))
+        if len(self.subscriptions) == 1:
+            await ws.close()
+        else:
+            await asyncio.sleep(10)
+        return ws
+
+
+@pytest.fixture
+async def server() -> KlineServer:
+    kline_server = KlineServer()
+    app = web.Application()
+    app.router.add_get("/market", kline_server.handle)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    kline_server.url = str(test_server.make_url("/market")).replace("http", "ws")
+    yield kline_server
+    await test_server.close()
+
+
+async def test_reconnect_resubscribes_and_backfills(
+    server: KlineServer, bingx_config: BingXConfig, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = bingx_config.model_copy(update={"STREAM": True, "WS_HOST": server.url})
+    exchange = BingXStreamExchange(config)
+    backfills = []
+
+    async def klines(start_time: int | None = None, **_params: str) -> list:
+        backfills.append(start_time)
+        return []
+
+    exchange.client.get_candles = klines
+    puller = Puller()
+    subscription = puller.subscribe(exchange, "ETH", pull_interval=0, policy="lossless")
+    await puller.start()
+
+    candles = [await asyncio.wait_for(subscription.get(), 5) for _ in range(6)]
+    # the streaming poll waits for the next kline, it is cancelled after the stop timeout
+    monkeypatch.setattr(puller_module, "STOP_TIMEOUT", 0.1)
+    await puller.stop()
+    await exchange.stop()
+
+    assert server.subscriptions == ["ETH-USDT@kline_1min"] * 2
+    assert server.pongs == ["Pong", "Pong"]
+    assert [candle.close for candle in candles] == [0, 1, 2, 3, 4, 5]
+    assert [candle.volume for candle in candles] == [7] * 6
+    # the REST backfill after the reconnect starts from the last streamed candle
+    assert backfills[:2] == [None, server.start + 2 * MINUTE]
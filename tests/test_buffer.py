@@ -0,0 +1,39 @@
+import numpy as np
+from common.buffer import RingBuffer
+
+
+def test_columns_stay_in_time_order_after_wrapping() -> None:
+    buffer = RingBuffer(4, ["close", "volume"])
+    for time in range(7):
+        buffer.append(time, {"close": time * 10.0, "volume": 1.0})
+
+    assert buffer.is_full
+    np.testing.assert_array_equal(buffer.times, [3, 4, 5, 6])
+    np.testing.assert_array_equal(buffer.column("close"), [30, 40, 50, 60])
+    assert buffer.column("close").base is not None
+    assert buffer.last_time == 6
+    assert buffer.get("close", 0) == 30
+    assert buffer.row(-2) == {"close": 50, "volume": 1}
+
+
+def test_update_last_replaces_the_forming_bar() -> None:
+    buffer = RingBuffer(3, ["close", "rsi"])
+    for time in range(5):
+        buffer.append(time, {"close": float(time)})
+    buffer.update_last({"close": 9.0, "rsi": 50.0})
+
+    np.testing.assert_array_equal(buffer.column("close"), [2, 3, 9])
+    np.testing.assert_array_equal(buffer.column("rsi"), [np.nan, np.nan, 50])
+    assert buffer.last_time == 4
+
+
+def test_load_keeps_the_last_rows() -> None:
+    buffer = RingBuffer(3, ["close"])
+    buffer.append(100, {"close": 1.0})
+    buffer.load(np.arange(5), {"close": np.arange(5.0), "unknown": np.zeros(5)})
+
+    np.testing.assert_array_equal(buffer.times, [2, 3, 4])
+    np.testing.assert_array_equal(buffer.column("close"), [2, 3, 4])
+    buffer.append(5, {"close": 5.0})
+    np.testing.assert_array_equal(buffer.column("close"), [3, 4, 5])
+    assert buffer.get("close", 3) is None
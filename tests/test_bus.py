@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from common.bus import BusClosedError, CandleBus
+from common.enums import BusPolicy
+from common.schemas import Candle
+
+
+def candle(ts: int, close: float = 1) -> Candle:
+    return Candle(ts=ts, open=1, high=1, low=1, close=close, volume=1)
+
+
+async def test_policies() -> None:
+    bus = CandleBus(capacity=8)
+    latest = bus.subscribe(BusPolicy.LATEST)
+    lossless = bus.subscribe(BusPolicy.LOSSLESS)
+    drop_oldest = bus.subscribe(BusPolicy.DROP_OLDEST, bound=2)
+    for ts, close in [(1, 1), (1, 2), (2, 3), (2, 4)]:
+        await bus.publish(candle(ts, close))
+
+    assert [(await latest.get()).close for _ in range(2)] == [2, 4]
+    assert [(await lossless.get()).close for _ in range(4)] == [1, 2, 3, 4]
+    assert [(await drop_oldest.get()).close for _ in range(2)] == [3, 4]
+    assert drop_oldest.dropped == 2
+
+
+async def test_close_wakes_up_consumers() -> None:
+    bus = CandleBus()
+    subscription = bus.subscribe()
+    waiter = asyncio.create_task(subscription.get())
+    await asyncio.sleep(0)
+
+    bus.close()
+
+    with pytest.raises(BusClosedError):
+        await asyncio.wait_for(waiter, 1)
+
+
+async def test_closed_bus_delivers_published_candles_first() -> None:
+    bus = CandleBus()
+    subscription = bus.subscribe(BusPolicy.LOSSLESS)
+    await bus.publish(candle(1))
+    bus.close()
+
+    assert (await subscription.get()).ts == 1
+    with pytest.raises(BusClosedError):
+        await subscription.get()
+    with pytest.raises(BusClosedError):
+        await bus.publish(candle(2))
+
+
+async def test_closed_subscription_releases_its_consumer_and_the_producer() -> None:
+    bus = CandleBus()
+    subscription = bus.subscribe(BusPolicy.LOSSLESS, bound=1)
+    other = bus.subscribe()
+    await bus.publish(candle(1))
+    producer = asyncio.create_task(bus.publish(candle(2)))
+    await asyncio.sleep(0)
+    assert not producer.done()
+
+    subscription.close()
+
+    await asyncio.wait_for(producer, 1)
+    assert bus.subscriptions == [other]
+    with pytest.raises(BusClosedError):
+        await subscription.get()
+    assert (await other.get()).ts == 1
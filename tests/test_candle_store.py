@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+from db.candles import is_partition, partition_name
+
+
+def test_partitions_are_recognized_by_name() -> None:
+    month = datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+    assert partition_name(month) == "candle_2024_12"
+    assert is_partition(partition_name(month))
+    assert not is_partition("candle")
+    assert not is_partition("candle_2024_12_old")
+    assert not is_partition("position")
@@ -0,0 +1,33 @@
+import numpy as np
+from common.candles import from_timestamp
+from common.chart import Chart
+from common.params import ChartParams
+from common.schemas import Candle
+
+MINUTE = 60_000
+
+
+def test_find_min_and_max_match_brute_force_after_wrapping() -> None:
+    chart = Chart.new(ChartParams.model_validate({"size": 50, "indicators": []}))
+    rng = np.random.default_rng(7)
+    lows = rng.integers(0, 20, 180).astype(float)
+    highs = lows + rng.integers(1, 20, 180)
+    for i, (low, high) in enumerate(zip(lows, highs, strict=True)):
+        ts = i * MINUTE
+        chart.add(Candle(ts=ts, open=low, high=high - 1, low=low + 1, close=low, volume=1))
+        chart.add(Candle(ts=ts, open=low, high=high, low=low, close=low, volume=1))
+
+        start = max(0, i - 49)
+        for first in range(start, i + 1, 7):
+            window = slice(first, i + 1)
+            low_at = first + int(np.argmin(lows[window]))
+            high_at = first + int(np.argmax(highs[window]))
+            since = from_timestamp(first * MINUTE)
+            assert chart.find_min(since, from_timestamp(i * MINUTE)) == (
+                lows[low_at],
+                from_timestamp(low_at * MINUTE),
+            )
+            assert chart.find_max(since) == (highs[high_at], from_timestamp(high_at * MINUTE))
+
+    empty = from_timestamp(200 * MINUTE)
+    assert chart.find_min(empty, empty) == (None, None)
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from common.candles import CandleArrays
+from exchanges.local.cache import HEADER_SIZE, CacheHeader, CandleCache
+from exchanges.local.config import CSVConfig
+from exchanges.local.exchange import CSVExchange
+
+from tests.conftest import DATA
+
+
+def assert_equal(candles: CandleArrays, expected: CandleArrays) -> None:
+    for name in ("time", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(getattr(candles, name), getattr(expected, name))
+
+
+def header(csv_path: Path) -> CacheHeader:
+    with CandleCache.path_for(csv_path).open("rb") as f:
+        return CacheHeader.unpack(f.read(HEADER_SIZE))
+
+
+def test_cache_is_built_for_the_symbol(csv_path: Path) -> None:
+    exchange = CSVExchange(CSVConfig(PATH=str(csv_path)))
+    candles = exchange.load_candles("ETH")
+
+    assert header(csv_path).symbol == "ETH"
+    assert len(candles) == header(csv_path).count
+
+    exchange.load_candles("BTC")
+    assert header(csv_path).symbol == "BTC"
+
+
+def test_cached_candles_match_csv(csv_path: Path) -> None:
+    cached = CSVExchange(CSVConfig(PATH=str(csv_path))).load_candles("ETH", 5)
+    parsed = CSVExchange(CSVConfig(PATH=str(csv_path), CACHE=False)).load_candles("ETH", 5)
+
+    assert_equal(cached, parsed)
+
+
+def test_overlapping_files_give_the_same_candles_cached(tmp_path: Path) -> None:
+    lines = DATA.read_text().splitlines(keepends=True)
+    (tmp_path / "a.csv").write_text("".join(lines[:6000]))
+    (tmp_path / "b.csv").write_text("".join(lines[5990:]))
+    cached = CSVExchange(CSVConfig(PATH=str(tmp_path), CHUNK_SIZE=1000))
+    parsed = CSVExchange(CSVConfig(PATH=str(tmp_path), CHUNK_SIZE=1000, CACHE=False))
+
+    for timeframe in (1, 5):
+        candles = cached.load_candles("ETH", timeframe)
+        assert_equal(candles, parsed.load_candles("ETH", timeframe))
+        assert np.all(np.diff(candles.time) > 0)
+    assert len(cached.load_candles("ETH")) == len(lines)
+
+
+async def test_candles_since_start_time_cached(tmp_path: Path) -> None:
+    lines = DATA.read_text().splitlines(keepends=True)
+    (tmp_path / "a.csv").write_text("".join(lines[:6000]))
+    (tmp_path / "b.csv").write_text("".join(lines[5990:]))
+    start_time = int(lines[5995].split(",")[0])
+    cached = CSVExchange(CSVConfig(PATH=str(tmp_path)))
+    parsed = CSVExchange(CSVConfig(PATH=str(tmp_path), CACHE=False))
+
+    candles = [c async for c in cached.get_candles("ETH", start_time=start_time)]
+    assert candles == [c async for c in parsed.get_candles("ETH", start_time=start_time)]
+    assert candles[0].ts == start_time
+
+
+async def test_cache_seeks_to_start_time(csv_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    exchange = CSVExchange(CSVConfig(PATH=str(csv_path), CHUNK_SIZE=1000))
+    everything = exchange.load_candles("ETH")
+    start_time = int(everything.time[-10])
+    read = CandleCache.read
+    rows = []
+
+    def spy(cache: CandleCache, *args: int) -> CandleArrays:
+        candles = read(cache, *args)
+        rows.append(len(candles))
+        return candles
+
+    monkeypatch.setattr(CandleCache, "read", spy)
+    candles = [c async for c in exchange.get_candles("ETH", start_time=start_time)]
+
+    assert [c.ts for c in candles] == everything.time[-10:].tolist()
+    assert rows == [10]
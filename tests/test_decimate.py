@@ -0,0 +1,53 @@
+import numpy as np
+from common.candles import from_timestamp
+from common.chart import Chart
+from common.decimate import bucket_starts, lttb, ohlc
+from common.indicators import RSI, TripleEma
+from exchanges.local.exchange import CSVExchange
+
+
+def test_lttb_keeps_the_ends_and_a_spike() -> None:
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[537] = 10
+
+    rows = lttb(x, y, 50)
+
+    assert len(rows) == 50
+    assert rows[0] == 0 and rows[-1] == 999
+    assert 537 in rows
+    assert np.all(np.diff(rows) > 0)
+    np.testing.assert_array_equal(lttb(x[:10], y[:10], 50), np.arange(10))
+
+
+def test_buckets_keep_extremes_and_marker_bars() -> None:
+    rng = np.random.default_rng(3)
+    close = rng.random(1000)
+    high, low = close + rng.random(1000), close - rng.random(1000)
+
+    starts = bucket_starts(1000, 40, keep=np.array([123]))
+    _, highs, lows, _ = ohlc(close, high, low, close, starts)
+
+    assert {123, 124} <= set(starts)
+    assert highs.max() == high.max()
+    assert lows.min() == low.min()
+
+
+def test_figure_is_decimated_without_losing_extremes(exchange: CSVExchange) -> None:
+    chart = Chart(
+        timeframe=1, size=5000, indicators=[TripleEma(), RSI()], rows=2, cols=1, max_points=500
+    )
+    chart.load(exchange.load_candles()[-5000:])
+    marker = int(chart.buffer.times[2345])
+    forming = int(chart.buffer.times[-1])
+
+    # fills happen inside the bars
+    fills = [from_timestamp(marker + 25_000), from_timestamp(forming + 10_000)]
+    fig = chart.make_figure("ETH", "ETH", markers=fills)
+    bars = fig.data[0]
+
+    assert len(bars.x) < 1000
+    assert all(len(line.x) <= 1000 for line in fig.data[1:])
+    assert max(bars.high) == chart.buffer.column("high").max()
+    assert min(bars.low) == chart.buffer.column("low").min()
+    assert {marker, forming} <= set(bars.x.astype("datetime64[ms]").astype(int))
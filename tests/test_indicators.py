@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+from common.candles import CandleArrays
+from common.chart import Chart
+from common.indicators import INDICATORS
+from common.indicators.series import Series
+from common.params import ChartParams
+from common.schemas import Candle
+
+SIZE = 300
+# batch recurrences run in compiled code, they differ from streaming by float rounding
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+@pytest.fixture(scope="module")
+def candles() -> CandleArrays:
+    rng = np.random.default_rng(1)
+    size = 2000
+    close = np.cumsum(rng.standard_normal(size)) + 200
+    return CandleArrays(
+        time=np.arange(size, dtype=np.int64) * 60_000 * 7,
+        open=close,
+        high=close + rng.random(size),
+        low=close - rng.random(size),
+        close=close,
+        volume=rng.random(size) * 10,
+    )
+
+
+def stream(chart: Chart, candles: CandleArrays) -> None:
+    """Every bar is updated twice before its final version"""
+    for candle in candles.candles():
+        for j in (2, 1, 0):
+            chart.add(
+                Candle(
+                    ts=candle.ts,
+                    open=candle.open,
+                    high=candle.high + j * 0.3,
+                    low=candle.low - j * 0.3,
+                    close=candle.close + j * 0.1,
+                    volume=candle.volume,
+                )
+            )
+
+
+def chart_params(**indicator_params: dict) -> ChartParams:
+    return ChartParams(
+        size=SIZE,
+        indicators=[
+            {"class": name, "params": indicator_params.get(name, {})} for name in INDICATORS
+        ],
+    )
+
+
+def test_streamed_columns_equal_batch(candles: CandleArrays) -> None:
+    chart = Chart.new(chart_params(Stochastic={"d_period": 5}))
+    stream(chart, candles)
+
+    for key, values in chart.compute_batch(candles).items():
+        np.testing.assert_allclose(
+            chart.buffer.column(key), values[-SIZE:], rtol=RTOL, atol=ATOL, err_msg=key
+        )
+
+
+def test_stochastic_matches_rolling_reference(candles: CandleArrays) -> None:
+    chart = Chart.new(chart_params(Stochastic={"k_period": 14, "d_period": 5}))
+    columns = chart.compute_batch(candles)
+
+    high, low = pd.Series(candles.high), pd.Series(candles.low)
+    lowest = low.rolling(14).min()
+    k = 100 * (pd.Series(candles.close) - lowest) / (high.rolling(14).max() - lowest)
+    np.testing.assert_allclose(columns["Stoch_14_k"][13:], k[13:])
+    np.testing.assert_allclose(columns["Stoch_14_5_d"][17:], k.rolling(5).mean()[17:])
+
+
+def test_loaded_chart_continues_the_stream(candles: CandleArrays) -> None:
+    streamed = Chart.new(chart_params())
+    stream(streamed, candles)
+    columns = streamed.compute_batch(candles)
+
+    loaded = Chart.new(chart_params())
+    loaded.load(candles[:-1], {key: values[:-1] for key, values in columns.items()})
+    stream(loaded, candles[-1:])
+
+    for key in columns:
+        np.testing.assert_allclose(
+            loaded.buffer.column(key)[-3:], streamed.buffer.column(key)[-3:], err_msg=key
+        )
+
+
+def test_intermediate_series_are_computed_once(candles: CandleArrays) -> None:
+    indicators = [
+        {"class": "MACD", "params": {}},
+        {
+            "class": "TripleEma",
+            "params": {"fast_period": 12, "medium_period": 26, "slow_period": 50},
+        },
+    ]
+    shared = Chart.new(ChartParams(size=SIZE, indicators=indicators))
+    alone = Chart.new(ChartParams(size=SIZE, indicators=indicators[:1]))
+    stream(shared, candles[:500])
+    stream(alone, candles[:500])
+
+    assert sorted(series.key for series in shared.series) == ["Ema_12", "Ema_26", "Ema_50"]
+    macd, triple = shared.indicators
+    assert macd.dependencies == triple.dependencies[:2]
+    assert all(a is b for a, b in zip(macd.dependencies, triple.dependencies, strict=False))
+    for key in macd.keys:
+        np.testing.assert_array_equal(shared.buffer.column(key), alone.buffer.column(key))
+
+
+def test_indicators_do_not_depend_on_the_chart_size(candles: CandleArrays) -> None:
+    small = Chart.new(chart_params().model_copy(update={"size": 10}))
+    large = Chart.new(chart_params())
+    stream(small, candles[:400])
+    stream(large, candles[:400])
+
+    for key in small.buffer.columns:
+        np.testing.assert_array_equal(
+            small.buffer.column(key), large.buffer.column(key)[-10:], err_msg=key
+        )
+
+
+def test_batch_recurrences_follow_the_streamed_ones() -> None:
+    values = np.r_[0.0, 0.0, np.random.default_rng(2).standard_normal(500)]
+    ema, streamed = None, []
+    for value in values:
+        ema = Series.calc_ema(ema, 10, value)
+        streamed.append(ema)
+    np.testing.assert_allclose(Series.calc_ema_batch(values, 10), streamed, rtol=RTOL, atol=ATOL)
+
+    resumed = Series.calc_ema_batch(values[300:], 10, prev_ema=streamed[299])
+    np.testing.assert_allclose(resumed, streamed[300:], rtol=RTOL, atol=ATOL)
+
+    average, streamed = 5.0, []
+    for value in values:
+        average = (average * 13 + value) / 14
+        streamed.append(average)
+    wilder = Series.calc_wilder_batch(values, 14, prev_avg=5.0)
+    np.testing.assert_allclose(wilder, streamed, rtol=RTOL, atol=ATOL)
@@ -0,0 +1,39 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+from common.enums import OrderSide
+from common.schemas import Order, Position
+from db.persistence import PersistenceService
+
+
+class Database:
+    """Connector of a database which is down"""
+
+    def session_maker(self) -> "Database":
+        return self
+
+    async def __aenter__(self) -> None:
+        raise ConnectionRefusedError("database is down")
+
+    async def __aexit__(self, *_args: object) -> None:
+        pass
+
+
+def order(ts: int) -> Order:
+    return Order(ts=ts, price=1, amount=1, side=OrderSide.BUY, status="FILLED", cost=1)
+
+
+async def test_stop_gives_up_on_an_unavailable_database(caplog: pytest.LogCaptureFixture) -> None:
+    persistence = PersistenceService(Database(), flush_interval=0.01, retry_delay=0.05)
+    position = Position.new(order(1))
+    for ts in range(3):
+        await persistence.record(uuid.uuid4(), "ETH", position, order(ts))
+    await asyncio.sleep(0.1)
+
+    with caplog.at_level(logging.ERROR):
+        await asyncio.wait_for(persistence.stop(timeout=0.2), 2)
+
+    assert "Persistence stopped with 3 unwritten events" in caplog.text
+    assert caplog.text.count("Unwritten OrderEvent") == 3
@@ -0,0 +1,84 @@
+import pytest
+from common.puller import CLOSE_DELAY, MAX_BACKOFF, Puller, PullerError, Subscribe
+from common.schemas import Candle
+from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.exchange import BingXExchange
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+START = 1734472800000
+
+
+class Klines:
+    """BingX kline endpoint over 30 minutes of the forming hour"""
+
+    def __init__(self) -> None:
+        self.rows = [
+            [START + i * MINUTE, 100 + i, 110 + i, 90 - i, 100 + i, 0, 0, 1.0] for i in range(30)
+        ]
+
+    async def __call__(self, limit: int, start_time: int | None = None, **_params: str) -> list:
+        rows = [row for row in self.rows if start_time is None or row[0] >= start_time]
+        return [list(row) for row in reversed(rows)][:limit]
+
+
+@pytest.fixture
+async def exchange(bingx_config: BingXConfig) -> BingXExchange:
+    exchange = BingXExchange(bingx_config)
+    exchange.client.get_candles = Klines()
+    yield exchange
+    await exchange.stop()
+
+
+async def test_charts_of_a_symbol_share_one_feed(exchange: BingXExchange) -> None:
+    # the bootstrap of the hour chart rewinds the cursor to the forming hour
+    exchange._statistic("ETH").start_time = START
+    puller = Puller()
+    minutes = puller.subscribe(exchange, "ETH", pull_interval=5, timeframe=1)
+    hours = puller.subscribe(exchange, "ETH", pull_interval=10, timeframe=60)
+    for stat in puller._subscribes.values():
+        await puller._poll(stat)
+
+    assert minutes.depth == 30
+    # the latest version of the forming hour covers all the minutes
+    assert await hours.get() == Candle(ts=START, open=100, high=139, low=61, close=129, volume=30)
+    assert [stat.pull_interval for stat in puller._subscribes.values()] == [5]
+
+
+def test_timeframe_longer_than_a_poll_is_rejected(exchange: BingXExchange) -> None:
+    with pytest.raises(PullerError):
+        Puller().subscribe(exchange, "ETH", pull_interval=5, timeframe=24 * 60)
+
+
+def test_polls_back_off_but_never_miss_a_close() -> None:
+    stat = Subscribe(exchange=None, symbol="ETH", pull_interval=5)
+    stat.bus(1)
+    now = 60 * 1000 + 10
+
+    assert [stat.next_poll(now, changed=False) for _ in range(4)] == [5, 10, 20, 40]
+    assert stat.next_poll(now, changed=False) == 5 * MAX_BACKOFF
+    assert stat.next_poll(now + 45, changed=True) == 5
+    # 5 seconds are left to the close, the grown delay is cut to it
+    assert stat.next_poll(now + 45, changed=False) == 5 + CLOSE_DELAY
+    # the boundary passed but the previous bar is still the last one
+    stat.last_ts = (now - 70) * 1000
+    assert stat.awaiting_close(now - 8)
+    assert stat.next_poll(now - 8, changed=False) == CLOSE_DELAY
+    assert not stat.awaiting_close(now)
+
+
+async def test_unchanged_bars_are_not_published_again(exchange: BingXExchange) -> None:
+    exchange._statistic("ETH").start_time = START
+    puller = Puller()
+    minutes = puller.subscribe(exchange, "ETH", pull_interval=5)
+    stat = next(iter(puller._subscribes.values()))
+
+    assert await puller._poll(stat)
+    while minutes.depth:
+        await minutes.get()
+    assert not await puller._poll(stat)
+    assert minutes.depth == 0
+
+    exchange.client.get_candles.rows[-1][4] = 200
+    assert await puller._poll(stat)
+    assert (await minutes.get()).close == 200
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import plotly.graph_objects as go
+import pytest
+from common import render
+from common.render import RenderPool
+
+
+def fake_render(spec: str, *_args: object) -> bytes:
+    if '"hang"' in spec:
+        time.sleep(60)
+    return b"image"
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> RenderPool:
+    monkeypatch.setattr(render, "_render", fake_render)
+    monkeypatch.setattr(render, "_warm_up", lambda: None)
+    return RenderPool(processes=1, timeout=0.5)
+
+
+async def test_render(pool: RenderPool) -> None:
+    assert await pool.render(go.Figure()) == b"image"
+    await pool.stop()
+
+
+async def test_hung_render_is_killed(pool: RenderPool) -> None:
+    await pool.render(go.Figure())
+    processes = list(pool.executor._processes.values())
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.render(go.Figure(layout={"title": "hang"}))
+
+    assert processes
+    assert not any(process.is_alive() for process in processes)
+    assert await pool.render(go.Figure()) == b"image"
+    await pool.stop()
@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+from common.enums import OrderSide
+from common.schemas import (
+    Candle,
+    CandleSchema,
+    Order,
+    Position,
+    PositionSchema,
+    from_timestamp,
+    to_timestamp,
+)
+
+TS = 1_700_000_040_000
+
+
+def test_hot_path_objects_are_slotted() -> None:
+    candle = Candle(ts=TS, open=1, high=2, low=0.5, close=1.5, volume=3)
+
+    assert not hasattr(candle, "__dict__")
+    with pytest.raises(AttributeError):
+        candle.extra = 1
+    assert to_timestamp(from_timestamp(TS)) == TS
+    assert candle.time == from_timestamp(TS)
+
+
+def test_candle_round_trips_through_the_schema() -> None:
+    candle = Candle(ts=TS, open=1, high=2, low=0.5, close=1.5, volume=3)
+    schema = CandleSchema.model_validate_json(CandleSchema.from_candle(candle).model_dump_json())
+
+    assert schema.to_candle() == candle
+
+
+def test_position_round_trips_through_the_schema() -> None:
+    buy = Order(ts=TS, price=10, amount=2, side=OrderSide.BUY, status="FILLED", cost=20)
+    sell = Order(ts=TS + 60_000, price=12, amount=2, side=OrderSide.SELL, status="FILLED", cost=24)
+    position = Position.new(buy)
+    position.add_sell(sell)
+    position.id = uuid.uuid4()
+
+    data = PositionSchema.from_position(position).model_dump_json()
+    restored = PositionSchema.model_validate_json(data).to_position()
+
+    assert restored == position
+    assert restored.id == position.id
+    assert restored.profit == 4
+    assert restored.duration.total_seconds() == 60
+
+
+def test_merge_keeps_the_open_and_extremes() -> None:
+    first = Candle(ts=TS, open=1, high=2, low=0.5, close=1.5, volume=3)
+    second = Candle(ts=TS + 60_000, open=1.5, high=3, low=1, close=2.5, volume=1)
+
+    assert first.merge(second) == Candle(
+        ts=TS + 60_000, open=1, high=3, low=0.5, close=2.5, volume=4
+    )
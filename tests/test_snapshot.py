@@ -0,0 +1,72 @@
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pytest
+from common.enums import OrderSide
+from common.schemas import Order, Position
+from common.snapshot import HEADER, MAGIC, SnapshotError, SnapshotStore, dump, load
+from strategies.example import ExampleStrategy
+
+
+@pytest.fixture
+def strategy(make_strategy: Callable[..., ExampleStrategy]) -> ExampleStrategy:
+    strategy = make_strategy()
+    candles = strategy.exchange.load_candles(strategy.symbol)
+    strategy.chart.load(candles[:-1])
+    last = candles.time[-2]
+    buy = Order(ts=int(last), price=100, amount=1, side=OrderSide.BUY, status="FILLED", cost=100)
+    strategy.position = Position.new(buy)
+    strategy.orders = [(0.5, 20.0)]
+    return strategy
+
+
+def test_restored_strategy_continues_like_the_original(
+    strategy: ExampleStrategy, make_strategy: Callable[..., ExampleStrategy]
+) -> None:
+    restored = make_strategy()
+    load(dump(strategy), restored)
+
+    buffer = strategy.chart.buffer
+    np.testing.assert_array_equal(restored.chart.buffer.times, buffer.times)
+    for name in buffer.columns:
+        np.testing.assert_array_equal(restored.chart.buffer.column(name), buffer.column(name))
+    assert restored.position == strategy.position
+    assert restored.position.id == strategy.position.id
+    assert restored.orders == strategy.orders
+
+    candle = next(strategy.exchange.load_candles(strategy.symbol)[-1:].candles())
+    assert restored.chart.add(candle) == strategy.chart.add(candle)
+    assert restored.chart.buffer.row(-1) == strategy.chart.buffer.row(-1)
+
+
+def test_incompatible_snapshots_are_rejected(
+    strategy: ExampleStrategy, make_strategy: Callable[..., ExampleStrategy]
+) -> None:
+    data = dump(strategy)
+    other = make_strategy()
+    other.symbol = "BTC"
+    with pytest.raises(SnapshotError, match="configuration has changed"):
+        load(data, other)
+
+    _, version, size = HEADER.unpack_from(data)
+    outdated = HEADER.pack(MAGIC, version - 1, size) + data[HEADER.size :]
+    with pytest.raises(SnapshotError, match="version"):
+        load(outdated, make_strategy())
+    with pytest.raises(SnapshotError, match="truncated data"):
+        load(data[:-8], make_strategy())
+
+
+async def test_store_skips_missing_and_broken_snapshots(
+    strategy: ExampleStrategy, make_strategy: Callable[..., ExampleStrategy], tmp_path: Path
+) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    await store.save("worker", strategy)
+
+    restored = make_strategy()
+    assert await store.restore("worker", restored)
+    assert restored.position == strategy.position
+    assert not await store.restore("missing", make_strategy())
+
+    store.path("worker").write_bytes(b"garbage")
+    assert not await store.restore("worker", make_strategy())
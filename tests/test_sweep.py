@@ -0,0 +1,78 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+from backtest.engine import BacktestEngine
+from backtest.sweep import SweepRunner, apply, equity_curve, grid, max_drawdown, sample
+from common.candles import CandleArrays
+from common.enums import OrderSide
+from common.params import WorkerParams
+from common.schemas import Order, Position
+from strategies.example import ExampleStrategy
+
+from tests.conftest import INDICATORS
+
+PARAMS = WorkerParams.model_validate(
+    {
+        "symbol": "ETH",
+        "exchange": "CSVExchange",
+        "chart": {"size": 100, "indicators": INDICATORS},
+        "strategy": {
+            "class": "ExampleStrategy",
+            "params": {
+                "take_profit": 0.3,
+                "orders_map": [(0, 0.1), (0.5, 0.2), (1, 0.3), (1.5, 0.4)],
+            },
+        },
+    }
+)
+
+
+def test_grid_sample_and_apply() -> None:
+    space = {"strategy.take_profit": [0.3, 0.5], "RSI.zone": [30, 40, 45]}
+
+    assert len(grid(space)) == 6
+    assert sample(space, 4, seed=1) == sample(space, 4, seed=1)
+    params = apply(PARAMS, {"strategy.take_profit": 0.5, "RSI.zone": 30})
+    assert params.strategy.params["take_profit"] == 0.5
+    assert params.chart.indicators[1].params == {"zone": 30}
+    assert PARAMS.chart.indicators[1].params == {"zone": 40}
+    with pytest.raises(ValueError, match="Unknown sweep parameter"):
+        apply(PARAMS, {"Nope.period": 1})
+
+
+def test_equity_curve_marks_the_position_to_market() -> None:
+    candles = CandleArrays(
+        time=np.array([0, 1, 2, 3]),
+        open=np.zeros(4),
+        high=np.zeros(4),
+        low=np.zeros(4),
+        close=np.array([10.0, 8.0, 12.0, 12.0]),
+        volume=np.zeros(4),
+    )
+    buy = Order(ts=0, side=OrderSide.BUY, price=10, amount=2, status="FILLED", cost=20)
+    sell = Order(ts=2, side=OrderSide.SELL, price=12, amount=2, status="FILLED", cost=24)
+    equity = equity_curve(candles, [Position(orders=[buy, sell])], 100)
+
+    np.testing.assert_array_equal(equity, [100, 96, 104, 104])
+    assert max_drawdown(equity) == pytest.approx(4)
+    assert max_drawdown(np.array([])) == 0
+
+
+async def test_sweep_matches_a_single_backtest(
+    make_strategy: Callable[..., ExampleStrategy],
+) -> None:
+    strategy = make_strategy()
+    candles = strategy.exchange.load_candles(strategy.symbol)
+    positions = await BacktestEngine(strategy, candles).run()
+    equity = equity_curve(candles, positions, 10000)
+
+    space = {"strategy.take_profit": [0.3, 1.0], "RSI.zone": [40, 45]}
+    table = SweepRunner(PARAMS, candles, processes=2).run(grid(space))
+
+    assert len(table) == 4
+    assert list(table["pnl"]) == sorted(table["pnl"], reverse=True)
+    row = table[(table["strategy.take_profit"] == 0.3) & (table["RSI.zone"] == 40)].iloc[0]
+    assert row["trades"] == len(positions)
+    assert row["pnl"] == pytest.approx(equity[-1] - 10000)
+    assert row["drawdown"] == pytest.approx(max_drawdown(equity))
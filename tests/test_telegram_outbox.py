@@ -0,0 +1,84 @@
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from telegram.client import TelegramClient
+from telegram.config import TelegramConfig
+
+DEBUG_CHAT, INFO_CHAT = 1, 2
+RETRY_AFTER = 0.5
+
+
+class BotApi:
+    """Telegram Bot API stand-in, the first message to the debug chat hits flood control"""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[float, str, int, list[str]]] = []
+        self.limited = True
+        self.started = time.monotonic()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        if method == "sendMessage":
+            body = await request.json()
+            chat_id, items = body["chat_id"], body["text"].split("\n\n")
+            if self.limited and chat_id == DEBUG_CHAT:
+                self.limited = False
+                return web.json_response(
+                    {"ok": False, "error_code": 429, "parameters": {"retry_after": RETRY_AFTER}},
+                    status=429,
+                )
+        else:
+            form = await request.post()
+            chat_id = int(request.query["chat_id"])
+            items = [form[key].file.read().decode() for key in form if key.startswith("photo")]
+        self.requests.append((time.monotonic() - self.started, method, chat_id, items))
+        return web.json_response({"ok": True, "result": {}})
+
+    def sent(self, chat_id: int) -> list[tuple[str, list[str]]]:
+        return [(method, items) for _, method, chat, items in self.requests if chat == chat_id]
+
+
+@pytest.fixture
+async def api() -> BotApi:
+    bot_api = BotApi()
+    app = web.Application()
+    app.router.add_post("/bottoken/{method}", bot_api.handle)
+    server = TestServer(app)
+    await server.start_server()
+    bot_api.host = str(server.make_url("")).rstrip("/")
+    yield bot_api
+    await server.close()
+
+
+async def test_outbox_coalesces_keeps_order_and_respects_retry_after(api: BotApi) -> None:
+    client = TelegramClient(
+        TelegramConfig(
+            HOST=api.host,
+            TOKEN="token",
+            DEBUG_CHAT_ID=DEBUG_CHAT,
+            INFO_CHAT_ID=INFO_CHAT,
+            CHAT_INTERVAL=0.1,
+        )
+    )
+    for i in range(5):
+        await client.send_debug(f"debug {i}")
+    for i in range(12):
+        await client.send_photo(f"photo {i}".encode())
+    await client.send_debug("debug 5")
+    for i in range(3):
+        await client.send_info(f"info {i}")
+    await client.stop()
+
+    assert api.sent(DEBUG_CHAT) == [
+        ("sendMessage", [f"debug {i}" for i in range(5)]),
+        ("sendMediaGroup", [f"photo {i}" for i in range(10)]),
+        ("sendMediaGroup", ["photo 10", "photo 11"]),
+        ("sendMessage", ["debug 5"]),
+    ]
+    assert api.sent(INFO_CHAT) == [("sendMessage", ["info 0", "info 1", "info 2"])]
+    sent_at = {(chat, items[0]): at for at, _, chat, items in api.requests}
+    # the limited chat waits, the other one is not held back by it
+    assert sent_at[(DEBUG_CHAT, "debug 0")] >= RETRY_AFTER
+    assert sent_at[(INFO_CHAT, "info 0")] < RETRY_AFTER
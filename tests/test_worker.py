@@ -0,0 +1,211 @@
+import asyncio
+import time
+import uuid
+from typing import Generator
+
+import numpy as np
+import pytest
+from common.bus import CandleBus
+from common.candles import CandleArrays
+from common.chart import Chart
+from common.charts import ChartRegistry
+from common.enums import BusPolicy, Signal
+from common.exchange import BaseExchange
+from common.params import ChartParams
+from common.schemas import Candle, Order, OrderIN
+from common.woker import ChartFeed, Worker, WorkerManager
+from common.woker import Strategy as WorkerTask
+from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.exchange import BingXExchange
+
+
+class SessionExchange(BaseExchange):
+    """Polls fail once the session is closed"""
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.polls = 0
+        self.polls_after_close = 0
+
+    async def stop(self) -> None:
+        self.closed = True
+
+    async def get_candles(
+        self, _symbol: str, _timeframe: int = 1, _size: int = 1000, _start_time: int = None
+    ) -> Generator[Candle, None, None]:
+        self.polls += 1
+        self.polls_after_close += self.closed
+        yield Candle(ts=60_000 * self.polls, open=1, high=1, low=1, close=1, volume=1)
+
+    async def place_order(self, order_in: OrderIN, client_oid: str = None) -> Order:
+        raise NotImplementedError
+
+    async def get_balance(self, symbol: str) -> tuple[float, float]:
+        raise NotImplementedError
+
+
+async def test_stop_stops_polling_before_the_exchange() -> None:
+    manager = WorkerManager()
+    manager.exchange = SessionExchange()
+    manager.puller.subscribe(manager.exchange, "BTC", pull_interval=0)
+    await manager.puller.start()
+    await asyncio.sleep(0.05)
+    tasks = list(manager.puller._tasks)
+
+    await asyncio.wait_for(manager.stop(), 5)
+    await asyncio.sleep(0.05)
+
+    assert manager.exchange.polls
+    assert manager.exchange.closed
+    assert manager.exchange.polls_after_close == 0
+    assert all(task.done() for task in tasks)
+
+
+class DownStore:
+    """Candle store of a database which is down"""
+
+    async def history(self, *_args: object) -> CandleArrays:
+        raise ConnectionRefusedError("database is down")
+
+    async def upsert(self, *_args: object) -> None:
+        raise ConnectionRefusedError("database is down")
+
+
+class FreshStore:
+    """Candle store holding the recent bars"""
+
+    def __init__(self) -> None:
+        self.last = int(time.time() // 60 * 60_000)
+
+    async def history(
+        self, _exchange: str, _symbol: str, timeframe: int, size: int
+    ) -> CandleArrays:
+        times = self.last - np.arange(size)[::-1] * timeframe * 60_000
+        ones = np.ones(size)
+        return CandleArrays(time=times, open=ones, high=ones, low=ones, close=ones, volume=ones)
+
+
+async def test_stored_history_moves_the_poll_cursor(bingx_config: BingXConfig) -> None:
+    store = FreshStore()
+    manager = WorkerManager(store=store)
+    manager.exchange = BingXExchange(bingx_config)
+    try:
+        history = await manager.history("ETH", 1, 10)
+    finally:
+        await manager.exchange.stop()
+
+    assert history.time[-1] == store.last
+    assert manager.exchange._statistic("ETH").start_time == store.last
+
+
+async def test_history_survives_an_unavailable_store() -> None:
+    manager = WorkerManager(store=DownStore())
+    manager.exchange = SessionExchange()
+
+    history = await manager.history("BTC", 1, 10)
+
+    assert len(history) == 1
+    assert manager.exchange.polls == 1
+
+
+class Strategy:
+    def __init__(self) -> None:
+        self.signals = []
+
+    async def on_signal(self, candle: Candle, signal: Signal) -> None:
+        self.signals.append((candle.ts, signal))
+
+
+async def test_stop_ends_feeds_waiting_for_a_candle() -> None:
+    manager = WorkerManager()
+    manager.exchange = SessionExchange()
+    chart = Chart.new(ChartParams())
+    feed = ChartFeed(chart, "BTC", pull_interval=0)
+    workers = [Worker("first", Strategy()), Worker("second", Strategy())]
+    for worker in workers:
+        feed.attach(worker, 0, BusPolicy.LATEST)
+    subscription = manager.puller.subscribe(manager.exchange, "BTC", 0)
+    manager._tasks.append(asyncio.create_task(feed.loop(subscription)))
+    await manager.puller.start()
+    while not workers[0].strategy.signals:
+        await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(manager.stop(), 5)
+
+    assert all(task.done() for task in manager._tasks)
+    assert workers[0].strategy.signals == workers[1].strategy.signals
+    times = [ts for ts, _ in workers[0].strategy.signals]
+    assert chart.buffer.times.tolist() == times[-len(chart.buffer) :]
+
+
+def test_strategies_of_one_market_share_a_chart() -> None:
+    registry = ChartRegistry()
+    params = ChartParams(timeframe=5, indicators=[{"class": "RSI", "params": {}}])
+
+    chart = registry.get("BingX", "BTC", params)
+    assert registry.get("BingX", "BTC", params.model_copy(deep=True)) is chart
+    assert registry.get("CSV", "BTC", params) is not chart
+    assert registry.get("BingX", "BTC", params.model_copy(update={"size": 50})) is not chart
+    assert len(registry) == 3
+
+    feed = ChartFeed(chart, "BTC", pull_interval=10)
+    feed.attach(Worker("first", Strategy()), 10, BusPolicy.LATEST)
+    feed.attach(Worker("second", Strategy()), 3, BusPolicy.LOSSLESS)
+    assert (feed.name, feed.pull_interval, feed.policy) == ("first,second", 3, BusPolicy.LOSSLESS)
+
+
+async def test_bars_older_than_the_chart_do_not_reach_workers() -> None:
+    times = np.arange(1, 21, dtype=np.int64) * 60_000
+    ones = np.ones(20)
+    history = CandleArrays(time=times, open=ones, high=ones, low=ones, close=ones, volume=ones)
+    chart = Chart.new(ChartParams(size=50))
+    chart.load(history)
+    worker = Worker("first", Strategy())
+    worker.running = True
+    feed = ChartFeed(chart, "BTC", pull_interval=0)
+    feed.attach(worker, 0, BusPolicy.LOSSLESS)
+    bus = CandleBus()
+    subscription = bus.subscribe(BusPolicy.LOSSLESS)
+
+    # the first poll after the warm start delivers the history again
+    for candle in history.candles():
+        await bus.publish(candle)
+    bus.close()
+    await feed.loop(subscription)
+
+    assert [ts for ts, _ in worker.strategy.signals] == [times[-1]]
+
+
+async def test_workers_keep_their_registered_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in {
+        "API_KEY": "key",
+        "SECRET_KEY": "secret",
+        "HOST": "http://127.0.0.1:1",
+    }.items():
+        monkeypatch.setenv(f"BINGX_{name}", value)
+    manager = WorkerManager()
+    monkeypatch.setattr(manager, "bootstrap", lambda: asyncio.sleep(0))
+    params = {
+        "symbol": "ETH",
+        "exchange": "BingXExchange",
+        "chart": {"indicators": [{"class": "RSI", "params": {}}]},
+        "strategy": {
+            "class": "ExampleStrategy",
+            "params": {"take_profit": 0.5, "orders_map": [(0, 0.1)]},
+        },
+    }
+    stored = uuid.uuid4()
+    tasks = [
+        WorkerTask(id=stored, name="knife", params=params),
+        WorkerTask(id=uuid.uuid4(), name="knife", params=params),
+        WorkerTask(name="coded", params=params),
+    ]
+    await manager.start(tasks)
+    try:
+        ids = [worker.strategy.strategy_id for worker in manager._workers]
+    finally:
+        await manager.stop()
+
+    assert ids == [stored, uuid.uuid5(uuid.NAMESPACE_OID, "coded")]
@@ -2,7 +2,7 @@ import logging
 from contextlib import asynccontextmanager
 
 from common.container import Container
-from common.woker import WorkerManager
+from common.woker import Strategy, WorkerManager
 from config import get_settings
 from fastapi import FastAPI
 
@@ -14,8 +14,15 @@ async def lifespan(_app: FastAPI):  # noqa: ANN201
     logger.info("Starting up")
 
     container = Container(get_settings())
-    wm = WorkerManager(container)
-    await wm.start()
+    wm = WorkerManager(
+        persistence=container.persistence,
+        store=container.candle_store,
+        snapshots=container.snapshots,
+    )
+    strategies = await container.persistence.strategies("live")
+    if not strategies:
+        logger.warning("No live strategies are registered")
+    await wm.start([Strategy(id=s.id, name=s.name, params=s.params) for s in strategies])
     yield
 
     logger.info("Shutting down")
@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+from common.candles import CandleArrays
+from common.enums import Signal
+from common.schemas import Candle, Position
+from strategies.example import ExampleStrategy
+
+# deltas are rounded to 3 digits by the strategy, candidates are picked with a wider margin
+# and then checked by the strategy itself
+ROUND_MARGIN = 0.001
+SCAN_CHUNK = 256
+
+
+class BacktestEngine:
+    """
+    Runs 'ExampleStrategy' logic over candle arrays without the live pipeline.
+
+    Indicators and signals are computed in batch for the whole series, then the engine jumps
+    between bars where the strategy can act: a buy signal without a position or a delta
+    that may reach take profit or the next averaging level. Only those bars build a 'Candle'
+    and go through 'ExampleStrategy._handle', so orders and positions are the same as
+    feeding every candle to 'BaseStrategy.handle'.
+    """
+
+    def __init__(
+        self, strategy: ExampleStrategy, candles: CandleArrays, save_charts: bool = False
+    ) -> None:
+        self.strategy = strategy
+        self.candles = candles
+        self.save_charts = save_charts
+        self.columns: dict[str, np.ndarray] = {
+            "close": candles.close,
+            **strategy.chart.compute_batch(candles),
+        }
+        self.signals = strategy.chart.get_signal_batch(self.columns)
+
+    def _candle(self, index: int) -> Candle:
+        return Candle(
+            ts=int(self.candles.time[index]),
+            open=float(self.candles.open[index]),
+            high=float(self.candles.high[index]),
+            low=float(self.candles.low[index]),
+            close=float(self.candles.close[index]),
+            volume=float(self.candles.volume[index]),
+        )
+
+    def _next_buy(self, start: int) -> int | None:
+        buys = np.flatnonzero(self.signals[start:] == Signal.BUY.value)
+        return start + int(buys[0]) if len(buys) else None
+
+    def _next_order(self, start: int) -> int | None:
+        """First bar from 'start' where the open position may be closed or averaged"""
+        avg_price = self.strategy.position.avg_price
+        take_profit = self.strategy.take_profit - ROUND_MARGIN
+        level = -self.strategy.orders[0][0] + ROUND_MARGIN if self.strategy.orders else None
+        chunk = SCAN_CHUNK
+        while start < len(self.candles):
+            closes = self.candles.close[start : start + chunk]
+            delta = (closes - avg_price) / avg_price * 100
+            mask = delta > take_profit
+            if level is not None:
+                mask |= delta < min(level, 0)
+            hits = np.flatnonzero(mask)
+            if len(hits):
+                return start + int(hits[0])
+            start += chunk
+            chunk *= 2
+        return None
+
+    def _save_chart(self, index: int, position: Position) -> asyncio.Task:
+        """The figure is built at once, rendering goes on while the backtest continues"""
+        begin = max(0, index + 1 - self.strategy.chart.size)
+        self.strategy.chart.load(
+            self.candles[begin : index + 1],
+            {name: values[begin : index + 1] for name, values in self.columns.items()},
+        )
+        # the task starts after the chart has been loaded with later windows
+        fig = self.strategy.deal_figure(position)
+        return asyncio.create_task(self.strategy.save_figure(fig, position))
+
+    async def run(self) -> list[Position]:
+        positions = []
+        renders = []
+        index = self.strategy.chart.size - 1
+        while index < len(self.candles):
+            if self.strategy.position is None:
+                index = self._next_buy(index)
+            else:
+                index = self._next_order(index)
+            if index is None:
+                break
+            position = await self.strategy._handle(
+                self._candle(index), Signal(int(self.signals[index]))
+            )
+            if position is not None:
+                positions.append(position)
+                if self.save_charts:
+                    renders.append(self._save_chart(index, position))
+            index += 1
+
+        if self.strategy.position is not None and len(self.candles):
+            last = len(self.candles) - 1
+            position = await self.strategy.close_position(self._candle(last))
+            positions.append(position)
+            if self.save_charts:
+                renders.append(self._save_chart(last, position))
+        await asyncio.gather(*renders)
+        return positions
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from backtest.engine import BacktestEngine
+from common.candles import CandleArrays
+from common.chart import Chart
+from common.enums import OrderSide
+from common.params import WorkerParams
+from common.schemas import Position
+from exchanges.local.config import CSVConfig
+from exchanges.local.exchange import CSVExchange
+from strategies.example import ExampleStrategy
+
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+# state of a pool process, set once by '_init_worker'
+_shared: dict[str, Any] = {}
+
+
+class SharedCandles:
+    """Candle columns placed once in shared memory, processes attach to them without copying"""
+
+    def __init__(self, candles: CandleArrays) -> None:
+        self.size = len(candles)
+        self.memory = SharedMemory(create=True, size=max(1, len(COLUMNS) * self.size * 8))
+        arrays = self.attach(self.memory, self.size)
+        for name in COLUMNS:
+            getattr(arrays, name)[:] = getattr(candles, name)
+
+    @staticmethod
+    def attach(memory: SharedMemory, size: int) -> CandleArrays:
+        columns = {}
+        for i, name in enumerate(COLUMNS):
+            dtype = np.int64 if name == "time" else np.float64
+            columns[name] = np.ndarray((size,), dtype=dtype, buffer=memory.buf, offset=i * size * 8)
+        return CandleArrays(**columns)
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+
+def grid(space: dict[str, list]) -> list[dict]:
+    """Every combination of the parameter values"""
+    return [dict(zip(space, values, strict=True)) for values in itertools.product(*space.values())]
+
+
+def sample(space: dict[str, list], count: int, seed: int | None = None) -> list[dict]:
+    """'count' random combinations of the parameter values"""
+    rnd = random.Random(seed)
+    return [{key: rnd.choice(values) for key, values in space.items()} for _ in range(count)]
+
+
+def apply(params: WorkerParams, overrides: dict) -> WorkerParams:
+    """
+    Copy of the params with overrides applied. Keys are 'strategy.<name>' for strategy params
+    and '<indicator class>.<name>' for indicator params, e.g. 'TripleEma.fast_period'
+    """
+    params = params.model_copy(deep=True)
+    for key, value in overrides.items():
+        target, name = key.split(".", 1)
+        if target == "strategy":
+            params.strategy.params[name] = value
+            continue
+        indicators = [i for i in params.chart.indicators if i.class_ == target]
+        if not indicators:
+            raise ValueError(f"Unknown sweep parameter: {key}")
+        for indicator in indicators:
+            indicator.params = {**(indicator.params or {}), name: value}
+    return params
+
+
+def equity_curve(
+    candles: CandleArrays, positions: list[Position], initial_balance: float
+) -> np.ndarray:
+    """Balance plus the marked to market amount on every bar"""
+    cash = np.zeros(len(candles))
+    amount = np.zeros(len(candles))
+    for order in (order for position in positions for order in position.orders):
+        index = min(int(np.searchsorted(candles.time, order.ts)), len(candles) - 1)
+        sign = 1 if order.side == OrderSide.BUY else -1
+        cash[index] -= sign * order.cost
+        amount[index] += sign * order.amount
+    return initial_balance + np.cumsum(cash) + np.cumsum(amount) * candles.close
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    if not len(equity):
+        return 0
+    peak = np.maximum.accumulate(equity)
+    return float(np.max((peak - equity) / peak) * 100)
+
+
+def _init_worker(memory_name: str, size: int, params: dict, initial_balance: float) -> None:
+    memory = SharedMemory(name=memory_name)
+    if multiprocessing.get_start_method() != "fork":
+        # the parent owns the block, do not let this process' tracker unlink it on exit
+        resource_tracker.unregister(memory._name, "shared_memory")
+    _shared["memory"] = memory
+    _shared["candles"] = SharedCandles.attach(memory, size)
+    _shared["params"] = WorkerParams.model_validate(params)
+    _shared["initial_balance"] = initial_balance
+
+
+def _run(overrides: dict) -> dict:
+    candles: CandleArrays = _shared["candles"]
+    initial_balance = _shared["initial_balance"]
+    params = apply(_shared["params"], overrides)
+    exchange = CSVExchange(CSVConfig(PATH="", INITIAL_BALANCE=initial_balance))
+    strategy = ExampleStrategy(
+        strategy_id=uuid.uuid4(),
+        symbol=params.symbol,
+        chart=Chart.new(params.chart),
+        exchange=exchange,
+        online_check=False,
+        **params.strategy.params,
+    )
+    positions = asyncio.run(BacktestEngine(strategy, candles).run())
+    equity = equity_curve(candles, positions, initial_balance)
+    return {
+        **overrides,
+        "pnl": float(equity[-1] - initial_balance) if len(equity) else 0,
+        "drawdown": max_drawdown(equity),
+        "trades": len(positions),
+    }
+
+
+class SweepRunner:
+    """
+    Runs the backtest for many parameter sets on a process pool.
+
+    Candles are put into shared memory once, every process attaches to them at start
+    and runs its share of the parameter sets without copying the data.
+    """
+
+    def __init__(
+        self,
+        params: WorkerParams,
+        candles: CandleArrays,
+        initial_balance: float = 10000,
+        processes: int | None = None,
+    ) -> None:
+        self.params = params
+        self.candles = candles
+        self.initial_balance = initial_balance
+        self.processes = processes or os.cpu_count() or 1
+
+    def run(self, parameter_sets: Iterable[dict]) -> pd.DataFrame:
+        """Results ranked by PnL, one row per parameter set"""
+        parameter_sets = list(parameter_sets)
+        shared = SharedCandles(self.candles)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(
+                    shared.memory.name,
+                    shared.size,
+                    self.params.model_dump(by_alias=True),
+                    self.initial_balance,
+                ),
+            ) as executor:
+                chunksize = max(1, math.ceil(len(parameter_sets) / (self.processes * 4)))
+                results = list(executor.map(_run, parameter_sets, chunksize=chunksize))
+        finally:
+            shared.close()
+        table = pd.DataFrame(results)
+        if table.empty:
+            return table
+        return table.sort_values("pnl", ascending=False, ignore_index=True)
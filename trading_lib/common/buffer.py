@@ -0,0 +1,107 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar storage of bars.
+
+    Every column lives in a mirrored array of ``2 * capacity`` items: a value is written
+    both to ``i`` and ``i + capacity``, so the bars are always available in time order as
+    a contiguous slice ``[start:start + size]`` and views never need a copy.
+    """
+
+    def __init__(self, capacity: int, columns: Iterable[str]) -> None:
+        self.capacity = capacity
+        self.columns: tuple[str, ...] = tuple(dict.fromkeys(columns))
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._time = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.full((len(self.columns), 2 * capacity), np.nan, dtype=np.float64)
+        self._row = np.full(len(self.columns), np.nan, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size == self.capacity
+
+    @property
+    def times(self) -> np.ndarray:
+        """Bar open times (epoch ms) in time order"""
+        return self._time[self._start : self._start + self._size]
+
+    @property
+    def last_time(self) -> int | None:
+        if not self._size:
+            return None
+        return int(self._time[self.position(-1)])
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of the column in time order, a view without copying"""
+        return self._values[self._index[name], self._start : self._start + self._size]
+
+    def get(self, name: str, offset: int = -1) -> float | None:
+        if offset < -self._size or offset >= self._size:
+            return None
+        return float(self._values[self._index[name], self.position(offset)])
+
+    def row(self, offset: int = -1, columns: Iterable[str] | None = None) -> dict[str, float]:
+        if offset < -self._size or offset >= self._size:
+            return {}
+        position = self.position(offset)
+        return {
+            name: float(self._values[self._index[name], position])
+            for name in (columns or self.columns)
+        }
+
+    def append(self, time: int, values: dict[str, float]) -> None:
+        if self._size < self.capacity:
+            position = self._size
+            self._size += 1
+        else:
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._write(position, time, values)
+
+    def update_last(self, values: dict[str, float]) -> None:
+        position = self.position(-1)
+        self._write(position, int(self._time[position]), values)
+
+    def load(self, times: np.ndarray, columns: dict[str, np.ndarray]) -> None:
+        """Replace the content with the last 'capacity' rows of the columns"""
+        times = times[-self.capacity :]
+        size = len(times)
+        self._values.fill(np.nan)
+        for position in (0, self.capacity):
+            self._time[position : position + size] = times
+            for name, values in columns.items():
+                index = self._index.get(name)
+                if index is not None:
+                    self._values[index, position : position + size] = values[len(values) - size :]
+        self._start = 0
+        self._size = size
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def position(self, offset: int) -> int:
+        """Physical slot of the bar at the logical (time ordered) offset"""
+        if offset < 0:
+            offset += self._size
+        return (self._start + offset) % self.capacity
+
+    def _write(self, position: int, time: int, values: dict[str, float]) -> None:
+        row = self._row
+        row.fill(np.nan)
+        for name, value in values.items():
+            index = self._index.get(name)
+            if index is not None:
+                row[index] = value
+        self._time[position] = self._time[position + self.capacity] = time
+        self._values[:, position] = row
+        self._values[:, position + self.capacity] = row
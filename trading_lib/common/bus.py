@@ -0,0 +1,158 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from common.enums import BusPolicy
+from common.exceptions import BaseAppError
+from common.schemas import Candle
+
+
+class BusClosedError(BaseAppError):
+    default_msg = "Candle bus is closed"
+
+
+@dataclass
+class Subscription:
+    """
+    Read cursor of one consumer of a 'CandleBus'.
+
+    'LOSSLESS' makes the producer wait while 'bound' candles are pending, 'DROP_OLDEST' skips
+    to the newest 'bound' candles and 'LATEST' delivers only the last version of every bar.
+    Once the subscription or its bus is closed, 'get' raises 'BusClosedError' instead of
+    waiting; a closed bus still delivers the candles published before.
+    """
+
+    bus: "CandleBus"
+    policy: BusPolicy
+    bound: int
+    cursor: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    name: str = field(default="")
+    closed: bool = False
+
+    @property
+    def depth(self) -> int:
+        return self.bus.head - self.cursor
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest pending candle has been waiting"""
+        if not self.depth:
+            return 0.0
+        return time.monotonic() - self.bus.published_at(self.cursor)
+
+    @property
+    def info(self) -> str:
+        return (
+            f"{self.name} policy={self.policy} depth={self.depth} lag={self.lag:.3f}s "
+            f"delivered={self.delivered} dropped={self.dropped}"
+        )
+
+    def _skip_to(self, cursor: int) -> None:
+        self.dropped += cursor - self.cursor
+        self.cursor = cursor
+
+    def close(self) -> None:
+        """Leave the bus, a consumer waiting in 'get' is woken up"""
+        self.closed = True
+        self.bus.unsubscribe(self)
+
+    async def get(self) -> Candle:
+        while self.closed or not self.depth:
+            if self.closed or self.bus.closed:
+                raise BusClosedError(extra=self.name)
+            await self.bus.wait_published()
+        # overwritten candles are lost whatever the policy
+        self._skip_to(max(self.cursor, self.bus.head - self.bus.capacity))
+        if self.policy == BusPolicy.DROP_OLDEST:
+            self._skip_to(max(self.cursor, self.bus.head - self.bound))
+        candle = self.bus.item(self.cursor)
+        if self.policy == BusPolicy.LATEST:
+            while self.depth > 1 and self.bus.item(self.cursor + 1).ts == candle.ts:
+                self._skip_to(self.cursor + 1)
+                candle = self.bus.item(self.cursor)
+        self.cursor += 1
+        self.delivered += 1
+        self.bus.consumed()
+        return candle
+
+
+class CandleBus:
+    """
+    Single producer, multi consumer ring of candles.
+
+    Candles are stored once and every subscription reads them through its own cursor,
+    so a slow consumer never makes the others wait unless it has asked for 'LOSSLESS'.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self.head = 0
+        self.closed = False
+        self._items: list[Candle | None] = [None] * capacity
+        self._times = [0.0] * capacity
+        self._subscriptions: list[Subscription] = []
+        self._published = asyncio.Event()
+        self._consumed = asyncio.Event()
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        return self._subscriptions
+
+    def subscribe(
+        self, policy: BusPolicy = BusPolicy.LATEST, bound: int | None = None, name: str = ""
+    ) -> Subscription:
+        bound = min(bound or self.capacity, self.capacity)
+        subscription = Subscription(
+            bus=self, policy=policy, bound=bound, cursor=self.head, name=name
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        self.consumed()
+        self._wake()
+
+    def close(self) -> None:
+        """Wake up producers and consumers, nothing is published any more"""
+        self.closed = True
+        self.consumed()
+        self._wake()
+
+    def _wake(self) -> None:
+        event, self._published = self._published, asyncio.Event()
+        event.set()
+
+    def item(self, index: int) -> Candle:
+        return self._items[index % self.capacity]
+
+    def published_at(self, index: int) -> float:
+        return self._times[index % self.capacity]
+
+    async def wait_published(self) -> None:
+        await self._published.wait()
+
+    def consumed(self) -> None:
+        event, self._consumed = self._consumed, asyncio.Event()
+        event.set()
+
+    async def publish(self, candle: Candle) -> None:
+        for subscription in list(self._subscriptions):
+            while (
+                subscription.policy == BusPolicy.LOSSLESS
+                and subscription.depth >= subscription.bound
+                and not subscription.closed
+            ):
+                if self.closed:
+                    raise BusClosedError()
+                await self._consumed.wait()
+        if self.closed:
+            raise BusClosedError()
+        index = self.head % self.capacity
+        self._items[index] = candle
+        self._times[index] = time.monotonic()
+        self.head += 1
+        self._wake()
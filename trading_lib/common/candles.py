@@ -0,0 +1,84 @@
+from dataclasses import dataclass, fields
+from typing import Generator, Iterable, Sequence
+
+import numpy as np
+from common.schemas import Candle, from_timestamp, to_timestamp
+
+__all__ = ["CandleArrays", "from_timestamp", "to_timestamp"]
+
+
+@dataclass
+class CandleArrays:
+    """Columnar batch of candles in time order, time is epoch ms"""
+
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, item: slice | np.ndarray) -> "CandleArrays":
+        return CandleArrays(**{f.name: getattr(self, f.name)[item] for f in fields(self)})
+
+    @classmethod
+    def concat(cls, parts: Iterable["CandleArrays"]) -> "CandleArrays":
+        parts = list(parts)
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(
+            **{f.name: np.concatenate([getattr(p, f.name) for p in parts]) for f in fields(cls)}
+        )
+
+    @classmethod
+    def empty(cls) -> "CandleArrays":
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Sequence], columns: Sequence[int] = (0, 1, 2, 3, 4, 5)
+    ) -> "CandleArrays":
+        """
+        :param rows: rows of raw values (numbers or numeric strings)
+        :param columns: positions of time, open, high, low, close and volume in a row
+        """
+        data = np.asarray(rows, dtype=np.float64)
+        if data.ndim != 2:  # noqa: PLR2004
+            data = data.reshape(len(rows), -1) if len(rows) else np.empty((0, max(columns) + 1))
+        time, open_, high, low, close, volume = (data[:, i] for i in columns)
+        return cls(
+            time=time.astype(np.int64),
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> "CandleArrays":
+        return cls.from_rows([(c.ts, c.open, c.high, c.low, c.close, c.volume) for c in candles])
+
+    def candles(self) -> Generator[Candle, None, None]:
+        for ts, open_, high, low, close, volume in zip(
+            self.time.tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            strict=True,
+        ):
+            yield Candle(
+                ts=ts,
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+            )
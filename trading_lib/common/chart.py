@@ -1,18 +1,22 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from common.buffer import RingBuffer
+from common.candles import CandleArrays, from_timestamp, to_timestamp
+from common.decimate import bucket_starts, lttb, ohlc
 from common.enums import Signal
-from common.indicators import RSI, BaseIndicator, TripleEma
+from common.indicators import INDICATORS, BaseIndicator
+from common.indicators.series import Series, link
 from common.params import ChartParams
 from common.schemas import Candle
+from common.segment_tree import SegmentTree
 from plotly.subplots import make_subplots
 
-INDICATORS = {
-    "TripleEma": TripleEma,
-    "RSI": RSI,
-}
+CANDLE_COLUMNS = ("open", "high", "low", "close", "volume")
 
 
 @dataclass
@@ -22,54 +26,116 @@ class Chart:
     indicators: list[BaseIndicator]
     rows: int
     cols: int
-    data: dict[datetime, dict] = field(default_factory=dict)
-    time_series: list[datetime] = field(default_factory=list)
+    max_points: int = 1000
+    series: list[Series] = field(init=False)
+    buffer: RingBuffer = field(init=False)
+    lows: SegmentTree = field(init=False)
+    highs: SegmentTree = field(init=False)
+
+    def __post_init__(self) -> None:
+        # intermediate series of the indicators, each one is computed once per bar
+        self.series = link(self.indicators)
+        columns = list(CANDLE_COLUMNS)
+        for indicator in (*self.series, *self.indicators):
+            columns.extend(indicator.columns)
+        self.buffer = RingBuffer(self.size, columns)
+        self.lows = SegmentTree(self.size)
+        self.highs = SegmentTree(self.size, maximum=True)
+
+    @property
+    def last_time(self) -> datetime | None:
+        last_time = self.buffer.last_time
+        return None if last_time is None else from_timestamp(last_time)
 
     @property
     def is_online(self) -> bool:
-        if not self.time_series:
+        if not self.buffer:
             return False
         local_dt = datetime.now().astimezone()
-        return local_dt - self.time_series[-1] < timedelta(minutes=self.timeframe)
+        return local_dt - self.last_time < timedelta(minutes=self.timeframe)
 
     def get_delta(self) -> float:
-        price_first = self.data[self.time_series[0]].get("close")
-        price_last = self.data[self.time_series[-1]].get("close")
+        closes = self.buffer.column("close")
+        price_first, price_last = float(closes[0]), float(closes[-1])
         return round((price_last - price_first) / price_first * 100, 2)
 
     @property
     def is_ready(self) -> bool:
-        return len(self.time_series) == self.size
+        return self.buffer.is_full
 
     @classmethod
     def new(cls, params: ChartParams) -> "Chart":
         return cls(
             timeframe=params.timeframe,
             size=params.size,
-            indicators=[INDICATORS[i.class_](**i.params) for i in params.indicators],
+            indicators=[INDICATORS[i.class_](**(i.params or {})) for i in params.indicators],
             rows=params.rows,
             cols=params.cols,
+            max_points=params.max_points,
         )
 
-    def add(self, candle: Candle) -> Signal:
-        new_data = candle.dict()
-        if candle.time not in self.data:
+    def add(self, candle: Candle) -> Signal | None:
+        """Signal of the chart with the candle, None when the candle is older than the last bar"""
+        time = candle.ts
+        last_time = self.buffer.last_time
+        new_data = {
+            "open": candle.open,
+            "high": candle.high,
+            "low": candle.low,
+            "close": candle.close,
+            "volume": candle.volume,
+        }
+        if last_time is None or time > last_time:
+            for series in self.series:
+                new_data.update(series.new_data(candle))
             for indicator in self.indicators:
-                upd = indicator.new_data(self.time_series, self.data, candle.close)
+                upd = indicator.new_data(candle)
                 new_data.update(upd)
-            self.time_series.append(candle.time)
-            if len(self.time_series) > self.size:
-                old_time = self.time_series.pop(0)
-                self.data.pop(old_time)
-            self.data[candle.time] = new_data
-        else:
+            self.buffer.append(time, new_data)
+        elif time == last_time:
+            for series in self.series:
+                new_data.update(series.update_last(candle))
             for indicator in self.indicators:
-                upd = indicator.update_last(self.time_series, self.data, candle.close)
+                upd = indicator.update_last(candle)
                 new_data.update(upd)
-            self.data[candle.time] = new_data
+            self.buffer.update_last(new_data)
+        else:
+            return None
 
+        position = self.buffer.position(-1)
+        self.lows.update(position, candle.low)
+        self.highs.update(position, candle.high)
         return self.get_signal(new_data)
 
+    def load(self, candles: CandleArrays, columns: dict[str, np.ndarray] = None) -> None:
+        """
+        Replace the content with the last 'size' candles.
+        Indicators are computed in batch unless their precomputed 'columns' are passed
+        """
+        candles = candles[-self.size :]
+        if columns is None:
+            columns = self.compute_batch(candles)
+        columns = {
+            **{name: values[len(values) - len(candles) :] for name, values in columns.items()},
+            "open": candles.open,
+            "high": candles.high,
+            "low": candles.low,
+            "close": candles.close,
+            "volume": candles.volume,
+        }
+        self.buffer.load(candles.time, columns)
+        for series in (*self.series, *self.indicators):
+            series.load_state(columns)
+        self.lows.load(candles.low.tolist())
+        self.highs.load(candles.high.tolist())
+
+    def compute_batch(self, candles: CandleArrays) -> dict[str, np.ndarray]:
+        """Columns of the intermediate series and the indicators for the candles"""
+        columns = {}
+        for series in (*self.series, *self.indicators):
+            columns.update(series.compute_batch(candles, columns))
+        return columns
+
     def get_signal(self, data: dict) -> Signal:
         signals = [(i.signal(data), i) for i in self.indicators]
         buy = all(signal == Signal.BUY for signal, i in signals)  # if i.use_for_buy is True
@@ -80,10 +146,69 @@ class Chart:
             return Signal.SELL
         return Signal.NONE
 
-    def make_figure(self, caption: str, label: str, from_dt: datetime = None) -> go.Figure:
-        from_dt = from_dt or self.time_series[0]
-        chart_df = pd.DataFrame.from_records(
-            [self.data[t] for t in self.time_series if t >= from_dt]
+    def get_signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        """Signal values for every bar of the columns, the batch counterpart of 'get_signal'"""
+        signals = [(i.signal_batch(data), i) for i in self.indicators]
+        size = len(data["close"])
+        buy = np.logical_and.reduce(
+            [signal == Signal.BUY.value for signal, _ in signals], initial=True
+        )
+        sell = np.logical_and.reduce(
+            [signal == Signal.SELL.value for signal, i in signals if i.use_for_sell is True],
+            initial=True,
+        )
+        return np.select(
+            [np.broadcast_to(buy, size), np.broadcast_to(sell, size)],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
+    def _decimate(self, start: int, markers: Iterable[datetime]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rows of the window to draw the lines with and starts of the candle buckets. Every
+        plotted line keeps its share of 'max_points' by LTTB, marker bars and the bars with
+        the extreme values of every line stay as they are.
+        """
+        times = self.buffer.times[start:]
+        # a marker, e.g. a fill, keeps the bar it happened in
+        marks = [to_timestamp(dt) for dt in markers]
+        keep = np.searchsorted(times, marks, side="right").astype(np.int64) - 1
+        keep = np.clip(keep, 0, max(len(times) - 1, 0))
+        lines = [name for indicator in self.indicators for name in indicator.plot_columns]
+        if not self.max_points or len(times) <= self.max_points:
+            rows = np.arange(len(times))
+            return rows, rows
+        budget = self.max_points // max(1, len(lines))
+        rows = [keep]
+        for name in lines:
+            values = self.buffer.column(name)[start:]
+            rows.append(lttb(times, values, budget))
+            if np.isfinite(values).any():
+                rows.append(np.array([np.nanargmin(values), np.nanargmax(values)]))
+        return np.unique(np.concatenate(rows)), bucket_starts(len(times), self.max_points, keep)
+
+    def _frame(self, start: int, rows: np.ndarray, columns: Iterable[str]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "time": pd.to_datetime(
+                    self.buffer.times[start:][rows], unit="ms", utc=True
+                ).tz_convert(datetime.now().astimezone().tzinfo),
+                **{name: self.buffer.column(name)[start:][rows] for name in columns},
+            }
+        )
+
+    def make_figure(
+        self, caption: str, label: str, from_dt: datetime = None, markers: Iterable[datetime] = ()
+    ) -> go.Figure:
+        """Figure of the bars since 'from_dt', bars of the 'markers' times are never decimated"""
+        times = self.buffer.times
+        start = 0 if from_dt is None else int(np.searchsorted(times, to_timestamp(from_dt)))
+        rows, starts = self._decimate(start, markers)
+        chart_df = self._frame(start, rows, self.buffer.columns)
+        candles_df = self._frame(start, starts, ())
+        candles_df["open"], candles_df["high"], candles_df["low"], candles_df["close"] = ohlc(
+            *(self.buffer.column(name)[start:] for name in ("open", "high", "low", "close")),
+            starts,
         )
         figure = make_subplots(
             rows=self.rows,
@@ -94,11 +219,11 @@ class Chart:
             subplot_titles=(caption,),
         )
         candle_stick = go.Candlestick(
-            x=chart_df["time"],
-            open=chart_df["open"],
-            high=chart_df["high"],
-            low=chart_df["low"],
-            close=chart_df["close"],
+            x=candles_df["time"],
+            open=candles_df["open"],
+            high=candles_df["high"],
+            low=candles_df["low"],
+            close=candles_df["close"],
             name=f"{label} ({self.size} bars)",
         )
         figure.add_trace(candle_stick, row=1, col=1)
@@ -107,26 +232,22 @@ class Chart:
             indicator.add_trace(figure, chart_df)
         return figure
 
+    def _window(self, from_time: datetime, to_time: datetime | None = None) -> tuple[int, int]:
+        times = self.buffer.times
+        start = int(np.searchsorted(times, to_timestamp(from_time), side="left"))
+        if to_time is None:
+            return start, len(times)
+        return start, int(np.searchsorted(times, to_timestamp(to_time), side="right"))
+
+    def _find(self, tree: SegmentTree, start: int, end: int) -> tuple[float, datetime]:
+        if start >= end:
+            return None, None
+        position = tree.query_ring(self.buffer.position(start), end - start)
+        index = (position - self.buffer.position(0)) % self.size
+        return tree.value(position), from_timestamp(self.buffer.times[index])
+
     def find_min(self, from_time: datetime, to_time: datetime) -> tuple[float, datetime]:
-        min_value, min_value_time = None, None
-        for t in self.time_series:
-            if to_time >= t >= from_time:
-                if min_value is None:
-                    min_value = self.data[t]["low"]
-                    min_value_time = t
-                if self.data[t]["low"] < min_value:
-                    min_value = self.data[t]["low"]
-                    min_value_time = t
-        return min_value, min_value_time
+        return self._find(self.lows, *self._window(from_time, to_time))
 
     def find_max(self, from_time: datetime) -> tuple[float, datetime]:
-        max_value, max_value_time = None, None
-        for t in self.time_series:
-            if t >= from_time:
-                if max_value is None:
-                    max_value = self.data[t]["high"]
-                    max_value_time = t
-                if self.data[t]["high"] > max_value:
-                    max_value = self.data[t]["high"]
-                    max_value_time = t
-        return max_value, max_value_time
+        return self._find(self.highs, *self._window(from_time))
@@ -0,0 +1,29 @@
+from common.chart import Chart
+from common.params import ChartParams
+
+ChartKey = tuple[str, str, str]
+
+
+class ChartRegistry:
+    """
+    One chart per exchange, symbol and chart parameters: the timeframe, the indicator set
+    and the size. Strategies watching the same market with the same indicators get the
+    same chart, so bars and indicators are computed and stored once, whatever the number
+    of strategies. Shared charts are updated by their owner only, strategies just read them.
+    """
+
+    def __init__(self) -> None:
+        self._charts: dict[ChartKey, Chart] = {}
+
+    def __len__(self) -> int:
+        return len(self._charts)
+
+    @staticmethod
+    def key(exchange: str, symbol: str, params: ChartParams) -> ChartKey:
+        return exchange, symbol, params.model_dump_json(by_alias=True)
+
+    def get(self, exchange: str, symbol: str, params: ChartParams) -> Chart:
+        key = self.key(exchange, symbol, params)
+        if key not in self._charts:
+            self._charts[key] = Chart.new(params)
+        return self._charts[key]
@@ -1,9 +1,13 @@
 import asyncio
 
-from common.exchange import ExchangeFactory
 from common.puller import Puller
+from common.render import RenderPool
+from common.snapshot import SnapshotStore
 from config import Settings
+from db.candles import CandleStore
 from db.db_connector import DatabaseConnector
+from db.persistence import PersistenceService
+from exchanges.factory import ExchangeFactory
 from telegram.client import TelegramClient
 
 
@@ -15,6 +19,8 @@ class Container:
         self._tg_client: TelegramClient | None = None
         self._exchange_fabric: ExchangeFactory | None = None
         self._puller: Puller | None = None
+        self._persistence: PersistenceService | None = None
+        self._candle_store: CandleStore | None = None
 
     @property
     def db(self) -> DatabaseConnector:
@@ -22,6 +28,22 @@ class Container:
             self._db = DatabaseConnector(self._settings.DB.asyncpg_url)
         return self._db
 
+    @property
+    def persistence(self) -> PersistenceService:
+        if self._persistence is None:
+            self._persistence = PersistenceService(self.db)
+        return self._persistence
+
+    @property
+    def candle_store(self) -> CandleStore:
+        if self._candle_store is None:
+            self._candle_store = CandleStore(self.db)
+        return self._candle_store
+
+    @property
+    def snapshots(self) -> SnapshotStore:
+        return SnapshotStore(self._settings.SNAPSHOT_DIR, self._settings.SNAPSHOT_INTERVAL)
+
     @property
     def tg_client(self) -> TelegramClient:
         if self._tg_client is None:
@@ -37,10 +59,22 @@ class Container:
     @property
     def puller(self) -> Puller:
         if self._puller is None:
-            self._puller = Puller()
+            self._puller = Puller(self.candle_store)
         return self._puller
 
     async def stop(self) -> None:
+        if self._persistence is not None:
+            await self._persistence.stop()
+        self._persistence = None
+
+        if self._puller is not None:
+            await self._puller.stop()
+        self._puller = None
+
+        if self._candle_store is not None:
+            await self._candle_store.stop()
+        self._candle_store = None
+
         if self._db is not None:
             await self._db.disconnect()
         self._db = None
@@ -53,6 +87,4 @@ class Container:
             await self._exchange_fabric.stop()
         self._exchange_fabric = None
 
-        if self._puller is not None:
-            await self._puller.stop()
-        self._puller = None
+        await RenderPool.stop_shared()
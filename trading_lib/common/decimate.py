@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of at most 'threshold' points which keep the visual shape of the line,
+    by Largest-Triangle-Three-Buckets. The first and the last points are always kept.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:  # noqa: PLR2004
+        return np.arange(size)
+    x = x.astype(np.float64)
+    y = np.nan_to_num(y.astype(np.float64), nan=np.nanmean(y) if np.isfinite(y).any() else 0)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    previous = 0
+    for i in range(threshold - 2):
+        begin, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[begin:end] - y[previous])
+            - (x[previous] - x[begin:end]) * (next_y - y[previous])
+        )
+        previous = begin + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def bucket_starts(size: int, threshold: int, keep: np.ndarray | None = None) -> np.ndarray:
+    """
+    Starts of at most 'threshold' even buckets over 'size' bars, the bars of 'keep' get
+    a bucket of their own so they are never merged with neighbours
+    """
+    if threshold >= size:
+        return np.arange(size)
+    starts = np.linspace(0, size, threshold, endpoint=False).astype(np.int64)
+    if keep is not None and len(keep):
+        keep = keep[(keep >= 0) & (keep < size)]
+        starts = np.concatenate([starts, keep, keep + 1])
+    return np.unique(starts[starts < size])
+
+
+def ohlc(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, starts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Aggregate bars into buckets beginning at 'starts', extremes are kept by construction"""
+    ends = np.r_[starts[1:], len(close)] - 1
+    return (
+        open_[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        close[ends],
+    )
@@ -12,11 +12,28 @@ class OrderSide(StrEnum):
     SELL = "SELL"
 
 
+class PositionStatus(StrEnum):
+    OPEN = "OPEN"
+    CLOSED = "CLOSED"
+
+
 class ExchangeType(StrEnum):
     BINGX = "BingXExchange"
+    BINGX_STREAM = "BingXStreamExchange"
     CSV = "CSVExchange"
 
 
 class IndicatorType(StrEnum):
     TRIPLE_EMA = "TripleEma"
     RSI = "RSI"
+    MACD = "MACD"
+    BOLLINGER = "Bollinger"
+    ATR = "ATR"
+    VWAP = "VWAP"
+    STOCHASTIC = "Stochastic"
+
+
+class BusPolicy(StrEnum):
+    LOSSLESS = "lossless"
+    LATEST = "latest"
+    DROP_OLDEST = "drop_oldest"
@@ -1,10 +1,14 @@
 import abc
 from typing import Generator
 
+from common.candles import CandleArrays
 from common.schemas import Candle, Order, OrderIN
 
 
 class BaseExchange(abc.ABC):
+    # market data source the stored candles are keyed by
+    name: str = ""
+
     @abc.abstractmethod
     async def stop(self) -> None:
         raise NotImplementedError("Please implement 'stop' method")
@@ -15,6 +19,14 @@ class BaseExchange(abc.ABC):
     ) -> Generator[Candle, None, None]:
         yield NotImplementedError("Please implement 'get_candles' method")
 
+    async def get_history(self, symbol: str, timeframe: int = 1, size: int = 1000) -> CandleArrays:
+        """Last 'size' candles as arrays, exchanges override it with a single bulk request"""
+        candles = [c async for c in self.get_candles(symbol, timeframe, size)]
+        return CandleArrays.from_candles(candles[-size:])
+
+    def resume_from(self, symbol: str, ts: int) -> None:  # noqa: B027
+        """Let polls of the symbol start no later than 'ts', history served elsewhere ends there"""
+
     @abc.abstractmethod
     async def place_order(self, order_in: OrderIN, client_oid: str = None) -> Order:
         raise NotImplementedError("Please implement 'place_order' method")
@@ -1,9 +1,21 @@
-from .base import BaseIndicator
+from .atr import ATR
+from .base import INDICATORS, BaseIndicator, register
+from .bollinger import Bollinger
 from .ema import TripleEma
+from .macd import MACD
 from .rsi import RSI
+from .stochastic import Stochastic
+from .vwap import VWAP
 
 __all__ = [
+    "INDICATORS",
     "BaseIndicator",
+    "register",
     "TripleEma",
     "RSI",
+    "MACD",
+    "Bollinger",
+    "ATR",
+    "VWAP",
+    "Stochastic",
 ]
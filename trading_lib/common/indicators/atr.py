@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.schemas import Candle
+
+
+@register(IndicatorType.ATR)
+@dataclass
+class ATR(BaseIndicator):
+    """
+    Average true range by Wilder's smoothing. It has no direction, so it only lets buys
+    through while the range is at least 'min_volatility' percent of the close price.
+    """
+
+    period: int = 14
+    min_volatility: float = 0.0
+    use_for_sell: bool = False
+
+    def __str__(self) -> str:
+        return f"ATR({self.period}, min: {self.min_volatility}%)"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (f"ATR_{self.period}",)
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        return "close", *self.columns
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:
+        if state is None:
+            true_range = candle.high - candle.low
+            return candle.close, true_range
+        prev_close, prev_atr = state
+        true_range = max(
+            candle.high - candle.low, abs(candle.high - prev_close), abs(candle.low - prev_close)
+        )
+        return candle.close, (prev_atr * (self.period - 1) + true_range) / self.period
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        prev_close = np.concatenate((candles.close[:1], candles.close[:-1]))
+        true_range = np.maximum.reduce(
+            [
+                candles.high - candles.low,
+                np.abs(candles.high - prev_close),
+                np.abs(candles.low - prev_close),
+            ]
+        )
+        # the first bar has no previous close
+        true_range[:1] = candles.high[:1] - candles.low[:1]
+        return {self.keys[0]: self.calc_wilder_batch(true_range, self.period)}
+
+    def signal(self, last_data: dict) -> Signal:
+        if last_data[self.keys[0]] >= last_data["close"] * self.min_volatility / 100:
+            return Signal.BUY
+        return Signal.NONE
+
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        return np.where(
+            data[self.keys[0]] >= data["close"] * self.min_volatility / 100,
+            Signal.BUY.value,
+            Signal.NONE.value,
+        )
+
+    def add_trace(
+        self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 2, col: int = 1
+    ) -> None:
+        figure.add_trace(
+            go.Scatter(
+                x=chart_df["time"], y=chart_df[self.keys[0]], mode="lines", name=self.keys[0]
+            ),
+            row=row,
+            col=col,
+        )
@@ -1,38 +1,51 @@
 from dataclasses import dataclass
-from datetime import datetime
+from typing import Callable
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from common.enums import Signal
+from common.indicators.series import Series, State
+
+__all__ = ["INDICATORS", "BaseIndicator", "State", "register"]
+
+# indicator classes by the names 'ChartParams' refers to them with
+INDICATORS: dict[str, type["BaseIndicator"]] = {}
+
+
+def register(name: str) -> Callable[[type["BaseIndicator"]], type["BaseIndicator"]]:
+    """Class decorator which makes an indicator available to charts by 'name'"""
+
+    def decorator(cls: type["BaseIndicator"]) -> type["BaseIndicator"]:
+        if INDICATORS.get(name, cls) is not cls:
+            raise ValueError(f"Indicator {name!r} is already registered")
+        INDICATORS[name] = cls
+        return cls
+
+    return decorator
 
 
 @dataclass
-class BaseIndicator:
+class BaseIndicator(Series):
+    """Streaming series which gives trading signals and draws itself on a figure"""
+
     use_for_buy: bool = True
     use_for_sell: bool = True
 
     def __str__(self) -> str:
         return str(self.__dict__)
 
-    def _calculate(self, last_data: dict, price: float) -> dict:
-        raise NotImplementedError("Please implement '_calculate' method")
-
-    @staticmethod
-    def calc_ema(prev_ema: float, period: int, new_value: float) -> float:
-        prev_ema = prev_ema or new_value
-        k = 2 / (period + 1)
-        return (new_value - prev_ema) * k + prev_ema
-
-    def new_data(self, time_series: list[datetime], data: dict, price: float) -> dict:
-        last_data = data[time_series[-1]] if data else {}
-        return self._calculate(last_data, price)
-
-    def update_last(self, time_series: list[datetime], data: dict, price: float) -> dict:
-        last_data = data[time_series[-2]]
-        return self._calculate(last_data, price)
+    @property
+    def plot_columns(self) -> tuple[str, ...]:
+        """Names of the chart columns 'add_trace' draws as lines"""
+        return self.columns
 
     def signal(self, last_data: dict) -> Signal:
         raise NotImplementedError("Please implement 'signal' method")
 
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        """Signal values for every bar of the columns, the batch counterpart of 'signal'"""
+        raise NotImplementedError("Please implement 'signal_batch' method")
+
     def add_trace(self, figure: go.Figure, chart_df: pd.DataFrame) -> None:
         raise NotImplementedError("Please implement 'add_trace' method")
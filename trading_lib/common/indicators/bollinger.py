@@ -0,0 +1,115 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.schemas import Candle
+
+
+@register(IndicatorType.BOLLINGER)
+@dataclass
+class Bollinger(BaseIndicator):
+    """
+    Bands of 'width' population standard deviations around the mean close of 'period' bars.
+    The mean and the sum of squared deviations of the closed bars are kept by Welford's
+    method over the sliding window, the forming bar is added on top of them.
+    """
+
+    period: int = 20
+    width: float = 2.0
+    window: deque[float] = field(default_factory=deque, init=False, repr=False, compare=False)
+    mean: float = field(default=0.0, init=False, repr=False, compare=False)
+    m2: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.window = deque(maxlen=self.window_size)
+
+    def __str__(self) -> str:
+        return f"Bollinger({self.period}, {self.width})"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return f"BB_{self.period}_mid", f"BB_{self.period}_upper", f"BB_{self.period}_lower"
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        return "close", *self.columns
+
+    @property
+    def window_size(self) -> int:
+        return self.period - 1
+
+    def _reset(self) -> None:
+        self.window.clear()
+        self.mean = self.m2 = 0.0
+
+    def _commit(self, state: State) -> None:
+        if not self.window_size:
+            return
+        value = state[0]
+        if len(self.window) == self.window_size:
+            # replace the oldest value, the size of the window stays the same
+            old = self.window[0]
+            mean = self.mean + (value - old) / self.window_size
+            self.m2 += (value - old) * (value - mean + old - self.mean)
+            self.mean = mean
+        else:
+            delta = value - self.mean
+            self.mean += delta / (len(self.window) + 1)
+            self.m2 += delta * (value - self.mean)
+        self.window.append(value)
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:  # noqa: ARG002
+        price = candle.close
+        size = len(self.window) + 1
+        delta = price - self.mean
+        mean = self.mean + delta / size
+        deviation = math.sqrt(max(self.m2 + delta * (price - mean), 0.0) / size) * self.width
+        return price, mean, mean + deviation, mean - deviation
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        window = pd.Series(candles.close).rolling(self.period, min_periods=1)
+        mean = window.mean().to_numpy()
+        deviation = window.std(ddof=0).fillna(0).to_numpy() * self.width
+        mid, upper, lower = self.keys
+        return {mid: mean, upper: mean + deviation, lower: mean - deviation}
+
+    def signal(self, last_data: dict) -> Signal:
+        _, upper, lower = self.keys
+        if last_data["close"] < last_data[lower]:
+            return Signal.BUY
+        if last_data["close"] > last_data[upper]:
+            return Signal.SELL
+        return Signal.NONE
+
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        _, upper, lower = self.keys
+        return np.select(
+            [data["close"] < data[lower], data["close"] > data[upper]],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
+    def add_trace(
+        self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 1, col: int = 1
+    ) -> None:
+        for key, dash in zip(self.keys, ("dot", "solid", "solid"), strict=True):
+            figure.add_trace(
+                go.Scatter(
+                    x=chart_df["time"],
+                    y=chart_df[key],
+                    mode="lines",
+                    name=key,
+                    line={"color": "purple", "width": 1, "dash": dash},
+                ),
+                row=row,
+                col=col,
+            )
@@ -1,13 +1,21 @@
 from dataclasses import dataclass
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from common.enums import Signal
-from common.indicators import BaseIndicator
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.indicators.series import Ema, Series
+from common.schemas import Candle
 
 
+@register(IndicatorType.TRIPLE_EMA)
 @dataclass
 class TripleEma(BaseIndicator):
+    """Three EMAs of the close, they are chart series shared with other indicators"""
+
     fast_period: int = 20
     medium_period: int = 100
     slow_period: int = 300
@@ -15,38 +23,53 @@ class TripleEma(BaseIndicator):
     def __str__(self) -> str:
         return f"EMA({self.fast_period}, {self.medium_period}, {self.slow_period})"
 
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return ()
+
+    @property
+    def plot_columns(self) -> tuple[str, ...]:
+        return self.fast_key, self.medium_key, self.slow_key
+
     @property
     def fast_key(self) -> str:
-        return f"Ema_{self.fast_period}"
+        return self.dependencies[0].key
 
     @property
     def medium_key(self) -> str:
-        return f"Ema_{self.medium_period}"
+        return self.dependencies[1].key
 
     @property
     def slow_key(self) -> str:
-        return f"Ema_{self.slow_period}"
-
-    def _calculate(self, last_data: dict, price: float) -> dict:
-        return {
-            self.fast_key: self.calc_ema(
-                last_data.get(self.fast_key, price), self.fast_period, price
-            ),
-            self.medium_key: self.calc_ema(
-                last_data.get(self.medium_key, price), self.medium_period, price
-            ),
-            self.slow_key: self.calc_ema(
-                last_data.get(self.slow_key, price), self.slow_period, price
-            ),
-        }
+        return self.dependencies[2].key
+
+    def _dependencies(self) -> Iterable[Series]:
+        return Ema(self.fast_period), Ema(self.medium_period), Ema(self.slow_period)
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:  # noqa: ARG002
+        return ()
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        return {}
 
     def signal(self, last_data: dict) -> Signal:
-        if last_data[self.slow_key] > last_data[self.medium_key] > last_data[self.fast_key]:
+        fast_key, medium_key, slow_key = self.plot_columns
+        if last_data[slow_key] > last_data[medium_key] > last_data[fast_key]:
             return Signal.BUY
-        if last_data[self.slow_key] < last_data[self.medium_key] < last_data[self.fast_key]:
+        if last_data[slow_key] < last_data[medium_key] < last_data[fast_key]:
             return Signal.SELL
         return Signal.NONE
 
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        fast, medium, slow = data[self.fast_key], data[self.medium_key], data[self.slow_key]
+        return np.select(
+            [(slow > medium) & (medium > fast), (slow < medium) & (medium < fast)],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
     def add_trace(
         self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 1, col: int = 1
     ) -> None:
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.indicators.series import Ema, Series
+from common.schemas import Candle
+
+
+@register(IndicatorType.MACD)
+@dataclass
+class MACD(BaseIndicator):
+    fast_period: int = 12
+    slow_period: int = 26
+    signal_period: int = 9
+
+    def __str__(self) -> str:
+        return f"MACD({self.fast_period}, {self.slow_period}, {self.signal_period})"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        name = f"MACD_{self.fast_period}_{self.slow_period}"
+        return name, f"{name}_signal", f"{name}_hist"
+
+    @property
+    def plot_columns(self) -> tuple[str, ...]:
+        return self.keys[:2]
+
+    def _dependencies(self) -> Iterable[Series]:
+        return Ema(self.fast_period), Ema(self.slow_period)
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:  # noqa: ARG002
+        fast, slow = self.dependencies
+        macd = fast.value - slow.value
+        signal = self.calc_ema(state and state[1], self.signal_period, macd)
+        return macd, signal, macd - signal
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        fast, slow = self.dependencies
+        macd = columns[fast.key] - columns[slow.key]
+        signal = self.calc_ema_batch(macd, self.signal_period)
+        macd_key, signal_key, hist_key = self.keys
+        return {macd_key: macd, signal_key: signal, hist_key: macd - signal}
+
+    def signal(self, last_data: dict) -> Signal:
+        """Momentum turns up below the zero line or down above it"""
+        macd, hist = last_data[self.keys[0]], last_data[self.keys[2]]
+        if macd < 0 < hist:
+            return Signal.BUY
+        if macd > 0 > hist:
+            return Signal.SELL
+        return Signal.NONE
+
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        macd, hist = data[self.keys[0]], data[self.keys[2]]
+        return np.select(
+            [(macd < 0) & (hist > 0), (macd > 0) & (hist < 0)],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
+    def add_trace(
+        self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 2, col: int = 1
+    ) -> None:
+        macd_key, signal_key, hist_key = self.keys
+        figure.add_trace(
+            go.Bar(x=chart_df["time"], y=chart_df[hist_key], name=hist_key), row=row, col=col
+        )
+        for key, color in [(macd_key, "blue"), (signal_key, "orange")]:
+            figure.add_trace(
+                go.Scatter(
+                    x=chart_df["time"],
+                    y=chart_df[key],
+                    mode="lines",
+                    name=key,
+                    line={"color": color, "width": 1},
+                ),
+                row=row,
+                col=col,
+            )
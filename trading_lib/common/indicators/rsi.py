@@ -1,11 +1,17 @@
 from dataclasses import dataclass
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from common.enums import Signal
-from common.indicators import BaseIndicator
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.indicators.series import Diff, Series
+from common.schemas import Candle
 
 
+@register(IndicatorType.RSI)
 @dataclass
 class RSI(BaseIndicator):
     period: int = 14
@@ -15,26 +21,56 @@ class RSI(BaseIndicator):
     def __str__(self) -> str:
         return f"RSI({self.period}, ema: {self.ema_period}, zone: {self.zone}, {self.use_for_sell})"
 
-    def _calculate(self, last_data: dict, price: float) -> dict:
-        diff = price - last_data.get("close", price)
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return "avg_gain", "avg_loss", f"RSI_{self.period}", f"RSI_ema_{self.period}"
+
+    @property
+    def plot_columns(self) -> tuple[str, ...]:
+        return f"RSI_{self.period}", f"RSI_ema_{self.period}"
+
+    def _dependencies(self) -> Iterable[Series]:
+        return (Diff("close"),)
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:  # noqa: ARG002
+        diff = self.dependencies[0].value
+        prev_gain, prev_loss, _, prev_ema = state or (None, None, None, None)
         gain = diff if diff > 0 else 0
         loss = -diff if diff < 0 else 0
 
-        avg_gain = (last_data.get("avg_gain", gain) * (self.period - 1) + gain) / self.period
-        avg_loss = (last_data.get("avg_loss", loss) * (self.period - 1) + loss) / self.period
+        avg_gain = (
+            (gain if prev_gain is None else prev_gain) * (self.period - 1) + gain
+        ) / self.period
+        avg_loss = (
+            (loss if prev_loss is None else prev_loss) * (self.period - 1) + loss
+        ) / self.period
+
+        rs = avg_gain / (avg_loss + 0.0001)
+        rsi = 100 - (100 / (1 + rs))
+        ema = self.calc_ema(rsi if prev_ema is None else prev_ema, self.ema_period, rsi)
+        return avg_gain, avg_loss, rsi, ema
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        diff = columns[self.dependencies[0].key]
+        gain = np.where(diff > 0, diff, 0.0)
+        loss = np.where(diff < 0, -diff, 0.0)
+
+        avg_gain = self.calc_wilder_batch(gain, self.period)
+        avg_loss = self.calc_wilder_batch(loss, self.period)
 
         rs = avg_gain / (avg_loss + 0.0001)
         rsi = 100 - (100 / (1 + rs))
-        last_ema_rsi = last_data.get(f"RSI_ema_{self.period}", rsi)
         return {
             "avg_gain": avg_gain,
             "avg_loss": avg_loss,
             f"RSI_{self.period}": rsi,
-            f"RSI_ema_{self.period}": self.calc_ema(last_ema_rsi, self.ema_period, rsi),
+            f"RSI_ema_{self.period}": self.calc_ema_batch(rsi, self.ema_period),
         }
 
     def signal(self, last_data: dict) -> Signal:
-        key = f"RSI_ema_{self.period}"
+        key = self.keys[-1]
         if key not in last_data:
             return Signal.NONE
         if last_data[key] < self.zone:
@@ -43,10 +79,18 @@ class RSI(BaseIndicator):
             return Signal.SELL
         return Signal.NONE
 
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        rsi_ema = data[self.keys[-1]]
+        return np.select(
+            [rsi_ema < self.zone, rsi_ema > 100 - self.zone],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
     def add_trace(
         self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 2, col: int = 1
     ) -> None:
-        for key in [f"RSI_{self.period}", f"RSI_ema_{self.period}"]:
+        for key in self.plot_columns:
             figure.add_trace(
                 go.Scatter(
                     x=chart_df["time"],
@@ -0,0 +1,234 @@
+import sys
+from dataclasses import dataclass, field, replace
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from common.candles import CandleArrays
+from common.schemas import Candle
+
+State = tuple[float, ...]
+
+
+@dataclass
+class Series:
+    """
+    Streaming series which owns its recurrence state as a tuple of the 'inputs' values.
+    The committed state belongs to the last closed bar, the provisional one to the forming
+    bar: a new bar commits the provisional state, an update of the forming bar is computed
+    from the committed one again. Series over a window also keep the states of the last
+    'window_size' closed bars, '_commit' adds the state of a closed bar to the window.
+
+    A series may be computed from intermediate series, 'dependencies', which are updated
+    before it on every bar. Equal intermediate series of a chart are computed only once.
+    """
+
+    committed: State | None = field(default=None, init=False, repr=False, compare=False)
+    provisional: State | None = field(default=None, init=False, repr=False, compare=False)
+    keys: tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    input_keys: tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    dependencies: tuple["Series", ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # output keys are built once, the streaming path never formats them again
+        self.keys = tuple(sys.intern(key) for key in self.columns)
+        self.input_keys = tuple(sys.intern(key) for key in self.inputs)
+        self.dependencies = tuple(self._dependencies())
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Names of the chart columns the series writes"""
+        raise NotImplementedError("Please implement 'columns' property")
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        """Names of the chart columns the series reads from the previous bar"""
+        return self.columns
+
+    @property
+    def key(self) -> str:
+        """Column of the series value, equal keys mean equal series"""
+        return self.keys[-1]
+
+    @property
+    def value(self) -> float:
+        """Value of the forming bar"""
+        return self.provisional[-1]
+
+    @property
+    def window_size(self) -> int:
+        """Closed bars the series keeps in its window, the committed one included"""
+        return 0
+
+    def _dependencies(self) -> Iterable["Series"]:
+        """Intermediate series the values are computed from, read them with '.value'"""
+        return ()
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:
+        """State after the 'candle' following a bar with the 'state'"""
+        raise NotImplementedError("Please implement '_calculate' method")
+
+    def _commit(self, state: State) -> None:
+        """The bar with the 'state' has closed, windowed series slide the window"""
+
+    def _reset(self) -> None:
+        """Forget the window"""
+
+    def _output(self, state: State) -> dict:
+        return dict(zip(self.input_keys, state, strict=True))
+
+    @staticmethod
+    def calc_ema(prev_ema: float, period: int, new_value: float) -> float:
+        prev_ema = prev_ema or new_value
+        k = 2 / (period + 1)
+        return (new_value - prev_ema) * k + prev_ema
+
+    @staticmethod
+    def calc_ema_batch(values: np.ndarray, period: int, prev_ema: float = None) -> np.ndarray:
+        """
+        EMA over the whole series by a compiled recurrence, it matches 'calc_ema' bar by bar
+        up to float rounding. Like 'calc_ema' it starts over from the first non-zero value
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if prev_ema:
+            return smooth(values, 2 / (period + 1), prev_ema)
+        result = np.zeros(len(values))
+        nonzero = np.flatnonzero(values)
+        if len(nonzero):
+            result[nonzero[0] :] = smooth(values[nonzero[0] :], 2 / (period + 1))
+        return result
+
+    @staticmethod
+    def calc_wilder_batch(values: np.ndarray, period: int, prev_avg: float = None) -> np.ndarray:
+        """Wilder's moving average, it starts from 'prev_avg' or the first value"""
+        return smooth(np.asarray(values, dtype=np.float64), 1 / period, prev_avg)
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]
+    ) -> dict[str, np.ndarray]:
+        """
+        Calculate the columns of the series for the candles at once, 'columns' already
+        hold the columns of the dependencies. By default the bars are streamed through
+        a fresh copy of the series fed with those columns, so the result is exactly the
+        streamed one; recurrences override it with array code.
+        """
+        series = replace(self)
+        series.dependencies = tuple(_Column() for _ in self.dependencies)
+        sources = [columns[dependency.key].tolist() for dependency in self.dependencies]
+        rows = []
+        for index, candle in enumerate(candles.candles()):
+            for column, values in zip(series.dependencies, sources, strict=True):
+                column.provisional = (values[index],)
+            rows.append(series.new_data(candle))
+        return {key: np.array([row[key] for row in rows], dtype=np.float64) for key in self.keys}
+
+    def new_data(self, candle: Candle) -> dict:
+        if self.provisional is not None:
+            self._commit(self.provisional)
+        self.committed = self.provisional
+        self.provisional = self._calculate(self.committed, candle)
+        return self._output(self.provisional)
+
+    def update_last(self, candle: Candle) -> dict:
+        self.provisional = self._calculate(self.committed, candle)
+        return self._output(self.provisional)
+
+    def load_state(self, columns: dict[str, np.ndarray]) -> None:
+        """Continue streaming after the last bars of the chart 'columns'"""
+        size = min((len(columns[key]) for key in self.input_keys), default=0)
+
+        def state(offset: int) -> State | None:
+            if size < offset:
+                return None
+            return tuple(float(columns[key][-offset]) for key in self.input_keys)
+
+        self._reset()
+        for offset in range(min(size, self.window_size + 1), 1, -1):
+            self._commit(state(offset))
+        self.committed, self.provisional = state(2), state(1)
+
+
+def smooth(values: np.ndarray, alpha: float, start: float = None) -> np.ndarray:
+    """
+    'y = y_prev + alpha * (x - y_prev)' over the values, from 'start' or the first value.
+    Pandas' EWM runs the recurrence in compiled code, the result differs from a Python
+    loop only by float rounding, about 1e-12 relative.
+    """
+    if start is not None:
+        values = np.concatenate(([start], values))
+    result = pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result if start is None else result[1:]
+
+
+@dataclass
+class _Column(Series):
+    """Precomputed dependency column a batch replay reads values from"""
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return ()
+
+
+@dataclass
+class Ema(Series):
+    period: int = 20
+    source: str = "close"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        if self.source == "close":
+            return (f"Ema_{self.period}",)
+        return (f"Ema_{self.period}_{self.source}",)
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:
+        return (self.calc_ema(state and state[0], self.period, getattr(candle, self.source)),)
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        return {self.key: self.calc_ema_batch(getattr(candles, self.source), self.period)}
+
+
+@dataclass
+class Diff(Series):
+    """Change of the 'source' since the previous bar, zero on the first bar"""
+
+    source: str = "close"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (f"{self.source}_diff",)
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        return self.source, *self.columns
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:
+        value = getattr(candle, self.source)
+        return value, value - (value if state is None else state[0])
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        values = getattr(candles, self.source)
+        return {self.key: values - np.concatenate((values[:1], values[:-1]))}
+
+
+def link(consumers: Iterable[Series]) -> list[Series]:
+    """
+    Make the consumers share one instance of every intermediate series with the same key,
+    return the intermediate series in the order they have to be computed in
+    """
+    shared: dict[str, Series] = {}
+    order: list[Series] = []
+
+    def visit(series: Series) -> Series:
+        if series.key not in shared:
+            series.dependencies = tuple(visit(dependency) for dependency in series.dependencies)
+            shared[series.key] = series
+            order.append(series)
+        return shared[series.key]
+
+    for consumer in consumers:
+        consumer.dependencies = tuple(visit(dependency) for dependency in consumer.dependencies)
+    return order
@@ -0,0 +1,133 @@
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.schemas import Candle
+
+
+@register(IndicatorType.STOCHASTIC)
+@dataclass
+class Stochastic(BaseIndicator):
+    """
+    %K is the position of the close in the high-low range of 'k_period' bars, %D is its
+    mean over 'd_period' bars. Extremes of the closed bars are kept in monotonic queues and
+    %K of the closed bars in a running sum, so every bar costs O(1) amortized whatever
+    the periods.
+    """
+
+    k_period: int = 14
+    d_period: int = 3
+    zone: int = 20
+    bar: int = field(default=0, init=False, repr=False, compare=False)
+    highs: deque[tuple[int, float]] = field(
+        default_factory=deque, init=False, repr=False, compare=False
+    )
+    lows: deque[tuple[int, float]] = field(
+        default_factory=deque, init=False, repr=False, compare=False
+    )
+    last_k: deque[float] = field(default_factory=deque, init=False, repr=False, compare=False)
+    k_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.last_k = deque(maxlen=self.d_period - 1)
+
+    def __str__(self) -> str:
+        return f"Stochastic({self.k_period}, {self.d_period}, zone: {self.zone})"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return f"Stoch_{self.k_period}_k", f"Stoch_{self.k_period}_{self.d_period}_d"
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        return "high", "low", *self.columns
+
+    @property
+    def window_size(self) -> int:
+        return max(self.k_period, self.d_period) - 1
+
+    def _reset(self) -> None:
+        self.bar = 0
+        self.highs.clear()
+        self.lows.clear()
+        self.last_k.clear()
+        self.k_sum = 0.0
+
+    def _commit(self, state: State) -> None:
+        high, low, k, _ = state
+        self.bar += 1
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((self.bar, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((self.bar, low))
+        # the forming bar takes the last place of the window
+        first = self.bar - self.k_period + 2
+        while self.highs and self.highs[0][0] < first:
+            self.highs.popleft()
+        while self.lows and self.lows[0][0] < first:
+            self.lows.popleft()
+        if self.d_period > 1:
+            if len(self.last_k) == self.last_k.maxlen:
+                self.k_sum -= self.last_k[0]
+            self.last_k.append(k)
+            self.k_sum += k
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:  # noqa: ARG002
+        high, low = candle.high, candle.low
+        if self.k_period > 1 and self.highs:
+            high, low = max(high, self.highs[0][1]), min(low, self.lows[0][1])
+        k = (candle.close - low) / (high - low) * 100 if high > low else 50.0
+        # the forming bar is added on top of the closed ones, so an update does not drift
+        d = (self.k_sum + k) / (len(self.last_k) + 1)
+        return candle.high, candle.low, k, d
+
+    def _output(self, state: State) -> dict:
+        # high and low of the state are chart columns already
+        return dict(zip(self.keys, state[2:], strict=True))
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        high = pd.Series(candles.high).rolling(self.k_period, min_periods=1).max().to_numpy()
+        low = pd.Series(candles.low).rolling(self.k_period, min_periods=1).min().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.where(high > low, (candles.close - low) / (high - low) * 100, 50.0)
+        d = pd.Series(k).rolling(self.d_period, min_periods=1).mean().to_numpy()
+        return {self.keys[0]: k, self.keys[1]: d}
+
+    def signal(self, last_data: dict) -> Signal:
+        k, d = last_data[self.keys[0]], last_data[self.keys[1]]
+        if k < self.zone and d < self.zone:
+            return Signal.BUY
+        if k > 100 - self.zone and d > 100 - self.zone:
+            return Signal.SELL
+        return Signal.NONE
+
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        k, d = data[self.keys[0]], data[self.keys[1]]
+        return np.select(
+            [(k < self.zone) & (d < self.zone), (k > 100 - self.zone) & (d > 100 - self.zone)],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
+    def add_trace(
+        self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 2, col: int = 1
+    ) -> None:
+        for key in self.keys:
+            figure.add_trace(
+                go.Scatter(x=chart_df["time"], y=chart_df[key], mode="lines", name=key),
+                row=row,
+                col=col,
+            )
+        params = {"line_width": 1, "line_dash": "dash", "line_color": "black"}
+        figure.add_hline(y=self.zone, row=row, col=col, **params)
+        figure.add_hline(y=100 - self.zone, row=row, col=col, **params)
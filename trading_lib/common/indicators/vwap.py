@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from common.candles import CandleArrays
+from common.enums import IndicatorType, Signal
+from common.indicators.base import BaseIndicator, State, register
+from common.schemas import Candle
+
+
+@register(IndicatorType.VWAP)
+@dataclass
+class VWAP(BaseIndicator):
+    """
+    Volume weighted typical price from cumulative sums, which restart every
+    'session' minutes (a UTC day by default). Buys below the VWAP by 'deviation' percent
+    and sells above it.
+    """
+
+    session: int = 1440
+    deviation: float = 0.0
+
+    def __str__(self) -> str:
+        return f"VWAP({self.session}, {self.deviation}%)"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        name = f"VWAP_{self.session}"
+        return f"{name}_session", f"{name}_pv", f"{name}_volume", name
+
+    @property
+    def plot_columns(self) -> tuple[str, ...]:
+        return self.keys[-1:]
+
+    def _calculate(self, state: State | None, candle: Candle) -> State:
+        period = self.session * 60 * 1000
+        session = float(candle.ts - candle.ts % period)
+        price = (candle.high + candle.low + candle.close) / 3
+        if state is None or state[0] != session:
+            price_volume, volume = 0.0, 0.0
+        else:
+            _, price_volume, volume, _ = state
+        price_volume += price * candle.volume
+        volume += candle.volume
+        return session, price_volume, volume, price_volume / volume if volume else price
+
+    def compute_batch(
+        self, candles: CandleArrays, columns: dict[str, np.ndarray]  # noqa: ARG002
+    ) -> dict[str, np.ndarray]:
+        period = self.session * 60 * 1000
+        session = (candles.time - candles.time % period).astype(np.float64)
+        price = (candles.high + candles.low + candles.close) / 3
+        sums = pd.DataFrame({"pv": price * candles.volume, "volume": candles.volume})
+        sums = sums.groupby(session).cumsum()
+        price_volume, volume = sums["pv"].to_numpy(), sums["volume"].to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(volume != 0, price_volume / volume, price)
+        return dict(zip(self.keys, (session, price_volume, volume, vwap), strict=True))
+
+    def signal(self, last_data: dict) -> Signal:
+        vwap = last_data[self.keys[-1]]
+        if last_data["close"] < vwap * (1 - self.deviation / 100):
+            return Signal.BUY
+        if last_data["close"] > vwap * (1 + self.deviation / 100):
+            return Signal.SELL
+        return Signal.NONE
+
+    def signal_batch(self, data: dict[str, np.ndarray]) -> np.ndarray:
+        vwap = data[self.keys[-1]]
+        return np.select(
+            [
+                data["close"] < vwap * (1 - self.deviation / 100),
+                data["close"] > vwap * (1 + self.deviation / 100),
+            ],
+            [Signal.BUY.value, Signal.SELL.value],
+            Signal.NONE.value,
+        )
+
+    def add_trace(
+        self, figure: go.Figure, chart_df: pd.DataFrame, row: int = 1, col: int = 1
+    ) -> None:
+        figure.add_trace(
+            go.Scatter(
+                x=chart_df["time"],
+                y=chart_df[self.keys[-1]],
+                mode="lines",
+                name=self.keys[-1],
+                line={"color": "blue", "width": 1},
+            ),
+            row=row,
+            col=col,
+        )
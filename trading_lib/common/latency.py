@@ -0,0 +1,35 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+from common.schemas import Candle
+
+
+@dataclass
+class LatencyStats:
+    """
+    Delay between the open of a bar and the moment it was first received, in ms.
+
+    The open of a bar is the close of the previous one, so this is how late a closed bar is
+    seen by strategies. It is measured the same way for polling and streaming transports.
+    """
+
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    last_ts: int | None = None
+
+    def observe(self, candle: Candle, now: float | None = None) -> None:
+        if self.last_ts is not None and candle.ts > self.last_ts:
+            now = time.time() if now is None else now
+            self.samples.append(now * 1000 - candle.ts)
+        self.last_ts = max(self.last_ts or candle.ts, candle.ts)
+
+    @property
+    def info(self) -> str:
+        if not self.samples:
+            return "no samples"
+        p50, p95 = np.percentile(self.samples, [50, 95])
+        return (
+            f"count={len(self.samples)} p50={p50:.0f}ms p95={p95:.0f}ms "
+            f"max={max(self.samples):.0f}ms"
+        )
@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -5,6 +6,7 @@ from pathlib import Path
 import plotly.graph_objects as go
 from common.chart import Chart
 from common.enums import OrderSide, Signal
+from common.render import RenderPool
 from common.schemas import Candle, Position
 
 
@@ -26,9 +28,8 @@ class DummyNotifier(BaseNotifier):
 
     async def push_figure(self, fig: go.Figure, name: str) -> None:
         print("save chart", name)  # noqa: T201
-        file_name = f"{self.path}/{name}.jpg"
-        with Path(file_name).open("wb") as f:
-            f.write(fig.to_image("jpeg", width=1050, height=750, scale=2))
+        image = await RenderPool.shared().render(fig)
+        await asyncio.to_thread(Path(f"{self.path}/{name}.jpg").write_bytes, image)
 
 
 @dataclass
@@ -61,6 +62,7 @@ class NotifyService:
             f"duration={position.duration} profit={round(position.profit, 2)}",
             symbol,
             position.orders[0].time - timedelta(days=1),
+            markers=[order.time for order in position.orders] + [min_dt],
         )
         params = {"row": 1, "col": 1, "line_dash": "dash", "line_width": 1}
         for order in position.orders:
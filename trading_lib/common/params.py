@@ -1,8 +1,9 @@
 from enum import StrEnum
 from typing import Generic, TypeVar
 
-from common.enums import IndicatorType
-from pydantic import BaseModel, Field
+from common.enums import BusPolicy
+from common.indicators import INDICATORS
+from pydantic import BaseModel, Field, field_validator
 
 T = TypeVar("T", bound=StrEnum)
 
@@ -15,9 +16,22 @@ class ClassParams(BaseModel, Generic[T]):
 class ChartParams(BaseModel):
     size: int = 100
     timeframe: int = 1
-    indicators: list[ClassParams[IndicatorType]] = Field(default_factory=list)
+    # names of registered indicators, see 'common.indicators.register'
+    indicators: list[ClassParams[str]] = Field(default_factory=list)
     rows: int = 2
     cols: int = 1
+    # points per figure, longer windows are decimated before plotting, 0 disables it
+    max_points: int = 1000
+
+    @field_validator("indicators")
+    @classmethod
+    def check_indicators(cls, indicators: list[ClassParams[str]]) -> list[ClassParams[str]]:
+        for indicator in indicators:
+            if indicator.class_ not in INDICATORS:
+                raise ValueError(
+                    f"Unknown indicator {indicator.class_!r}, known: {', '.join(INDICATORS)}"
+                )
+        return indicators
 
 
 class WorkerParams(BaseModel):
@@ -26,3 +40,4 @@ class WorkerParams(BaseModel):
     chart: ChartParams
     strategy: ClassParams[str]
     pull_interval: int = 5
+    policy: BusPolicy = BusPolicy.LATEST
@@ -1,66 +1,205 @@
 import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+from common.bus import CandleBus, Subscription
+from common.enums import BusPolicy
+from common.exceptions import BaseAppError
 from common.exchange import BaseExchange
+from common.resampler import Resampler, bucket_start
+from common.schemas import Candle
+
+if TYPE_CHECKING:
+    from db.candles import CandleStore
+
+# 1m candles a poll asks for, the forming bar of every timeframe has to fit into one poll
+FEED_SIZE = 1000
+# seconds the exchange needs to publish a closed bar after the boundary
+CLOSE_DELAY = 1.0
+# poll interval grows up to 'pull_interval * MAX_BACKOFF' while the forming bar does not change
+MAX_BACKOFF = 8
+# last bars remembered per timeframe, a poll re-delivers the closed and the forming ones
+EMITTED_DEPTH = 4
+# seconds a poll in progress is given to finish on stop before it is cancelled
+STOP_TIMEOUT = 5.0
+
+
+class PullerError(BaseAppError):
+    default_msg = "Puller error"
+
+
+def next_close(now: float, timeframe: int) -> float:
+    """Epoch seconds of the first close of a 'timeframe' minutes bar after 'now'"""
+    period = timeframe * 60
+    return (now // period + 1) * period
 
 
 @dataclass
 class Subscribe:
     exchange: BaseExchange
     symbol: str
-    queues: list[asyncio.Queue]
     pull_interval: int
+    buses: dict[int, CandleBus] = field(default_factory=dict)
+    resampler: Resampler = field(default_factory=Resampler)
+    emitted: dict[int, dict[int, Candle]] = field(default_factory=dict)
+    last_ts: int | None = None
+    delay: float = 0
 
     @property
     def info(self) -> str:
-        return f"exchange={type(self.exchange).__name__} {self.symbol=} {self.pull_interval=}"
+        return (
+            f"exchange={type(self.exchange).__name__} {self.symbol=} {self.pull_interval=} "
+            f"timeframes={sorted(self.buses)}"
+        )
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        return [s for bus in self.buses.values() for s in bus.subscriptions]
+
+    @property
+    def timeframe(self) -> int:
+        """The shortest subscribed timeframe defines the closes polls are aligned to"""
+        return min(self.buses)
+
+    def bus(self, timeframe: int) -> CandleBus:
+        if timeframe not in self.buses:
+            self.buses[timeframe] = CandleBus()
+            self.resampler.add_timeframe(timeframe)
+        return self.buses[timeframe]
+
+    def changed(self, timeframe: int, bar: Candle) -> bool:
+        """Remember the bar, unless an identical one of the same time was already emitted"""
+        bars = self.emitted.setdefault(timeframe, {})
+        if bars.get(bar.ts) == bar:
+            return False
+        bars[bar.ts] = bar
+        if len(bars) > EMITTED_DEPTH:
+            del bars[min(bars)]
+        return True
+
+    def awaiting_close(self, now: float) -> bool:
+        """The boundary has passed, but the exchange has not published the new bar yet"""
+        if self.last_ts is None:
+            return False
+        current = bucket_start(int(now * 1000), self.timeframe)
+        return self.last_ts < current and now * 1000 - current < self.pull_interval * 1000
+
+    def next_poll(self, now: float, changed: bool) -> float:
+        """
+        Seconds to the next poll: the interval doubles while nothing changes and resets on
+        a change, but a poll never misses the next close
+        """
+        if changed or not self.delay:
+            self.delay = self.pull_interval
+        else:
+            self.delay = min(self.delay * 2, self.pull_interval * MAX_BACKOFF)
+        if self.awaiting_close(now):
+            return min(self.delay, CLOSE_DELAY)
+        close = next_close(now, self.timeframe) + CLOSE_DELAY
+        return max(0.0, min(now + self.delay, close) - now)
 
 
 class Puller:
 
-    def __init__(self) -> None:
+    def __init__(self, store: "CandleStore | None" = None) -> None:
+        self.store = store
         self._logger = logging.getLogger("[Poller]")
         self._subscribes: dict[str, Subscribe] = {}
         self._tasks: list[asyncio.Task] = []
         self._running = True
+        self._stopped = asyncio.Event()
 
-    def subscribe(self, exchange: BaseExchange, symbol: str, pull_interval: int) -> asyncio.Queue:
-        key = f"{type(exchange).__name__}-{symbol}-{pull_interval}"
-        queue = asyncio.Queue()
+    def subscribe(  # noqa: PLR0913
+        self,
+        exchange: BaseExchange,
+        symbol: str,
+        pull_interval: int,
+        timeframe: int = 1,
+        policy: BusPolicy = BusPolicy.LATEST,
+        bound: int | None = None,
+        name: str = "",
+    ) -> Subscription:
+        """
+        Candles of every timeframe of a symbol are resampled from one 1m feed,
+        so subscribers with different timeframes share a single exchange request.
+        Subscribers of a timeframe read one 'CandleBus' with their own 'policy'.
+        The feed follows one polling cursor of the exchange, so a symbol has one feed
+        polled at the shortest 'pull_interval' of its subscribers.
+        """
+        if timeframe > FEED_SIZE:
+            raise PullerError(
+                f"Timeframe {timeframe} is longer than a poll of {FEED_SIZE} 1m candles"
+            )
+        key = f"{type(exchange).__name__}-{symbol}"
         if key not in self._subscribes:
             self._subscribes[key] = Subscribe(
                 exchange=exchange,
                 symbol=symbol,
-                queues=[queue],
                 pull_interval=pull_interval,
             )
-        else:
-            self._subscribes[key].queues.append(queue)
-        self._logger.info(f"Subscribed: {self._subscribes[key].info}")
-        return queue
+        self._subscribes[key].pull_interval = min(
+            self._subscribes[key].pull_interval, pull_interval
+        )
+        subscription = self._subscribes[key].bus(timeframe).subscribe(policy, bound, name or key)
+        self._logger.info(f"Subscribed: {self._subscribes[key].info} {policy=}")
+        return subscription
+
+    async def _poll(self, stat: Subscribe) -> bool:
+        """Deliver bars which differ from the ones already emitted, tell if there were any"""
+        changed = False
+        async for candle in stat.exchange.get_candles(stat.symbol, 1, FEED_SIZE):
+            stat.last_ts = max(stat.last_ts or candle.ts, candle.ts)
+            if self.store is not None:
+                self.store.put(stat.exchange.name, stat.symbol, 1, candle)
+            for timeframe, bar in stat.resampler.add(candle).items():
+                if stat.changed(timeframe, bar):
+                    changed = True
+                    await stat.buses[timeframe].publish(bar)
+        return changed
 
     async def _loop(self, stat: Subscribe) -> None:
         self._logger.info(f"Start pulling {stat.info}")
         while self._running:
+            changed = False
             try:
-                async for candle in stat.exchange.get_candles(stat.symbol):
-                    await asyncio.gather(*[queue.put(candle) for queue in stat.queues])
+                changed = await self._poll(stat)
             except Exception as e:
                 self._logger.exception(e)
                 self._logger.info(f"Error: {e}")
             finally:
-                self._logger.info(f"Sleep {stat.pull_interval} seconds")
-                await asyncio.sleep(stat.pull_interval)
+                delay = stat.next_poll(time.time(), changed)
+                self._logger.debug(f"Sleep {delay:.1f} seconds")
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
         self._logger.info(f"Stopped pulling {stat.info}")
 
     async def start(self) -> None:
         self._running = True
+        self._stopped.clear()
         for stat in self._subscribes.values():
             self._tasks.append(asyncio.create_task(self._loop(stat)))
 
+    def stats(self) -> list[str]:
+        """Depth and lag of every subscriber"""
+        return [s.info for stat in self._subscribes.values() for s in stat.subscriptions]
+
     async def stop(self) -> None:
         self._running = False
+        self._stopped.set()
         self._logger.info("Stopping...")
-        await asyncio.gather(*self._tasks)
+        if self._tasks:
+            # a streaming poll only ends with its connection, it is cancelled
+            _, pending = await asyncio.wait(self._tasks, timeout=STOP_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # consumers waiting for the next candle get 'BusClosedError' instead
+        for stat in self._subscribes.values():
+            for bus in stat.buses.values():
+                bus.close()
         self._logger.info("Stopped")
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+IMAGE_FORMAT = "jpeg"
+IMAGE_WIDTH = 1050
+IMAGE_HEIGHT = 750
+IMAGE_SCALE = 2
+
+
+def _warm_up() -> None:
+    """Start Kaleido in the pool process, so the first real figure does not pay for it"""
+    try:
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception as e:
+        # a failed warm-up must not break the pool, renders report the error themselves
+        logging.getLogger(RenderPool.__name__).warning(f"Kaleido warm-up failed: {e}")
+
+
+def _render(spec: str, image_format: str, width: int, height: int, scale: float) -> bytes:
+    fig = pio.from_json(spec, skip_invalid=True)
+    return pio.to_image(fig, format=image_format, width=width, height=height, scale=scale)
+
+
+class RenderPool:
+    """
+    Renders plotly figures to images in long-lived processes with a warmed-up Kaleido.
+
+    The figure is serialized to JSON and rendered in the pool, so the event loop never waits
+    for Kaleido. At most 'concurrency' renders are in flight and each one is given 'timeout'
+    seconds; the pool is replaced after a timeout, so a hung renderer does not take a slot.
+    """
+
+    _shared: "RenderPool | None" = None
+
+    def __init__(
+        self, processes: int = 2, concurrency: int | None = None, timeout: float = 30
+    ) -> None:
+        self.processes = processes
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency or processes)
+        self._executor: ProcessPoolExecutor | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def shared(cls) -> "RenderPool":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    async def stop_shared(cls) -> None:
+        if cls._shared is not None:
+            await cls._shared.stop()
+        cls._shared = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes, initializer=_warm_up)
+        return self._executor
+
+    async def render(  # noqa: PLR0913
+        self,
+        fig: go.Figure,
+        image_format: str = IMAGE_FORMAT,
+        width: int = IMAGE_WIDTH,
+        height: int = IMAGE_HEIGHT,
+        scale: float = IMAGE_SCALE,
+    ) -> bytes:
+        spec = fig.to_json()
+        async with self._semaphore:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, _render, spec, image_format, width, height, scale
+            )
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                self.logger.error(f"Render timed out after {self.timeout}s, restart the pool")
+                self._kill()
+                raise
+
+    def _kill(self) -> None:
+        """Shutting the pool down does not stop a hung Kaleido, its processes are killed"""
+        if self._executor is None:
+            return
+        processes = list((self._executor._processes or {}).values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.kill()
+        for process in processes:
+            process.join(timeout=1)
+        self._executor = None
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+        self._executor = None
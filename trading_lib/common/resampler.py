@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Generator, Iterable
+
+import numpy as np
+from common.candles import CandleArrays
+from common.schemas import Candle
+
+MINUTE = 60 * 1000
+
+
+def bucket_start(ts: int, timeframe: int) -> int:
+    return ts - ts % (timeframe * MINUTE)
+
+
+@dataclass(slots=True)
+class _Bucket:
+    start: int
+    closed: Candle | None
+    last: Candle
+
+    def candle(self) -> Candle:
+        last = self.last
+        if self.closed is None:
+            return Candle(
+                ts=self.start,
+                open=last.open,
+                high=last.high,
+                low=last.low,
+                close=last.close,
+                volume=last.volume,
+            )
+        return Candle(
+            ts=self.start,
+            open=self.closed.open,
+            high=max(self.closed.high, last.high),
+            low=min(self.closed.low, last.low),
+            close=last.close,
+            volume=self.closed.volume + last.volume,
+        )
+
+
+class Resampler:
+    """
+    Builds candles of higher timeframes from one 1m stream incrementally.
+
+    Every timeframe keeps the aggregate of the finished minutes of its current bar and the
+    forming minute apart, so a re-delivered forming minute replaces its previous version
+    instead of being merged twice.
+    """
+
+    def __init__(self, timeframes: Iterable[int] = ()) -> None:
+        self.timeframes: set[int] = set()
+        self._buckets: dict[int, _Bucket] = {}
+        for timeframe in timeframes:
+            self.add_timeframe(timeframe)
+
+    def add_timeframe(self, timeframe: int) -> None:
+        self.timeframes.add(timeframe)
+
+    def _update(self, timeframe: int, candle: Candle) -> Candle | None:
+        start = bucket_start(candle.ts, timeframe)
+        bucket = self._buckets.get(timeframe)
+        if bucket is None or start > bucket.start:
+            bucket = self._buckets[timeframe] = _Bucket(start=start, closed=None, last=candle)
+        elif start < bucket.start or candle.ts < bucket.last.ts:
+            return None
+        elif candle.ts > bucket.last.ts:
+            bucket.closed = (
+                bucket.last if bucket.closed is None else bucket.closed.merge(bucket.last)
+            )
+            bucket.last = candle
+        else:
+            bucket.last = candle
+        return bucket.candle()
+
+    def add(self, candle: Candle) -> dict[int, Candle]:
+        """Current (possibly forming) candle of every timeframe, stale minutes are skipped"""
+        result = {}
+        for timeframe in self.timeframes:
+            if timeframe == 1:
+                result[timeframe] = candle
+                continue
+            bar = self._update(timeframe, candle)
+            if bar is not None:
+                result[timeframe] = bar
+        return result
+
+
+def resample(candles: CandleArrays, timeframe: int) -> CandleArrays:
+    """Aggregate time ordered 1m candles into candles of the timeframe"""
+    if timeframe == 1 or not len(candles):
+        return candles
+    buckets = candles.time - candles.time % (timeframe * MINUTE)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(candles)] - 1
+    return CandleArrays(
+        time=buckets[starts],
+        open=candles.open[starts],
+        high=np.maximum.reduceat(candles.high, starts),
+        low=np.minimum.reduceat(candles.low, starts),
+        close=candles.close[ends],
+        volume=np.add.reduceat(candles.volume, starts),
+    )
+
+
+def resample_chunks(
+    chunks: Iterable[CandleArrays], timeframe: int
+) -> Generator[CandleArrays, None, None]:
+    """Resample a stream of 1m chunks, the last bucket of a chunk waits for the next chunk"""
+    if timeframe == 1:
+        yield from chunks
+        return
+    pending = CandleArrays.empty()
+    for chunk in chunks:
+        data = CandleArrays.concat([pending, chunk])
+        if not len(data):
+            continue
+        last_bucket = bucket_start(int(data.time[-1]), timeframe)
+        split = int(np.searchsorted(data.time, last_bucket, side="left"))
+        pending = data[split:]
+        if split:
+            yield resample(data[:split], timeframe)
+    if len(pending):
+        yield resample(pending, timeframe)
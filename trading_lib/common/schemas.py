@@ -1,20 +1,37 @@
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
 
 from common.enums import OrderSide
 from pydantic import BaseModel
 
 
-class Candle(BaseModel):
-    time: datetime
+def to_timestamp(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def from_timestamp(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts / 1000, tz=timezone.utc).astimezone()
+
+
+@dataclass(slots=True)
+class Candle:
+    """Candle of the hot path without validation, 'ts' is the open time in epoch ms"""
+
+    ts: int
     open: float
     high: float
     low: float
     close: float
     volume: float
 
+    @property
+    def time(self) -> datetime:
+        return from_timestamp(self.ts)
+
     def merge(self, candle: "Candle") -> "Candle":
         return Candle(
-            time=candle.time,
+            ts=candle.ts,
             open=self.open,
             high=max(self.high, candle.high),
             low=min(self.low, candle.low),
@@ -31,7 +48,8 @@ class Candle(BaseModel):
         return self.open < self.close
 
 
-class OrderIN(BaseModel):
+@dataclass(slots=True)
+class OrderIN:
     symbol: str
     side: OrderSide
     amount: float
@@ -46,20 +64,27 @@ class OrderIN(BaseModel):
         return cls(symbol=symbol, side=OrderSide.SELL, amount=amount, candle=candle)
 
 
-class Order(BaseModel):
-    time: datetime
+@dataclass(slots=True)
+class Order:
+    ts: int
     price: float
     amount: float
     side: OrderSide
     status: str
     cost: float
 
+    @property
+    def time(self) -> datetime:
+        return from_timestamp(self.ts)
 
-class Position(BaseModel):
-    orders: list[Order]
-    total_amount: float
-    total_cost: float
-    avg_price: float
+
+@dataclass(slots=True)
+class Position:
+    orders: list[Order] = field(default_factory=list)
+    id: UUID = field(default_factory=uuid4, compare=False)
+    total_amount: float = 0
+    total_cost: float = 0
+    avg_price: float = 0
     profit: float = 0
 
     @property
@@ -68,7 +93,7 @@ class Position(BaseModel):
 
     @classmethod
     def new(cls, order: Order) -> "Position":
-        position = cls(orders=[], total_amount=0, total_cost=0, avg_price=0)
+        position = cls()
         position.add_buy(order)
         return position
 
@@ -83,3 +108,99 @@ class Position(BaseModel):
         self.total_amount -= order.amount
         self.profit += order.cost - self.total_cost
         self.total_cost = self.avg_price * self.total_amount
+
+
+class CandleSchema(BaseModel):
+    """Validated candle for API and config boundaries"""
+
+    time: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    @classmethod
+    def from_candle(cls, candle: Candle) -> "CandleSchema":
+        return cls.model_construct(
+            time=candle.time,
+            open=candle.open,
+            high=candle.high,
+            low=candle.low,
+            close=candle.close,
+            volume=candle.volume,
+        )
+
+    def to_candle(self) -> Candle:
+        return Candle(
+            ts=to_timestamp(self.time),
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+        )
+
+
+class OrderSchema(BaseModel):
+    """Validated order for API and config boundaries"""
+
+    time: datetime
+    price: float
+    amount: float
+    side: OrderSide
+    status: str
+    cost: float
+
+    @classmethod
+    def from_order(cls, order: Order) -> "OrderSchema":
+        return cls.model_construct(
+            time=order.time,
+            price=order.price,
+            amount=order.amount,
+            side=order.side,
+            status=order.status,
+            cost=order.cost,
+        )
+
+    def to_order(self) -> Order:
+        return Order(
+            ts=to_timestamp(self.time),
+            price=self.price,
+            amount=self.amount,
+            side=self.side,
+            status=self.status,
+            cost=self.cost,
+        )
+
+
+class PositionSchema(BaseModel):
+    """Validated position for API and config boundaries"""
+
+    id: UUID | None = None
+    orders: list[OrderSchema]
+    total_amount: float
+    total_cost: float
+    avg_price: float
+    profit: float = 0
+
+    @classmethod
+    def from_position(cls, position: Position) -> "PositionSchema":
+        return cls.model_construct(
+            id=position.id,
+            orders=[OrderSchema.from_order(order) for order in position.orders],
+            total_amount=position.total_amount,
+            total_cost=position.total_cost,
+            avg_price=position.avg_price,
+            profit=position.profit,
+        )
+
+    def to_position(self) -> Position:
+        return Position(
+            id=self.id or uuid4(),
+            orders=[order.to_order() for order in self.orders],
+            total_amount=self.total_amount,
+            total_cost=self.total_cost,
+            avg_price=self.avg_price,
+            profit=self.profit,
+        )
@@ -0,0 +1,73 @@
+import math
+
+
+class SegmentTree:
+    """
+    Index of the leftmost minimum (or maximum) over a fixed number of slots.
+
+    Point updates and range queries are O(log n). Slots are physical positions of a
+    ``RingBuffer``, ``query_ring`` maps a time ordered window to one or two ranges.
+    """
+
+    def __init__(self, size: int, maximum: bool = False) -> None:
+        self.size = size
+        self._sign = -1.0 if maximum else 1.0
+        self._values = [math.inf] * size
+        self._tree = [-1] * size + list(range(size))
+        self._build()
+
+    def _build(self) -> None:
+        for node in range(self.size - 1, 0, -1):
+            self._tree[node] = self._best(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def _best(self, left: int, right: int) -> int:
+        if left < 0:
+            return right
+        if right < 0:
+            return left
+        left_value, right_value = self._values[left], self._values[right]
+        if left_value < right_value or (left_value == right_value and left < right):
+            return left
+        return right
+
+    def value(self, index: int) -> float:
+        return self._sign * self._values[index]
+
+    def load(self, values: list[float]) -> None:
+        """Fill the first slots with the values and clear the rest in O(n)"""
+        self._values = [self._sign * value for value in values[-self.size :]]
+        self._values += [math.inf] * (self.size - len(self._values))
+        self._build()
+
+    def update(self, index: int, value: float) -> None:
+        self._values[index] = self._sign * value
+        node = (index + self.size) // 2
+        while node:
+            self._tree[node] = self._best(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def query(self, begin: int, end: int) -> int:
+        """Slot of the best value in ``[begin, end)``, -1 for an empty range"""
+        result = -1
+        begin += self.size
+        end += self.size
+        while begin < end:
+            if begin & 1:
+                result = self._best(result, self._tree[begin])
+                begin += 1
+            if end & 1:
+                end -= 1
+                result = self._best(result, self._tree[end])
+            begin //= 2
+            end //= 2
+        return result
+
+    def query_ring(self, begin: int, count: int) -> int:
+        """Slot of the best value among ``count`` slots starting at ``begin`` with wrap-around"""
+        if begin + count <= self.size:
+            return self.query(begin, begin + count)
+        head = self.query(begin, self.size)
+        tail = self.query(0, begin + count - self.size)
+        if self._values[tail] < self._values[head]:
+            return tail
+        return head
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+import logging
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from common.candles import CandleArrays
+from common.chart import CANDLE_COLUMNS
+from common.exceptions import BaseAppError
+from common.schemas import PositionSchema
+
+if TYPE_CHECKING:
+    from strategies.base import BaseStrategy
+
+# bump on every change of the layout or of the meaning of the stored fields
+SNAPSHOT_VERSION = 2
+MAGIC = b"TLSS"
+# magic, version, length of the JSON meta; the meta is followed by the times and the columns
+HEADER = struct.Struct("<4sHI")
+
+
+class SnapshotError(BaseAppError):
+    default_msg = "Snapshot can not be restored"
+
+
+def fingerprint(strategy: "BaseStrategy") -> str:
+    """Snapshots are only compatible with a strategy and a chart of the same configuration"""
+    chart = strategy.chart
+    config = [
+        type(strategy).__name__,
+        strategy.symbol,
+        chart.timeframe,
+        chart.size,
+        chart.buffer.columns,
+        [repr(indicator) for indicator in chart.indicators],
+    ]
+    return hashlib.sha1(json.dumps(config).encode(), usedforsecurity=False).hexdigest()
+
+
+def dump(strategy: "BaseStrategy") -> bytes:
+    """Chart columns, indicator states, position and strategy fields in one buffer"""
+    buffer = strategy.chart.buffer
+    position = strategy.position
+    meta = {
+        "fingerprint": fingerprint(strategy),
+        "saved_at": int(time.time() * 1000),
+        "size": len(buffer),
+        "columns": buffer.columns,
+        "position": (
+            None
+            if position is None
+            else PositionSchema.from_position(position).model_dump(mode="json")
+        ),
+        "indicators": [
+            [indicator.committed, indicator.provisional] for indicator in strategy.chart.indicators
+        ],
+        "strategy": strategy.snapshot_state(),
+    }
+    encoded = json.dumps(meta).encode()
+    values = np.stack([buffer.column(name) for name in buffer.columns])
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(encoded)),
+            encoded,
+            buffer.times.astype("<i8").tobytes(),
+            values.astype("<f8").tobytes(),
+        ]
+    )
+
+
+def load(data: bytes, strategy: "BaseStrategy") -> int:
+    """Restore the state of the strategy, return the time the snapshot was saved at"""
+    if len(data) < HEADER.size:
+        raise SnapshotError(extra="truncated header")
+    magic, version, meta_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(extra="not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(extra=f"version {version}, expected {SNAPSHOT_VERSION}")
+    meta = json.loads(data[HEADER.size : HEADER.size + meta_size])
+    if meta["fingerprint"] != fingerprint(strategy):
+        raise SnapshotError(extra="configuration has changed")
+
+    size, columns = meta["size"], meta["columns"]
+    offset = HEADER.size + meta_size
+    if len(data) != offset + size * 8 * (len(columns) + 1):
+        raise SnapshotError(extra="truncated data")
+    times = np.frombuffer(data, dtype="<i8", count=size, offset=offset).astype(np.int64)
+    values = np.frombuffer(data, dtype="<f8", offset=offset + size * 8).astype(np.float64)
+    values = dict(zip(columns, values.reshape(len(columns), size), strict=True))
+
+    candles = CandleArrays(time=times, **{name: values.pop(name) for name in CANDLE_COLUMNS})
+    strategy.chart.load(candles, values)
+    for indicator, (committed, provisional) in zip(
+        strategy.chart.indicators, meta["indicators"], strict=True
+    ):
+        indicator.committed = None if committed is None else tuple(committed)
+        indicator.provisional = None if provisional is None else tuple(provisional)
+    position = meta["position"]
+    strategy.position = None if position is None else PositionSchema(**position).to_position()
+    strategy.load_snapshot_state(meta["strategy"])
+    return meta["saved_at"]
+
+
+class SnapshotStore:
+    """
+    Snapshots of strategies as files of a directory, one per worker. A file is replaced
+    atomically, so a crash while saving leaves the previous snapshot intact.
+    """
+
+    def __init__(self, directory: Path | str, interval: float = 60) -> None:
+        self.directory = Path(directory)
+        self.interval = interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.snapshot"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    async def save(self, name: str, strategy: "BaseStrategy") -> None:
+        # the state is copied between awaits of the strategy, only the file is written aside
+        await asyncio.to_thread(self._write, self.path(name), dump(strategy))
+
+    async def restore(self, name: str, strategy: "BaseStrategy") -> bool:
+        """Tell whether the strategy was restored, an unusable snapshot is only logged"""
+        path = self.path(name)
+        if not path.exists():
+            return False
+        start = time.monotonic()
+        try:
+            saved_at = load(await asyncio.to_thread(path.read_bytes), strategy)
+        except (SnapshotError, ValueError, KeyError) as e:
+            self.logger.warning(f"Skip snapshot of {name}: {e}")
+            return False
+        elapsed = round((time.monotonic() - start) * 1000, 1)
+        age = round(time.time() - saved_at / 1000)
+        self.logger.info(f"Restored {name} from a snapshot of {age}s ago in {elapsed} ms")
+        return True
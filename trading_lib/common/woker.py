@@ -1,22 +1,38 @@
 import asyncio
 import logging
+import time
 import uuid
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
+from common.bus import BusClosedError, Subscription
+from common.candles import CandleArrays
 from common.chart import Chart
+from common.charts import ChartRegistry
+from common.enums import BusPolicy, Signal
 from common.params import WorkerParams
 from common.puller import Puller
+from common.render import RenderPool
 from common.schemas import Candle
+from common.snapshot import SnapshotStore
+from db.candles import CandleStore
+from db.persistence import PersistenceService
 from exchanges.bingx.config import BingXConfig
 from exchanges.bingx.exchange import BingXExchange
+from exchanges.bingx.stream import BingXStreamExchange
 from pydantic import BaseModel
 from strategies.base import BaseStrategy
 from strategies.example import ExampleStrategy
 
+# the stored history is used for a warm start when its last bar is at most that many bars old
+FRESH_BARS = 2
+
 
 class Strategy(BaseModel):
     name: str
     params: Dict[str, Any]
+    # id of the registered strategy, derived from the name for workers defined in code
+    id: uuid.UUID | None = None
 
 
 class Worker:
@@ -31,55 +47,243 @@ class Worker:
         self.running = False
         await self.log("stop")
 
-    async def loop(self, queue: asyncio.Queue) -> None:
-        await self.log("Run streaming")
-        while self.running:
-            try:
-                candle: Candle = await queue.get()
-                candle.time = candle.time.astimezone()
-                await self.strategy.handle(candle)
-            except Exception as e:
-                await self.log(f"{type(e).__name__}: {e}", level="exception")
-        await self.log("Stop streaming")
+    async def handle(self, candle: Candle, signal: Signal) -> None:
+        try:
+            await self.strategy.on_signal(candle, signal)
+        except Exception as e:
+            await self.log(f"{type(e).__name__}: {e}", level="exception")
 
     async def log(self, msg: str, level: str = "info") -> None:
         getattr(self.logger, level)(msg)
 
 
+# a shared subscription is as strict as the strictest of its workers
+POLICY_ORDER = (BusPolicy.LATEST, BusPolicy.DROP_OLDEST, BusPolicy.LOSSLESS)
+
+
+@dataclass
+class ChartFeed:
+    """Candles of one subscription update a shared chart once and go to all its workers"""
+
+    chart: Chart
+    symbol: str
+    pull_interval: int
+    policy: BusPolicy = BusPolicy.LATEST
+    workers: list[Worker] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return ",".join(worker.name for worker in self.workers)
+
+    def attach(self, worker: Worker, pull_interval: int, policy: BusPolicy) -> None:
+        self.workers.append(worker)
+        self.pull_interval = min(self.pull_interval, pull_interval)
+        self.policy = max(self.policy, policy, key=POLICY_ORDER.index)
+
+    async def loop(self, subscription: Subscription) -> None:
+        logger = logging.getLogger(self.name)
+        logger.info("Run streaming")
+        while any(worker.running for worker in self.workers):
+            try:
+                candle: Candle = await subscription.get()
+                signal = self.chart.add(candle)
+            except BusClosedError:
+                break
+            except Exception as e:
+                logger.exception(f"{type(e).__name__}: {e}")
+                continue
+            if signal is None:
+                # a bar the chart already has a newer one than, e.g. history polled again
+                continue
+            # workers do not touch the chart, they may wait for the exchange concurrently
+            await asyncio.gather(*[worker.handle(candle, signal) for worker in self.workers])
+        logger.info("Stop streaming")
+
+
 class WorkerManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        persistence: PersistenceService | None = None,
+        store: CandleStore | None = None,
+        snapshots: SnapshotStore | None = None,
+    ) -> None:
+        self.persistence = persistence
+        self.store = store
+        self.snapshots = snapshots
+        self.charts = ChartRegistry()
         self._workers: list[Worker] = []
+        self._feeds: list[ChartFeed] = []
+        self._restored: set[str] = set()
         self._tasks = []
-        self.puller = Puller()
+        self._snapshot_task: asyncio.Task | None = None
+        self.puller = Puller(store)
+        self.exchange: BingXExchange | None = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    async def restore(self, worker_task: Strategy, strategy: BaseStrategy) -> None:
+        strategy.persistence = self.persistence
+        await self.persistence.register_strategy(
+            strategy.strategy_id, worker_task.name, "live", worker_task.params
+        )
+        position = await self.persistence.restore(strategy.strategy_id)
+        if position is not None:
+            await strategy.restore(position)
+            self.logger.info(f"Restored position of {worker_task.name}: {position.avg_price=}")
+        elif strategy.position is not None:
+            # the journal is authoritative, the position of the snapshot was closed since
+            strategy.position = None
+
+    async def history(self, symbol: str, timeframe: int, size: int) -> CandleArrays:
+        """Stored candles when they are complete and recent, otherwise the exchange ones"""
+        if self.store is not None:
+            try:
+                history = await self.store.history(self.exchange.name, symbol, timeframe, size)
+                fresh = time.time() * 1000 - FRESH_BARS * timeframe * 60 * 1000
+                if len(history) == size and history.time[-1] >= fresh:
+                    # polls go on from the stored bars instead of a full page of old ones
+                    self.exchange.resume_from(symbol, int(history.time[-1]))
+                    return history
+            except Exception as e:
+                self.logger.warning(f"Candle store is unavailable: {type(e).__name__}: {e}")
+        history = await self.exchange.get_history(symbol, timeframe, size)
+        if self.store is not None and timeframe == 1:
+            try:
+                await self.store.upsert(self.exchange.name, symbol, timeframe, history)
+            except Exception as e:
+                self.logger.warning(f"Candle store is unavailable: {type(e).__name__}: {e}")
+        return history
+
+    async def catch_up(self, feed: ChartFeed) -> bool:
+        """Add the bars closed since the snapshot, tell if the gap is too long for the chart"""
+        chart = feed.chart
+        period = chart.timeframe * 60 * 1000
+        missing = int(time.time() * 1000 - chart.buffer.last_time) // period + 1
+        if missing >= chart.size:
+            self.logger.info(f"Snapshot of {feed.name} is stale: {missing} bars behind")
+            return False
+        try:
+            history = await self.history(feed.symbol, chart.timeframe, missing + 1)
+        except Exception as e:
+            self.logger.error(f"Catch up of {feed.name} failed: {type(e).__name__}: {e}")
+            return False
+        for candle in history.candles():
+            chart.add(candle)
+        return True
+
+    async def save_snapshots(self) -> None:
+        for worker in self._workers:
+            try:
+                await self.snapshots.save(worker.name, worker.strategy)
+            except Exception as e:
+                self.logger.error(f"Snapshot of {worker.name} failed: {type(e).__name__}: {e}")
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshots.interval)
+            await self.save_snapshots()
+
+    async def bootstrap(self) -> None:
+        """Load history into every chart before streaming, so strategies are ready at once"""
+        groups: dict[tuple[str, int], list[Chart]] = {}
+        for feed in self._feeds:
+            restored = any(worker.name in self._restored for worker in feed.workers)
+            if restored and await self.catch_up(feed):
+                continue
+            groups.setdefault((feed.symbol, feed.chart.timeframe), []).append(feed.chart)
+
+        async def load(symbol: str, timeframe: int, charts: list[Chart]) -> None:
+            start = time.monotonic()
+            size = max(chart.size for chart in charts)
+            history = await self.history(symbol, timeframe, size)
+            for chart in charts:
+                chart.load(history)
+            elapsed = round((time.monotonic() - start) * 1000, 1)
+            self.logger.info(f"Loaded {len(charts)} charts {symbol=} {timeframe=} in {elapsed} ms")
+
+        results = await asyncio.gather(
+            *[load(symbol, timeframe, charts) for (symbol, timeframe), charts in groups.items()],
+            return_exceptions=True,
+        )
+        for error in results:
+            if isinstance(error, Exception):
+                self.logger.error(f"Bootstrap failed: {type(error).__name__}: {error}")
+
     async def start(self, worker_tasks: List[Strategy]) -> None:
         self.logger.info("Prepare workers...")
 
+        config = BingXConfig()
+        self.exchange = BingXStreamExchange(config) if config.STREAM else BingXExchange(config)
+        feeds: dict[int, ChartFeed] = {}
+        names = set()
         for worker_task in worker_tasks:
+            if worker_task.name in names:
+                self.logger.warning(f"Skip a second worker named {worker_task.name}")
+                continue
+            names.add(worker_task.name)
             params = WorkerParams.parse_obj(worker_task.params)
-            exchange = BingXExchange(config=BingXConfig())
+            chart = self.charts.get(self.exchange.name, params.symbol, params.chart)
             strategy = ExampleStrategy(
-                strategy_id=uuid.uuid4(),
+                # stable over restarts, so the open position of the worker can be restored
+                strategy_id=worker_task.id or uuid.uuid5(uuid.NAMESPACE_OID, worker_task.name),
                 symbol=params.symbol,
-                chart=Chart.new(params.chart),
-                exchange=exchange,
+                chart=chart,
+                exchange=self.exchange,
                 online_check=True,
                 **params.strategy.params,
             )
-            queue = self.puller.subscribe(exchange, params.symbol, params.pull_interval)
+            if self.snapshots is not None and await self.snapshots.restore(
+                worker_task.name, strategy
+            ):
+                self._restored.add(worker_task.name)
+            if self.persistence is not None:
+                await self.restore(worker_task, strategy)
             worker = Worker(worker_task.name, strategy)
-            self._tasks.append(asyncio.create_task(worker.loop(queue)))
+            feed = feeds.setdefault(
+                id(chart), ChartFeed(chart, params.symbol, params.pull_interval)
+            )
+            feed.attach(worker, params.pull_interval, params.policy)
             self._workers.append(worker)
 
+        self._feeds = list(feeds.values())
+        for feed in self._feeds:
+            subscription = self.puller.subscribe(
+                self.exchange,
+                feed.symbol,
+                feed.pull_interval,
+                feed.chart.timeframe,
+                feed.policy,
+                name=feed.name,
+            )
+            self._tasks.append(asyncio.create_task(feed.loop(subscription)))
+
+        await self.bootstrap()
         await self.puller.start()
-        self.logger.info(f"Running {len(self._workers)} workers")
+        if self.snapshots is not None:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+        self.logger.info(f"Running {len(self._workers)} workers on {len(self._feeds)} charts")
 
     async def stop(self) -> None:
         self.logger.info(f"Stopping {len(self._workers)} workers")
+        for info in self.puller.stats():
+            self.logger.info(f"Subscription {info}")
+        # polls use the session of the exchange, they are stopped before it is closed;
+        # stopping the puller closes its buses, which ends the feeds waiting for a candle
+        await self.puller.stop()
         await asyncio.gather(*[worker.stop() for worker in self._workers])
 
         self.logger.info(f"Stopping {len(self._tasks)} tasks")
         await asyncio.gather(*self._tasks)
 
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+        if self.snapshots is not None:
+            await self.save_snapshots()
+
+        if self.exchange is not None:
+            await self.exchange.stop()
+        if self.persistence is not None:
+            await self.persistence.stop()
+        if self.store is not None:
+            await self.store.stop()
+        await RenderPool.stop_shared()
         self.logger.info("Worker Manager is stopped")
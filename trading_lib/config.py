@@ -10,6 +10,9 @@ class Settings(BaseSettings):
     BINGX: BingXConfig | None = None
     CSV: CSVConfig | None = None
     DB: DatabaseConfig
+    SNAPSHOT_DIR: str = "snapshots"
+    # seconds between snapshots of the workers, they are saved on shutdown too
+    SNAPSHOT_INTERVAL: int = 60
 
     class Config:
         case_sensitive = True
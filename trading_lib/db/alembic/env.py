@@ -1,13 +1,26 @@
 from alembic import context
 from config import get_settings
+from db.candles import is_partition
 from db.models import BaseModel
 from sqlalchemy import create_engine
+from sqlalchemy.schema import SchemaItem
 
 settings = get_settings()
 target_metadata = BaseModel.metadata
 config = context.config
 
 
+def include_object(
+    obj: SchemaItem, name: str | None, type_: str, reflected: bool, compare_to: SchemaItem | None
+) -> bool:
+    """Autogenerate must not drop the candle partitions, they are created at runtime"""
+    if type_ == "table" and reflected and compare_to is None:
+        return not is_partition(name)
+    if type_ in ("index", "unique_constraint") and reflected and compare_to is None:
+        return not is_partition(obj.table.name)
+    return True
+
+
 def run_migrations() -> None:
     url = config.get_main_option("sqlalchemy.url") or settings.DB.postgresql_url
     connectable = create_engine(url)
@@ -16,6 +29,7 @@ def run_migrations() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
         with context.begin_transaction() as transaction:
             context.run_migrations()
@@ -0,0 +1,41 @@
+"""
+candle
+
+Revision ID: 5d2c81f0a9e4
+Revises: 134423acdb34
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2c81f0a9e4"
+down_revision: Union[str, None] = "134423acdb34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "candle",
+        sa.Column("exchange", sa.String(length=32), nullable=False),
+        sa.Column("symbol", sa.String(length=32), nullable=False),
+        sa.Column("timeframe", sa.SmallInteger(), nullable=False),
+        sa.Column("time", sa.BigInteger(), nullable=False),
+        sa.Column("open", sa.Float(), nullable=False),
+        sa.Column("high", sa.Float(), nullable=False),
+        sa.Column("low", sa.Float(), nullable=False),
+        sa.Column("close", sa.Float(), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("exchange", "symbol", "timeframe", "time"),
+        postgresql_partition_by="RANGE (time)",
+    )
+
+
+def downgrade() -> None:
+    # monthly partitions are dropped with the parent table
+    op.drop_table("candle")
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+from common.candles import CandleArrays
+from common.resampler import resample
+from common.schemas import Candle
+from db.db_connector import DatabaseConnector
+from db.models import candle_table
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Postgres takes at most 32767 bind parameters per statement, a row has 9 of them
+UPSERT_ROWS = 3000
+OHLCV = ("open", "high", "low", "close", "volume")
+PARTITION = re.compile(r"candle_\d{4}_\d{2}")
+
+Key = tuple[str, str, int]
+
+
+def _month(ts: int) -> datetime:
+    dt = datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(dt: datetime) -> datetime:
+    return dt.replace(year=dt.year + dt.month // 12, month=dt.month % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"candle_{month:%Y_%m}"
+
+
+def is_partition(table_name: str) -> bool:
+    """Monthly partitions are created at runtime, they are not part of the metadata"""
+    return PARTITION.fullmatch(table_name) is not None
+
+
+class CandleStore:
+    """
+    Candle history in the 'candle' table shared by live workers, warm starts and backtests.
+
+    Writes are bulk upserts, so re-delivered bars replace the stored ones. 'put' buffers
+    candles of the live feed, the last version of a bar wins, and a background task flushes
+    the buffer every 'flush_interval' seconds. Reads return 'CandleArrays'.
+    """
+
+    def __init__(self, db: DatabaseConnector, flush_interval: float = 5.0) -> None:
+        self.db = db
+        self.flush_interval = flush_interval
+        self._partitions: set[datetime] = set()
+        self._pending: dict[Key, dict[int, Candle]] = {}
+        self._writer: asyncio.Task | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def _ensure_partitions(self, times: np.ndarray) -> None:
+        months = {_month(int(ts)) for ts in (times.min(), times.max())}
+        month = min(months)
+        while month <= max(months):
+            months.add(month)
+            month = _next_month(month)
+        missing = sorted(months - self._partitions)
+        if not missing:
+            return
+        async with self.db.session_maker() as session:
+            for month in missing:
+                begin = int(month.timestamp() * 1000)
+                end = int(_next_month(month).timestamp() * 1000)
+                await session.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF candle "
+                        f"FOR VALUES FROM ({begin}) TO ({end})"
+                    )
+                )
+        self._partitions.update(missing)
+
+    async def upsert(
+        self, exchange: str, symbol: str, timeframe: int, candles: CandleArrays
+    ) -> None:
+        if not len(candles):
+            return
+        await self._ensure_partitions(candles.time)
+        async with self.db.session_maker() as session:
+            for begin in range(0, len(candles), UPSERT_ROWS):
+                chunk = candles[begin : begin + UPSERT_ROWS]
+                columns = zip(
+                    chunk.time.tolist(), *(getattr(chunk, n).tolist() for n in OHLCV), strict=True
+                )
+                key = {"exchange": exchange, "symbol": symbol, "timeframe": timeframe}
+                rows = [
+                    {**key, "time": time, **dict(zip(OHLCV, values, strict=True))}
+                    for time, *values in columns
+                ]
+                stmt = pg_insert(candle_table).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["exchange", "symbol", "timeframe", "time"],
+                    set_={name: stmt.excluded[name] for name in OHLCV},
+                )
+                await session.execute(stmt)
+
+    def _where(self, exchange: str, symbol: str, timeframe: int) -> tuple:
+        return (
+            candle_table.c.exchange == exchange,
+            candle_table.c.symbol == symbol,
+            candle_table.c.timeframe == timeframe,
+        )
+
+    async def read(  # noqa: PLR0913
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: int = 1,
+        start_time: int | None = None,
+        end_time: int | None = None,
+    ) -> CandleArrays:
+        """Candles in '[start_time, end_time]' ordered by time"""
+        query = select(candle_table.c.time, *(candle_table.c[n] for n in OHLCV)).where(
+            *self._where(exchange, symbol, timeframe)
+        )
+        if start_time is not None:
+            query = query.where(candle_table.c.time >= start_time)
+        if end_time is not None:
+            query = query.where(candle_table.c.time <= end_time)
+        async with self.db.session_maker() as session:
+            result = await session.execute(query.order_by(candle_table.c.time))
+            rows = result.all()
+        return CandleArrays.from_rows(rows)
+
+    async def last_time(self, exchange: str, symbol: str, timeframe: int = 1) -> int | None:
+        query = select(func.max(candle_table.c.time)).where(
+            *self._where(exchange, symbol, timeframe)
+        )
+        async with self.db.session_maker() as session:
+            return await session.scalar(query)
+
+    async def history(self, exchange: str, symbol: str, timeframe: int, size: int) -> CandleArrays:
+        """Last 'size' candles of the timeframe resampled from the stored 1m candles"""
+        last_time = await self.last_time(exchange, symbol)
+        if last_time is None:
+            return CandleArrays.empty()
+        start_time = last_time - (size + 1) * timeframe * 60 * 1000
+        candles = resample(await self.read(exchange, symbol, 1, start_time), timeframe)
+        return candles[-size:]
+
+    def put(self, exchange: str, symbol: str, timeframe: int, candle: Candle) -> None:
+        """Buffer a candle of the live feed, it is upserted by the background writer"""
+        self._pending.setdefault((exchange, symbol, timeframe), {})[candle.ts] = candle
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for (exchange, symbol, timeframe), candles in pending.items():
+            rows = CandleArrays.from_candles([candles[ts] for ts in sorted(candles)])
+            try:
+                await self.upsert(exchange, symbol, timeframe, rows)
+            except Exception as e:
+                self.logger.exception(f"Failed to store {len(rows)} candles of {symbol}: {e}")
+                # keep them for the next flush unless newer versions arrived meanwhile
+                merged = self._pending.setdefault((exchange, symbol, timeframe), {})
+                self._pending[(exchange, symbol, timeframe)] = {**candles, **merged}
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+        self._writer = None
+        await self.flush()
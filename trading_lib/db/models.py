@@ -1,4 +1,15 @@
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, String, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    SmallInteger,
+    String,
+    Table,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase
 
@@ -54,3 +65,21 @@ class Order(BaseModel):
             f"{self.amount=}, {self.side=}, {self.status=}, {self.cost=}"
             f")"
         )
+
+
+# candles are a time series keyed by the bar open time in epoch ms, the table is partitioned
+# by month on that time, partitions are created by 'CandleStore' when it first writes to them
+candle_table = Table(
+    "candle",
+    BaseModel.metadata,
+    Column("exchange", String(32), primary_key=True),
+    Column("symbol", String(32), primary_key=True),
+    Column("timeframe", SmallInteger, primary_key=True),
+    Column("time", BigInteger, primary_key=True),
+    Column("open", Float, nullable=False),
+    Column("high", Float, nullable=False),
+    Column("low", Float, nullable=False),
+    Column("close", Float, nullable=False),
+    Column("volume", Float, nullable=False),
+    postgresql_partition_by="RANGE (time)",
+)
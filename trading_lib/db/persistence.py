@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from common.enums import OrderSide, PositionStatus
+from common.schemas import Order, Position, to_timestamp
+from db.db_connector import DatabaseConnector
+from db.models import Order as OrderModel
+from db.models import Position as PositionModel
+from db.models import Strategy as StrategyModel
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+
+@dataclass(slots=True)
+class OrderEvent:
+    strategy_id: uuid.UUID
+    symbol: str
+    position_id: uuid.UUID
+    status: PositionStatus
+    order: Order
+
+
+def _db_time(ts: int) -> datetime:
+    """Order times are stored as naive UTC"""
+    return datetime.fromtimestamp(ts / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+class PersistenceService:
+    """
+    Write-behind journal of strategies, positions and orders.
+
+    'record' only puts the event into a buffer of 'max_buffer' events, it waits only when the
+    buffer is full. A background task writes the events in batches of up to 'batch_size'
+    at least every 'flush_interval' seconds: one multi-row upsert of positions and one
+    multi-row insert of orders per batch. A failed batch is retried, so events are not lost
+    while the database is unavailable; 'stop' waits for them at most 'timeout' seconds and
+    then logs the events left unwritten. Open positions are rebuilt by replaying their orders.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        db: DatabaseConnector,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10_000,
+        retry_delay: float = 5.0,
+    ) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue[OrderEvent] = asyncio.Queue(maxsize=max_buffer)
+        self._batch: list[OrderEvent] = []
+        self._writer: asyncio.Task | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def register_strategy(
+        self, strategy_id: uuid.UUID, name: str, mode: str, params: dict
+    ) -> None:
+        """Strategies are written at once, positions reference them"""
+        stmt = pg_insert(StrategyModel).values(id=strategy_id, name=name, mode=mode, params=params)
+        async with self.db.session_maker() as session:
+            await session.execute(stmt.on_conflict_do_nothing(index_elements=["id"]))
+
+    async def strategies(self, mode: str) -> list[StrategyModel]:
+        """Registered strategies of the mode, e.g. the workers to run live"""
+        async with self.db.session_maker() as session:
+            rows = await session.scalars(
+                select(StrategyModel)
+                .where(StrategyModel.mode == mode)
+                .order_by(StrategyModel.created_at)
+            )
+            return list(rows.all())
+
+    async def record(  # noqa: PLR0913
+        self,
+        strategy_id: uuid.UUID,
+        symbol: str,
+        position: Position,
+        order: Order,
+        status: PositionStatus = PositionStatus.OPEN,
+    ) -> None:
+        event = OrderEvent(strategy_id, symbol, position.id, status, order)
+        if self._queue.full():
+            self.logger.warning(f"Persistence buffer is full ({self._queue.maxsize} events)")
+        await self._queue.put(event)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run())
+
+    async def _collect(self) -> list[OrderEvent]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: list[OrderEvent]) -> None:
+        positions = {}
+        for event in batch:
+            # the last status of a position in the batch wins
+            positions[event.position_id] = {
+                "id": event.position_id,
+                "strategy_id": event.strategy_id,
+                "symbol": event.symbol,
+                "status": event.status.value,
+            }
+        orders = [
+            {
+                "id": uuid.uuid4(),
+                "position_id": event.position_id,
+                "time": _db_time(event.order.ts),
+                "price": event.order.price,
+                "amount": event.order.amount,
+                "side": event.order.side.value,
+                "status": event.order.status,
+                "cost": event.order.cost,
+            }
+            for event in batch
+        ]
+        upsert = pg_insert(PositionModel).values(list(positions.values()))
+        upsert = upsert.on_conflict_do_update(
+            index_elements=["id"],
+            set_={"status": upsert.excluded.status, "updated_at": func.now()},
+        )
+        async with self.db.session_maker() as session:
+            await session.execute(upsert)
+            await session.execute(insert(OrderModel).values(orders))
+
+    async def _run(self) -> None:
+        while True:
+            batch = self._batch = await self._collect()
+            while True:
+                try:
+                    await self._write(batch)
+                    break
+                except Exception as e:
+                    self.logger.exception(f"Failed to write {len(batch)} events: {e}")
+                    await asyncio.sleep(self.retry_delay)
+            self._batch = []
+            for _ in batch:
+                self._queue.task_done()
+
+    async def flush(self, timeout: float | None = None) -> None:
+        """Wait until every recorded event is written"""
+        if self._writer is not None and not self._writer.done():
+            await asyncio.wait_for(self._queue.join(), timeout)
+
+    def _drop(self) -> None:
+        """Log the events which could not be written, so they can be entered by hand"""
+        events = list(self._batch)
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+            self._queue.task_done()
+        self._batch = []
+        self.logger.error(f"Persistence stopped with {len(events)} unwritten events")
+        for event in events:
+            self.logger.error(f"Unwritten {event}")
+
+    async def stop(self, timeout: float = 10) -> None:
+        try:
+            await self.flush(timeout)
+        except asyncio.TimeoutError:
+            self._drop()
+        if self._writer is not None:
+            self._writer.cancel()
+        self._writer = None
+
+    async def restore(self, strategy_id: uuid.UUID) -> Position | None:
+        """Rebuild the open position of the strategy by replaying its orders"""
+        async with self.db.session_maker() as session:
+            position_id = await session.scalar(
+                select(PositionModel.id)
+                .where(PositionModel.strategy_id == strategy_id)
+                .where(PositionModel.status == PositionStatus.OPEN.value)
+                .order_by(PositionModel.created_at.desc())
+                .limit(1)
+            )
+            if position_id is None:
+                return None
+            rows = await session.scalars(
+                select(OrderModel)
+                .where(OrderModel.position_id == position_id)
+                .order_by(OrderModel.time, OrderModel.created_at)
+            )
+            orders = rows.all()
+        position = Position(id=position_id)
+        for row in orders:
+            order = Order(
+                ts=to_timestamp(row.time.replace(tzinfo=timezone.utc)),
+                price=row.price,
+                amount=row.amount,
+                side=OrderSide(row.side),
+                status=row.status,
+                cost=row.cost,
+            )
+            if order.side == OrderSide.BUY:
+                position.add_buy(order)
+            else:
+                position.add_sell(order)
+        return position if position.orders else None
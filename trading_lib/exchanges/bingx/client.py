@@ -1,8 +1,15 @@
+import asyncio
+import heapq
 import hmac
+import itertools
 import time
+from enum import IntEnum
 from hashlib import sha256
 
+from aiohttp import ClientResponse
 from async_client import BaseClient
+from async_client._client import Response
+from common.exceptions import BaseClientError
 from exchanges.bingx.config import BingXConfig
 from exchanges.bingx.schemas import (
     BingXBalances,
@@ -12,9 +19,128 @@ from exchanges.bingx.schemas import (
     BingXOrderResponse,
 )
 
+KLINE_PATH = "/openApi/spot/v2/market/kline"
+BALANCE_PATH = "/openApi/spot/v1/account/balance"
+ORDER_PATH = "/openApi/spot/v1/trade/order"
+
+# share of the rate limit a request to the endpoint costs, unknown endpoints cost 1
+ENDPOINT_WEIGHTS = {
+    KLINE_PATH: 1,
+    BALANCE_PATH: 5,
+    ORDER_PATH: 1,
+}
+RATE_LIMIT_RETRIES = 3
+TOO_MANY_REQUESTS = 429
+
+
+class Priority(IntEnum):
+    ORDER = 0
+    ACCOUNT = 1
+    MARKET = 2
+
+
+class BingXRateLimitError(BaseClientError):
+    default_msg = "BingX rate limit exceeded"
+
+    def __init__(self, retry_after: float, extra: str | None = None) -> None:
+        super().__init__(extra=extra)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """'capacity' tokens refilled evenly over 'period' seconds"""
+
+    def __init__(self, capacity: float, period: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, weight: float) -> float:
+        """Seconds until 'weight' tokens are available"""
+        self._refill()
+        return max(0.0, (min(weight, self.capacity) - self.tokens) / self.rate)
+
+    def take(self, weight: float) -> None:
+        self._refill()
+        self.tokens -= weight
+
+    def drain(self, seconds: float) -> None:
+        """Empty the bucket so nothing is sent for 'seconds'"""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class RequestScheduler:
+    """
+    Admits requests within a shared token bucket.
+
+    Waiting requests are served by priority first. Within a priority every key (a symbol)
+    gets a virtual finish tag which grows with the weight it has consumed, so many symbol
+    feeds are interleaved round-robin across the limit window and none of them starves.
+    """
+
+    _shared: dict[str, "RequestScheduler"] = {}
+
+    def __init__(self, capacity: float, period: float) -> None:
+        self.bucket = TokenBucket(capacity, period)
+        self._queue: list[tuple[int, float, int, float, asyncio.Future]] = []
+        self._tags: dict[str | None, float] = {}
+        self._round = 0.0
+        self._counter = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    @classmethod
+    def shared(cls, host: str, capacity: float, period: float) -> "RequestScheduler":
+        """One scheduler per host, the exchange limits all clients of the account together"""
+        if host not in cls._shared:
+            cls._shared[host] = cls(capacity, period)
+        return cls._shared[host]
+
+    async def acquire(
+        self, weight: float = 1, priority: Priority = Priority.MARKET, key: str | None = None
+    ) -> None:
+        tag = max(self._round, self._tags.get(key, 0.0)) + weight
+        self._tags[key] = tag
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, tag, next(self._counter), weight, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    def pause(self, seconds: float) -> None:
+        self.bucket.drain(seconds)
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            _, tag, _, weight, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            delay = self.bucket.delay(weight)
+            if delay > 0:
+                # a request of a higher priority may arrive meanwhile, so look at the head again
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(self._queue)
+            self.bucket.take(weight)
+            self._round = tag
+            future.set_result(None)
+
 
 class BingXClient(BaseClient[BingXConfig]):
 
+    def __init__(self, config: BingXConfig, scheduler: RequestScheduler | None = None) -> None:
+        super().__init__(config)
+        self.scheduler = scheduler or RequestScheduler.shared(
+            config.HOST, config.RATE_LIMIT, config.RATE_PERIOD
+        )
+
     @property
     def headers(self) -> dict:
         return {
@@ -41,37 +167,70 @@ class BingXClient(BaseClient[BingXConfig]):
         ).hexdigest()
         return self.get_path(f"{path}?{url_params}&signature={sign}")
 
+    @staticmethod
+    async def _raise_for_status(resp: ClientResponse) -> None:
+        if resp.status == TOO_MANY_REQUESTS:
+            retry_after = float(resp.headers.get("Retry-After", 1))
+            raise BingXRateLimitError(retry_after, await resp.text())
+        await BaseClient._raise_for_status(resp)
+
+    async def _request(  # noqa: PLR0913
+        self,
+        method: str,
+        path: str,
+        priority: Priority,
+        key: str | None = None,
+        headers: dict | None = None,
+        **params,  # noqa: ANN003
+    ) -> Response:
+        """Wait for the scheduler, the URL is signed afterwards to keep the timestamp fresh"""
+        weight = ENDPOINT_WEIGHTS.get(path, 1)
+        for _ in range(RATE_LIMIT_RETRIES):
+            await self.scheduler.acquire(weight, priority, key)
+            try:
+                return await self._perform_request(
+                    method, self._make_signed_url(path, **params), headers=headers
+                )
+            except BingXRateLimitError as e:
+                self.logger.warning(f"Rate limited {path=}, retry after {e.retry_after}s")
+                self.scheduler.pause(e.retry_after)
+        raise BingXRateLimitError(0, path)
+
     async def get_candles(
         self, symbol: str, interval: str, limit: int, start_time: int = None
     ) -> list[list]:
-        url = self._make_signed_url(
-            "/openApi/spot/v2/market/kline",
+        base_resp = await self._request(
+            "GET",
+            KLINE_PATH,
+            Priority.MARKET,
+            key=symbol,
             symbol=symbol,
             interval=interval,
             limit=limit,
             startTime=start_time,
         )
-        base_resp = await self._perform_request("GET", url)
         response = self.load_schema(base_resp.body, BingXCandleResponse)
         return response.data
 
     async def get_balances(self) -> BingXBalances:
-        url = self._make_signed_url("/openApi/spot/v1/account/balance")
-        base_resp = await self._perform_request("GET", url, headers=self.headers)
+        base_resp = await self._request("GET", BALANCE_PATH, Priority.ACCOUNT, headers=self.headers)
         response = self.load_schema(base_resp.body, BingXBalancesResponse)
         return response.data
 
     async def place_order(  # noqa: PLR0913
         self, symbol: str, side: str, quantity: float, client_oid: str, order_type: str = "MARKET"
     ) -> BingXOrderOut:
-        url = self._make_signed_url(
-            "/openApi/spot/v1/trade/order",
+        base_resp = await self._request(
+            "POST",
+            ORDER_PATH,
+            Priority.ORDER,
+            key=symbol,
+            headers=self.headers,
             symbol=symbol,
             type=order_type,
             side=side,
             quantity=quantity,
             newClientOrderId=client_oid,
         )
-        base_resp = await self._perform_request("POST", url, headers=self.headers)
         response = self.load_schema(base_resp.body, BingXOrderResponse)
         return response.data.order
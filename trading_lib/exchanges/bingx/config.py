@@ -4,6 +4,14 @@ from async_client import ClientConfig
 class BingXConfig(ClientConfig):
     API_KEY: str
     SECRET_KEY: str
+    # request weight allowed per RATE_PERIOD seconds, shared by all clients of the host
+    RATE_LIMIT: int = 100
+    RATE_PERIOD: float = 10
+    # seconds the local balance ledger is trusted before it is fetched again
+    BALANCE_TTL: float = 60
+    STREAM: bool = False
+    WS_HOST: str = "wss://open-api-ws.bingx.com/market"
+    WS_TIMEOUT: float = 30
 
     class Config:
         env_prefix = "BINGX_"
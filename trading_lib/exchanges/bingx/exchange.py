@@ -1,9 +1,13 @@
+import logging
 from typing import Generator
 
+from common.candles import CandleArrays
 from common.exchange import BaseExchange
-from common.schemas import Candle, Order, OrderIN
+from common.latency import LatencyStats
+from common.schemas import Candle, Order, OrderIN, to_timestamp
 from exchanges.bingx.client import BingXClient
 from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.ledger import QUOTE_ASSET, BalanceLedger
 from pydantic import BaseModel
 
 BINGX_INTERVALS = {
@@ -31,13 +35,25 @@ class BingXPairStat(BaseModel):
 
 
 class BingXExchange(BaseExchange):
+    name = "bingx"
+
     def __init__(self, config: BingXConfig) -> None:
         self.client = BingXClient(config)
         self.statistics: dict[str, BingXPairStat] = {}
+        self.latency: dict[str, LatencyStats] = {}
+        self.ledger = BalanceLedger(self.client.get_balances, config.BALANCE_TTL)
+        self.logger = logging.getLogger(self.__class__.__name__)
 
     async def stop(self) -> None:
+        for symbol, stats in self.latency.items():
+            self.logger.info(f"Close latency {symbol=}: {stats.info}")
         await self.client.stop()
 
+    def _observe(self, symbol: str, candle: Candle) -> None:
+        if symbol not in self.latency:
+            self.latency[symbol] = LatencyStats()
+        self.latency[symbol].observe(candle)
+
     def _statistic(self, symbol: str) -> BingXPairStat:
         if symbol not in self.statistics:
             self.statistics[symbol] = BingXPairStat(symbol=symbol)
@@ -56,21 +72,46 @@ class BingXExchange(BaseExchange):
         list_data.reverse()
         for data in list_data:
             stat.start_time = data[0]
-            yield Candle(
-                time=data[0],
-                open=data[1],
-                high=data[2],
-                low=data[3],
-                close=data[4],
-                volume=data[7],
+            candle = Candle(
+                ts=int(data[0]),
+                open=float(data[1]),
+                high=float(data[2]),
+                low=float(data[3]),
+                close=float(data[4]),
+                volume=float(data[7]),
             )
+            self._observe(symbol, candle)
+            yield candle
+
+    def resume_from(self, symbol: str, ts: int) -> None:
+        # the 1m feed is resampled to every timeframe, it has to cover the oldest forming bar
+        stat = self._statistic(symbol)
+        stat.start_time = min(stat.start_time or ts, ts)
+
+    async def get_history(self, symbol: str, timeframe: int = 1, size: int = 1000) -> CandleArrays:
+        list_data = await self.client.get_candles(
+            symbol=f"{symbol}-USDT",
+            interval=BINGX_INTERVALS[timeframe],
+            limit=size,
+        )
+        list_data.reverse()
+        if list_data:
+            self.resume_from(symbol, int(list_data[-1][0]))
+        return CandleArrays.from_rows(list_data, columns=(0, 1, 2, 3, 4, 7))
 
     async def place_order(self, order_in: OrderIN, client_oid: str = None) -> Order:
-        order = await self.client.place_order(
-            f"{order_in.symbol}-USDT", order_in.side, order_in.amount, client_oid
+        try:
+            order = await self.client.place_order(
+                f"{order_in.symbol}-USDT", order_in.side, order_in.amount, client_oid
+            )
+        except Exception:
+            self.ledger.invalidate()
+            raise
+        self.ledger.apply_fill(
+            order_in.symbol, order_in.side, order.executedQty, order.cummulativeQuoteQty
         )
         return Order(
-            time=order.transactTime,
+            ts=to_timestamp(order.transactTime),
             price=order.price,
             amount=order.executedQty,
             side=order.side,
@@ -79,5 +120,5 @@ class BingXExchange(BaseExchange):
         )
 
     async def get_balance(self, symbol: str) -> tuple[float, float]:
-        balances = await self.client.get_balances()
-        return balances.free_for_asset(symbol), balances.free_for_asset("USDT")
+        """Served from the ledger, the account is fetched only when the ledger is stale"""
+        return await self.ledger.get(symbol), await self.ledger.get(QUOTE_ASSET)
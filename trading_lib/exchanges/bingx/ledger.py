@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from common.enums import OrderSide
+from exchanges.bingx.schemas import BingXBalances
+
+QUOTE_ASSET = "USDT"
+
+
+class BalanceLedger:
+    """
+    Local copy of the free balances of the account.
+
+    It is fetched once and then kept up to date from order fills, so balances are read from
+    memory. It is fetched again when 'ttl' seconds have passed or at once after a mismatch:
+    a failed order or a balance going negative. A fill reports the gross amount while the
+    fee is taken from the received asset, so that asset is fetched again on its next read.
+    Concurrent readers of a stale ledger share a single fetch.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[BingXBalances]], ttl: float) -> None:
+        self._fetch = fetch
+        self.ttl = ttl
+        self.free: dict[str, float] = {}
+        self.expires = 0.0
+        self._fills = 0
+        # assets credited by fills, their fee is only known to the exchange
+        self._unsettled: set[str] = set()
+        self._syncing: asyncio.Task | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def invalidate(self) -> None:
+        self.expires = 0.0
+
+    async def _sync(self) -> None:
+        fills = self._fills
+        balances = await self._fetch()
+        self.free = {balance.asset: balance.free for balance in balances.balances}
+        # a fill applied while fetching may be missing from the response
+        if fills == self._fills:
+            self.expires = time.monotonic() + self.ttl
+            self._unsettled.clear()
+        else:
+            self.expires = 0.0
+
+    async def sync(self) -> None:
+        if self._syncing is None:
+            self._syncing = asyncio.create_task(self._sync())
+            self._syncing.add_done_callback(lambda _: setattr(self, "_syncing", None))
+        await asyncio.shield(self._syncing)
+
+    async def get(self, asset: str) -> float:
+        if self.is_stale or asset in self._unsettled:
+            await self.sync()
+        return self.free.get(asset, 0)
+
+    def apply_fill(self, asset: str, side: OrderSide, amount: float, cost: float) -> None:
+        """Move the filled amount and its cost between the asset and the quote balances"""
+        self._fills += 1
+        sign = 1 if side == OrderSide.BUY else -1
+        self.free[asset] = self.free.get(asset, 0) + sign * amount
+        self.free[QUOTE_ASSET] = self.free.get(QUOTE_ASSET, 0) - sign * cost
+        self._unsettled.add(asset if side == OrderSide.BUY else QUOTE_ASSET)
+        if self.free[asset] < 0 or self.free[QUOTE_ASSET] < 0:
+            self.logger.warning(f"Balance mismatch after {side} {amount} {asset}, resync")
+            self.invalidate()
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import json
+import uuid
+from typing import Generator
+
+from aiohttp import ClientWebSocketResponse, WSMsgType
+from common.exceptions import BaseClientError
+from common.schemas import Candle
+from exchanges.bingx.config import BingXConfig
+from exchanges.bingx.exchange import BingXExchange
+
+BINGX_STREAM_INTERVALS = {
+    1: "1min",
+    3: "3min",
+    5: "5min",
+    15: "15min",
+    30: "30min",
+    60: "60min",
+    2 * 60: "2hour",
+    4 * 60: "4hour",
+    6 * 60: "6hour",
+    8 * 60: "8hour",
+    12 * 60: "12hour",
+    24 * 60: "1day",
+    3 * 24 * 60: "3day",
+    7 * 24 * 60: "1week",
+    30 * 24 * 60: "1mon",
+}
+
+
+class BingXStreamError(BaseClientError):
+    default_msg = "BingX stream error"
+
+
+def parse_message(data: bytes | str) -> dict | str:
+    """Messages are gzip compressed JSON, heartbeats are a plain 'Ping'"""
+    if isinstance(data, bytes):
+        data = gzip.decompress(data).decode("utf-8")
+    if data == "Ping":
+        return data
+    return json.loads(data)
+
+
+def parse_kline(kline: dict) -> Candle:
+    return Candle(
+        ts=int(kline["t"]),
+        open=float(kline["o"]),
+        high=float(kline["h"]),
+        low=float(kline["l"]),
+        close=float(kline["c"]),
+        volume=float(kline["q"]),
+    )
+
+
+class BingXStreamExchange(BingXExchange):
+    """
+    BingX exchange with candles pushed over a kline WebSocket subscription.
+
+    'get_candles' first backfills the gap since the last received candle over REST and then
+    yields kline updates until the connection is closed or goes silent for 'WS_TIMEOUT'
+    seconds, so the 'Puller' reconnects it with the same schedule as a failed poll.
+    """
+
+    def __init__(self, config: BingXConfig) -> None:
+        super().__init__(config)
+        self._sockets: set[ClientWebSocketResponse] = set()
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+        await asyncio.gather(*[ws.close() for ws in self._sockets])
+        await super().stop()
+
+    async def get_candles(
+        self, symbol: str, timeframe: int = 1, size: int = 1000, start_time: int = None
+    ) -> Generator[Candle, None, None]:
+        async for candle in super().get_candles(symbol, timeframe, size, start_time):
+            yield candle
+        if not self._running:
+            return
+
+        stat = self._statistic(symbol)
+        async with self.client.session.ws_connect(self.client.config.WS_HOST) as ws:
+            self._sockets.add(ws)
+            try:
+                await ws.send_json(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "reqType": "sub",
+                        "dataType": f"{symbol}-USDT@kline_{BINGX_STREAM_INTERVALS[timeframe]}",
+                    }
+                )
+                async for kline in self._receive(ws):
+                    candle = parse_kline(kline)
+                    stat.start_time = candle.ts
+                    self._observe(symbol, candle)
+                    yield candle
+            finally:
+                self._sockets.discard(ws)
+
+    async def _receive(self, ws: ClientWebSocketResponse) -> Generator[dict, None, None]:
+        while self._running:
+            msg = await ws.receive(timeout=self.client.config.WS_TIMEOUT)
+            if msg.type not in (WSMsgType.BINARY, WSMsgType.TEXT):
+                return
+            message = parse_message(msg.data)
+            if message == "Ping":
+                await ws.send_str("Pong")
+                continue
+            if "ping" in message:
+                await ws.send_json({"pong": message["ping"], "time": message.get("time")})
+                continue
+            if message.get("code"):
+                raise BingXStreamError(message.get("msg"), message)
+            kline = (message.get("data") or {}).get("K")
+            if kline is not None:
+                yield kline
@@ -2,18 +2,21 @@ from common.enums import ExchangeType
 from common.exchange import BaseExchange
 from config import Settings
 from exchanges.bingx.exchange import BingXExchange
+from exchanges.bingx.stream import BingXStreamExchange
 from exchanges.local.exchange import CSVExchange
 
 
 class ExchangeFactory:
     EXCHANGES = {
         ExchangeType.BINGX: "_bingx_exchange",
+        ExchangeType.BINGX_STREAM: "_bingx_stream_exchange",
         ExchangeType.CSV: "_csv_exchange",
     }
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self.__bingx_exchange: BingXExchange | None = None
+        self.__bingx_stream_exchange: BingXStreamExchange | None = None
         self.__csv_exchange: CSVExchange | None = None
 
     @property
@@ -22,6 +25,12 @@ class ExchangeFactory:
             self.__bingx_exchange = BingXExchange(self._settings.BINGX)
         return self.__bingx_exchange
 
+    @property
+    def _bingx_stream_exchange(self) -> BingXStreamExchange:
+        if self.__bingx_stream_exchange is None:
+            self.__bingx_stream_exchange = BingXStreamExchange(self._settings.BINGX)
+        return self.__bingx_stream_exchange
+
     @property
     def _csv_exchange(self) -> CSVExchange:
         if self.__csv_exchange is None:
@@ -34,5 +43,7 @@ class ExchangeFactory:
     async def stop(self) -> None:
         if self.__bingx_exchange is not None:
             await self.__bingx_exchange.stop()
+        if self.__bingx_stream_exchange is not None:
+            await self.__bingx_stream_exchange.stop()
         if self.__csv_exchange is not None:
             await self.__csv_exchange.stop()
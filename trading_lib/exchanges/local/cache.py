@@ -0,0 +1,161 @@
+import shutil
+import struct
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from common.candles import CandleArrays
+from exchanges.local.reader import read_chunks
+
+MAGIC = b"TLCANDLE"
+VERSION = 1
+# magic, version, symbol, timeframe (minutes), count, start time, end time,
+# source size, source mtime (ns)
+HEADER = struct.Struct("<8sH16sIQqqQq")
+HEADER_SIZE = 128
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+
+@dataclass
+class CacheHeader:
+    symbol: str
+    timeframe: int
+    count: int
+    start_time: int
+    end_time: int
+    source_size: int
+    source_mtime: int
+
+    def pack(self) -> bytes:
+        data = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.symbol.encode()[:16],
+            self.timeframe,
+            self.count,
+            self.start_time,
+            self.end_time,
+            self.source_size,
+            self.source_mtime,
+        )
+        return data.ljust(HEADER_SIZE, b"\0")
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CacheHeader | None":
+        if len(data) < HEADER.size:
+            return None
+        magic, version, symbol, *values = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        return cls(symbol.rstrip(b"\0").decode(), *values)
+
+    def is_fresh(self, source: Path) -> bool:
+        stat = source.stat()
+        return self.source_size == stat.st_size and self.source_mtime == stat.st_mtime_ns
+
+    def is_for(self, symbol: str) -> bool:
+        """A cache built for another symbol is not used, any one is fine for an unknown symbol"""
+        return not symbol or self.symbol == symbol.encode()[:16].decode(errors="ignore")
+
+
+class CandleCache:
+    """
+    Fixed-width binary columnar copy of a CSV file with candles.
+
+    The file is a 128 bytes header followed by the time (int64 epoch ms) and the OHLCV (float64)
+    columns one after another. Columns are memory-mapped, so reading is zero-copy and a
+    timestamp is found by binary search over the mapped time column without a scan.
+    """
+
+    def __init__(self, path: Path, header: CacheHeader) -> None:
+        self.path = path
+        self.header = header
+        columns = {}
+        for i, name in enumerate(COLUMNS):
+            if not header.count:
+                columns[name] = np.empty(0, dtype=np.int64 if name == "time" else np.float64)
+                continue
+            columns[name] = np.memmap(
+                path,
+                dtype=np.int64 if name == "time" else np.float64,
+                mode="r",
+                offset=HEADER_SIZE + i * header.count * 8,
+                shape=(header.count,),
+            )
+        self.candles = CandleArrays(**columns)
+
+    def __len__(self) -> int:
+        return self.header.count
+
+    @staticmethod
+    def path_for(source: Path, cache_dir: str | None = None) -> Path:
+        directory = Path(cache_dir) if cache_dir else source.parent
+        return directory / f"{source.name}.candles"
+
+    @classmethod
+    def open(
+        cls, source: Path, cache_dir: str | None = None, symbol: str = "", chunk_size: int = 100_000
+    ) -> "CandleCache":
+        """Map the cache of the CSV file, it is (re)built when missing or the CSV has changed"""
+        path = cls.path_for(source, cache_dir)
+        if path.exists():
+            with path.open("rb") as f:
+                header = CacheHeader.unpack(f.read(HEADER_SIZE))
+            if header is not None and header.is_fresh(source) and header.is_for(symbol):
+                return cls(path, header)
+        return cls.build(source, path, symbol, chunk_size)
+
+    @classmethod
+    def build(
+        cls, source: Path, path: Path, symbol: str = "", chunk_size: int = 100_000
+    ) -> "CandleCache":
+        """Convert the CSV by chunks, columns are spooled to temporary files to bound memory"""
+        stat = source.stat()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        column_paths = [path.with_name(f"{path.name}.{name}.tmp") for name in COLUMNS]
+        header = CacheHeader(
+            symbol=symbol,
+            timeframe=0,
+            count=0,
+            start_time=0,
+            end_time=0,
+            source_size=stat.st_size,
+            source_mtime=stat.st_mtime_ns,
+        )
+        try:
+            with ExitStack() as stack:
+                column_files = [stack.enter_context(p.open("wb")) for p in column_paths]
+                for chunk in read_chunks(source, chunk_size):
+                    if not len(chunk):
+                        continue
+                    if not header.count:
+                        header.start_time = int(chunk.time[0])
+                        if len(chunk) > 1:
+                            header.timeframe = int(np.median(np.diff(chunk.time)) // 60000)
+                    header.count += len(chunk)
+                    header.end_time = int(chunk.time[-1])
+                    for name, f in zip(COLUMNS, column_files, strict=True):
+                        getattr(chunk, name).tofile(f)
+
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            with tmp_path.open("wb") as f:
+                f.write(header.pack())
+                for column_path in column_paths:
+                    with column_path.open("rb") as column_file:
+                        shutil.copyfileobj(column_file, f)
+            tmp_path.replace(path)
+        finally:
+            for column_path in column_paths:
+                column_path.unlink(missing_ok=True)
+        return cls(path, header)
+
+    def seek(self, time: int) -> int:
+        """Index of the first candle at or after the time"""
+        return int(np.searchsorted(self.candles.time, time, side="left"))
+
+    def read(self, start_time: int = None, end_time: int = None) -> CandleArrays:
+        """Candles in '[start_time, end_time]', views of the mapped file"""
+        begin = 0 if start_time is None else self.seek(start_time)
+        end = len(self) if end_time is None else self.seek(end_time + 1)
+        return self.candles[begin:end]
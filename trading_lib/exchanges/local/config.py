@@ -4,6 +4,10 @@ from pydantic_settings import BaseSettings
 class CSVConfig(BaseSettings):
     PATH: str
     INITIAL_BALANCE: float = 10000
+    CACHE: bool = True
+    CACHE_DIR: str | None = None
+    CHUNK_SIZE: int = 100_000
+    WORKERS: int = 4
 
     class Config:
         env_prefix = "CSV_"
@@ -1,17 +1,26 @@
-import csv
+from functools import partial
 from pathlib import Path
 from typing import Generator
 
+from common.candles import CandleArrays
 from common.enums import OrderSide
 from common.exchange import BaseExchange
+from common.resampler import resample_chunks
 from common.schemas import Candle, Order, OrderIN
+from exchanges.local.cache import CandleCache
 from exchanges.local.config import CSVConfig
+from exchanges.local.reader import ChunkReader
 
 
 class CSVExchange(BaseExchange):
+    name = "csv"
 
     def __init__(self, config: CSVConfig) -> None:
         self.path = config.PATH
+        self.cache = config.CACHE
+        self.cache_dir = config.CACHE_DIR
+        self.chunk_size = config.CHUNK_SIZE
+        self.workers = config.WORKERS
         self.balance = config.INITIAL_BALANCE
         self.amount: float = 0
 
@@ -24,20 +33,44 @@ class CSVExchange(BaseExchange):
     async def stop(self) -> None:
         pass
 
+    def _read_cache(
+        self, file: Path, symbol: str = "", start_time: int = None
+    ) -> Generator[CandleArrays, None, None]:
+        """Chunks of the mapped cache since 'start_time', the cache is built on the first read"""
+        cache = CandleCache.open(file, self.cache_dir, symbol, self.chunk_size)
+        candles = cache.read(start_time)
+        for begin in range(0, len(candles), self.chunk_size):
+            yield candles[begin : begin + self.chunk_size]
+
+    def _chunks(
+        self, symbol: str = "", start_time: int = None
+    ) -> Generator[CandleArrays, None, None]:
+        # cached and parsed files go through the same ordering, so they give the same candles
+        if self.cache:
+            # a cache seeks to the start time, only parsed chunks are filtered
+            read = partial(self._read_cache, symbol=symbol, start_time=start_time)
+            yield from ChunkReader(self._files(), self.chunk_size, self.workers, read=read)
+            return
+        for chunk in ChunkReader(self._files(), self.chunk_size, self.workers):
+            yield chunk if start_time is None else chunk[chunk.time >= start_time]
+
     async def get_candles(
-        self, _symbol: str, _timeframe: int = 1, _size: int = 1000, _start_time: int = None
+        self, symbol: str, timeframe: int = 1, _size: int = 1000, start_time: int = None
     ) -> Generator[Candle, None, None]:
-        for file in self._files():
-            with Path(file).open(newline="") as csvfile:
-                for data in csv.reader(csvfile):
-                    yield Candle(
-                        time=float(data[0]),
-                        open=float(data[1]),
-                        high=float(data[2]),
-                        low=float(data[3]),
-                        close=float(data[4]),
-                        volume=float(data[5]),
-                    )
+        """
+        Candles are built lazily from the parsed chunks while the consumer iterates,
+        1m data is resampled to the timeframe on the fly
+        """
+        for chunk in resample_chunks(self._chunks(symbol, start_time), timeframe):
+            for candle in chunk.candles():
+                yield candle
+
+    def load_candles(self, symbol: str = "", timeframe: int = 1) -> CandleArrays:
+        """All candles of the CSV files as arrays, without building a 'Candle' per row"""
+        return CandleArrays.concat(resample_chunks(self._chunks(symbol), timeframe))
+
+    async def get_history(self, symbol: str, timeframe: int = 1, size: int = 1000) -> CandleArrays:
+        return self.load_candles(symbol, timeframe)[-size:]
 
     async def place_order(self, order_in: OrderIN, _client_oid: str = None) -> Order:
         cost = order_in.amount * order_in.candle.close
@@ -48,7 +81,7 @@ class CSVExchange(BaseExchange):
             self.balance += cost
             self.amount -= order_in.amount
         return Order(
-            time=order_in.candle.time,
+            ts=order_in.candle.ts,
             price=order_in.candle.close,
             amount=order_in.amount,
             side=order_in.side,
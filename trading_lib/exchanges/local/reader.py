@@ -0,0 +1,104 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+
+import pandas as pd
+from common.candles import CandleArrays
+
+_END = object()
+
+
+def read_chunks(file: Path, chunk_size: int = 100_000) -> Generator[CandleArrays, None, None]:
+    """Parse the CSV file by blocks of 'chunk_size' rows straight into arrays"""
+    with pd.read_csv(
+        file,
+        header=None,
+        usecols=range(6),
+        dtype="float64",
+        chunksize=chunk_size,
+        engine="c",
+    ) as reader:
+        for frame in reader:
+            yield CandleArrays.from_rows(frame.to_numpy())
+
+
+class ChunkReader:
+    """
+    Reads CSV files with candles as a stream of 'CandleArrays' chunks.
+
+    Up to 'workers' files are parsed in parallel threads, each keeps at most 'prefetch' parsed
+    chunks, so memory stays bounded. Chunks are yielded in file order, rows that are not
+    newer than the last yielded row are dropped, so the stream is always in time order.
+    'read' replaces the CSV parser, e.g. with the chunks of a file's cache.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        files: Iterable[Path],
+        chunk_size: int = 100_000,
+        workers: int = 4,
+        prefetch: int = 2,
+        read: Callable[[Path], Iterable[CandleArrays]] | None = None,
+    ) -> None:
+        self.files = list(files)
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+        self.prefetch = prefetch
+        self.read = read or (lambda file: read_chunks(file, self.chunk_size))
+
+    @staticmethod
+    def _put(chunks: queue.Queue, item: object, stopped: threading.Event) -> bool:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, file: Path, chunks: queue.Queue, stopped: threading.Event) -> None:
+        try:
+            for chunk in self.read(file):
+                if not self._put(chunks, chunk, stopped):
+                    return
+        except Exception as e:
+            self._put(chunks, e, stopped)
+            return
+        self._put(chunks, _END, stopped)
+
+    def __iter__(self) -> Generator[CandleArrays, None, None]:
+        files = iter(self.files)
+        stopped = threading.Event()
+        pending: deque[queue.Queue] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+            def submit() -> None:
+                file = next(files, None)
+                if file is not None:
+                    chunks = queue.Queue(maxsize=self.prefetch)
+                    executor.submit(self._produce, file, chunks, stopped)
+                    pending.append(chunks)
+
+            try:
+                for _ in range(self.workers):
+                    submit()
+                last_time = None
+                while pending:
+                    item = pending[0].get()
+                    if item is _END:
+                        pending.popleft()
+                        submit()
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
+                    if last_time is not None:
+                        item = item[item.time > last_time]
+                    if len(item):
+                        last_time = int(item.time[-1])
+                        yield item
+            finally:
+                stopped.set()
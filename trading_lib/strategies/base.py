@@ -1,15 +1,19 @@
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import timedelta
 from pathlib import Path
 from uuid import UUID
 
+import plotly.graph_objects as go
 from common.chart import Chart
-from common.enums import OrderSide, Signal
+from common.enums import OrderSide, PositionStatus, Signal
 from common.exchange import BaseExchange
 from common.notifier import NotifyService
-from common.schemas import Candle, Position
+from common.render import RenderPool
+from common.schemas import Candle, Order, Position
 from db.db_connector import DatabaseConnector
+from db.persistence import PersistenceService
 
 
 @dataclass
@@ -23,24 +27,52 @@ class BaseStrategy:
     logger: logging.Logger = field(init=False)
     db: DatabaseConnector | None = field(init=False)
     notifier: NotifyService | None = field(init=False)
+    persistence: PersistenceService | None = field(init=False)
 
     def __post_init__(self) -> None:
         self.position = None
+        self.persistence = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    async def restore(self, position: Position) -> None:
+        """Continue the open position rebuilt after a restart"""
+        self.position = position
+
+    def snapshot_state(self) -> dict:
+        """JSON-serializable fields of the strategy kept in a snapshot besides the position"""
+        return {}
+
+    def load_snapshot_state(self, state: dict) -> None:
+        """Reverse of 'snapshot_state'"""
+
+    async def _persist(
+        self, position: Position, order: Order, status: PositionStatus = PositionStatus.OPEN
+    ) -> None:
+        if self.persistence is not None:
+            await self.persistence.record(self.strategy_id, self.symbol, position, order, status)
+
     async def init(self) -> None:
         raise NotImplementedError("Please implement init method")
 
     async def handle(self, candle: Candle) -> None:
-        sig = self.chart.add(candle)
+        signal = self.chart.add(candle)
+        if signal is not None:
+            await self.on_signal(candle, signal)
+
+    async def on_signal(self, candle: Candle, sig: Signal) -> None:
+        """Act on a candle the chart is already updated with, a shared chart is updated once"""
         if self.chart.is_ready:
             if self.online_check is True and self.chart.is_online is False:
                 return
             position = await self._handle(candle, sig)
             if position is not None:
-                self.save_chart(position)
+                await self.save_chart(position)
+
+    async def save_chart(self, position: Position) -> None:
+        await self.save_figure(self.deal_figure(position), position)
 
-    def save_chart(self, position: Position) -> None:
+    def deal_figure(self, position: Position) -> go.Figure:
+        """Figure of the current chart window, build it before the chart moves on"""
         start_price = round(position.orders[0].price, 2)
         avg_price = round(position.avg_price, 2)
         loss = round((avg_price - start_price) / start_price * 100, 2)
@@ -49,6 +81,7 @@ class BaseStrategy:
             f"duration={position.duration} profit={round(position.profit, 2)}",
             self.symbol,
             position.orders[0].time - timedelta(days=1),
+            markers=[order.time for order in position.orders],
         )
         params = {"row": 1, "col": 1, "line_dash": "dash", "line_width": 1}
         for order in position.orders:
@@ -56,11 +89,13 @@ class BaseStrategy:
             fig.add_hline(y=order.price, line_color=color, **params)
         fig.add_hline(y=position.avg_price, line_color="blue", **params)
         fig.add_vline(x=position.orders[0].time, line_color="green", **params)
+        return fig
 
+    async def save_figure(self, fig: go.Figure, position: Position) -> None:
         pattern = '%Y.%m.%d-%H.%M.%S'
         file_name = f"{position.orders[0].time.strftime(pattern)}-deal.jpg"
-        with Path(file_name).open("wb") as f:
-            f.write(fig.to_image("jpeg", width=1050, height=750, scale=2))
+        image = await RenderPool.shared().render(fig)
+        await asyncio.to_thread(Path(file_name).write_bytes, image)
 
     async def _handle(self, candle: Candle, sig: Signal) -> Position | None:
         raise NotImplementedError("Please implement _handle method")
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 
-from common.enums import Signal
+from common.enums import OrderSide, PositionStatus, Signal
 from common.schemas import Candle, OrderIN, Position
 from strategies.base import BaseStrategy
 
@@ -32,11 +32,26 @@ class ExampleStrategy(BaseStrategy):
         amount = cost / candle.close
         order = await self.exchange.place_order(OrderIN.buy(self.symbol, amount, candle))
         self.position = Position.new(order)
+        await self._persist(self.position, order)
+
+    async def restore(self, position: Position) -> None:
+        """The averaging orders left are derived from the cost of the first order"""
+        await super().restore(position)
+        balance = position.orders[0].cost / self.orders_map[0][1]
+        buys = sum(1 for order in position.orders if order.side == OrderSide.BUY)
+        self.orders = [(d, balance * r) for d, r in self.orders_map[buys:]]
+
+    def snapshot_state(self) -> dict:
+        return {"orders": self.orders}
+
+    def load_snapshot_state(self, state: dict) -> None:
+        self.orders = [(delta, cost) for delta, cost in state["orders"]]
 
     async def close_position(self, candle: Candle) -> Position:
         amount, balance = await self.exchange.get_balance(self.symbol)
         order = await self.exchange.place_order(OrderIN.sell(self.symbol, amount, candle))
         self.position.add_sell(order)
+        await self._persist(self.position, order, PositionStatus.CLOSED)
         position = self.position
         self.position = None
         return position
@@ -57,3 +72,4 @@ class ExampleStrategy(BaseStrategy):
         amount = cost / candle.close
         order = await self.exchange.place_order(OrderIN.buy(self.symbol, amount, candle))
         self.position.add_buy(order)
+        await self._persist(self.position, order)
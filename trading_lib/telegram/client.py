@@ -1,20 +1,47 @@
+import json
 import logging
 from typing import BinaryIO
 
+from aiohttp import ClientResponse
 from async_client import BaseClient
 from common.exceptions import BaseClientError
 from telegram.config import TelegramConfig
+from telegram.outbox import TelegramOutbox, TelegramRetryAfterError
 from telegram.schemas import TelegramSendResponse
 
 logger = logging.getLogger("TelegramClient")
 
+TOO_MANY_REQUESTS = 429
+
 
 class TelegramClient(BaseClient[TelegramConfig]):
+    """
+    'send_info', 'send_debug' and 'send_photo' only put the message to the outbox and return,
+    the outbox delivers them in the background within the Telegram rate limits
+    """
+
+    def __init__(self, config: TelegramConfig) -> None:
+        super().__init__(config)
+        self.outbox = TelegramOutbox(
+            self, chat_interval=config.CHAT_INTERVAL, global_interval=1 / config.GLOBAL_RATE
+        )
+
+    async def stop(self) -> None:
+        await self.outbox.stop()
+        await super().stop()
 
     def get_path(self, url: str) -> str:
         return f"{self.base_path}/bot{self.config.TOKEN}/{url}"
 
-    async def _send(self, path: str, **kwargs) -> None:
+    @staticmethod
+    async def _raise_for_status(resp: ClientResponse) -> None:
+        if resp.status == TOO_MANY_REQUESTS:
+            body = await resp.text()
+            retry_after = json.loads(body).get("parameters", {}).get("retry_after", 1)
+            raise TelegramRetryAfterError(float(retry_after), body)
+        await BaseClient._raise_for_status(resp)
+
+    async def _send(self, path: str, **kwargs) -> None:  # noqa: ANN003
         if self.config.ENABLED is False:
             logger.info("Skip sending to Telegram")
             return
@@ -24,19 +51,31 @@ class TelegramClient(BaseClient[TelegramConfig]):
             self.logger.error(f"Telegram error: {resp.body}")
             raise BaseClientError(extra=f"Telegram error: {resp.body}")
 
-    async def send_info(self, message: str) -> None:
-        payload = {"chat_id": self.config.INFO_CHAT_ID, "text": message}
+    async def send_message(self, chat_id: int, message: str) -> None:
+        payload = {"chat_id": chat_id, "text": message}
         await self._send("sendMessage", json=payload)
 
+    async def send_photos(self, chat_id: int, *photos: BinaryIO | bytes) -> None:
+        """One photo is sent as is, several ones as a media group"""
+        params = {"chat_id": chat_id}
+        if len(photos) == 1:
+            await self._send("sendPhoto", params=params, data={"photo": photos[0]})
+            return
+        media = [{"type": "photo", "media": f"attach://photo{i}"} for i in range(len(photos))]
+        data = {"media": json.dumps(media)}
+        data.update({f"photo{i}": photo for i, photo in enumerate(photos)})
+        await self._send("sendMediaGroup", params=params, data=data)
+
+    async def send_info(self, message: str) -> None:
+        self.outbox.put(self.config.INFO_CHAT_ID, message)
+
     async def send_debug(self, message: str) -> None:
-        payload = {"chat_id": self.config.DEBUG_CHAT_ID, "text": message}
-        await self._send("sendMessage", json=payload)
+        self.outbox.put(self.config.DEBUG_CHAT_ID, message)
 
     async def send_photo(self, photo: BinaryIO | bytes) -> None:
         """
-        :param photo: BinaryIO object
+        :param photo: BinaryIO object or image bytes
         :return: None
         """
-        params = {"chat_id": self.config.DEBUG_CHAT_ID}
-        data = {"photo": photo}
-        await self._send("sendPhoto", params=params, data=data)
+        photo = photo if isinstance(photo, bytes) else photo.read()
+        self.outbox.put(self.config.DEBUG_CHAT_ID, photo)
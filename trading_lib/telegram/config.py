@@ -6,6 +6,9 @@ class TelegramConfig(ClientConfig):
     DEBUG_CHAT_ID: int
     INFO_CHAT_ID: int
     ENABLED: bool = True
+    # seconds between messages to one chat and messages per second over all chats
+    CHAT_INTERVAL: float = 1.0
+    GLOBAL_RATE: int = 30
 
     class Config:
         env_prefix = "TELEGRAM_"
@@ -1,5 +1,6 @@
 import plotly.graph_objects as go
 from common.notifier import BaseNotifier
+from common.render import RenderPool
 from telegram.client import TelegramClient
 
 
@@ -11,4 +12,4 @@ class TelegramNotifier(BaseNotifier):
         await self.tg_client.send_debug(text)
 
     async def push_figure(self, fig: go.Figure, _name: str) -> None:
-        await self.tg_client.send_photo(fig.to_image("jpeg", width=1050, height=750, scale=2))
+        await self.tg_client.send_photo(await RenderPool.shared().render(fig))
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from common.exceptions import BaseClientError
+
+if TYPE_CHECKING:
+    from telegram.client import TelegramClient
+
+MESSAGE_LIMIT = 4096
+MEDIA_GROUP_LIMIT = 10
+TEXT_SEPARATOR = "\n\n"
+
+
+class TelegramRetryAfterError(BaseClientError):
+    default_msg = "Telegram flood control"
+
+    def __init__(self, retry_after: float, extra: str | None = None) -> None:
+        super().__init__(extra=extra)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Chat:
+    chat_id: int
+    pending: deque[str | bytes] = field(default_factory=deque)
+    next_at: float = 0.0
+
+
+class TelegramOutbox:
+    """
+    Outbound queue of a Telegram client with one background sender.
+
+    Callers only enqueue. The sender joins consecutive texts of a chat into one message up to
+    the Telegram limit and sends consecutive photos as a media group. It waits 'chat_interval'
+    seconds between messages to one chat and 'global_interval' between any two messages,
+    and holds a chat back for 'retry_after' seconds when Telegram asks so.
+    """
+
+    def __init__(
+        self,
+        client: "TelegramClient",
+        chat_interval: float = 1.0,
+        global_interval: float = 1 / 30,
+        max_pending: int = 100,
+    ) -> None:
+        self.client = client
+        self.chat_interval = chat_interval
+        self.global_interval = global_interval
+        self.max_pending = max_pending
+        self._chats: dict[int, _Chat] = {}
+        self._sent_at = 0.0
+        self._in_flight = 0
+        self._wakeup = asyncio.Event()
+        self._sender: asyncio.Task | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(chat.pending) for chat in self._chats.values())
+
+    def put(self, chat_id: int, item: str | bytes) -> None:
+        chat = self._chats.setdefault(chat_id, _Chat(chat_id))
+        if len(chat.pending) >= self.max_pending:
+            chat.pending.popleft()
+            self.logger.warning(f"Outbox of chat {chat_id} is full, the oldest item is dropped")
+        chat.pending.append(item)
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    def _batch(self, chat: _Chat) -> list[str | bytes]:
+        """Leading items of the chat which go in one request"""
+        batch = [chat.pending.popleft()]
+        if isinstance(batch[0], str):
+            size = len(batch[0])
+            while chat.pending and isinstance(chat.pending[0], str):
+                size += len(TEXT_SEPARATOR) + len(chat.pending[0])
+                if size > MESSAGE_LIMIT:
+                    break
+                batch.append(chat.pending.popleft())
+        else:
+            while (
+                chat.pending
+                and isinstance(chat.pending[0], bytes)
+                and len(batch) < MEDIA_GROUP_LIMIT
+            ):
+                batch.append(chat.pending.popleft())
+        return batch
+
+    async def _deliver(self, chat: _Chat, batch: list[str | bytes]) -> None:
+        if isinstance(batch[0], str):
+            await self.client.send_message(chat.chat_id, TEXT_SEPARATOR.join(batch))
+        else:
+            await self.client.send_photos(chat.chat_id, *batch)
+
+    async def _send_next(self) -> float | None:
+        """Send one batch of the chat which has waited longest, or tell how long to wait"""
+        now = time.monotonic()
+        ready = [chat for chat in self._chats.values() if chat.pending]
+        if not ready:
+            return None
+        chat = min(ready, key=lambda c: c.next_at)
+        wait = max(chat.next_at, self._sent_at + self.global_interval) - now
+        if wait > 0:
+            return wait
+        batch = self._batch(chat)
+        self._sent_at = chat.next_at = now
+        self._in_flight += len(batch)
+        try:
+            await self._deliver(chat, batch)
+            chat.next_at = time.monotonic() + self.chat_interval
+        except TelegramRetryAfterError as e:
+            self.logger.warning(f"Chat {chat.chat_id} is limited for {e.retry_after}s")
+            chat.pending.extendleft(reversed(batch))
+            chat.next_at = time.monotonic() + e.retry_after
+        except Exception as e:
+            self.logger.exception(f"Dropped {len(batch)} items for chat {chat.chat_id}: {e}")
+            chat.next_at = time.monotonic() + self.chat_interval
+        finally:
+            self._in_flight -= len(batch)
+        return 0.0
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            wait = await self._send_next()
+            if wait is None:
+                await self._wakeup.wait()
+            elif wait > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def flush(self, timeout: float | None = None) -> None:
+        """Wait until everything queued so far is sent"""
+
+        async def drained() -> None:
+            while self.pending or self._in_flight:
+                await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(drained(), timeout)
+
+    async def stop(self, timeout: float = 10) -> None:
+        try:
+            await self.flush(timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Outbox stopped with {self.pending} unsent items")
+        if self._sender is not None:
+            self._sender.cancel()
+        self._sender = None